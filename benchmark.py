@@ -0,0 +1,222 @@
+"""
+Benchmark suite for the map and integrator kernels.
+
+Each public kernel (logistic, tent, chaos_game, complex_iterated_map, one_dimensional_map,
+euler and RK4) is timed across a range of problem sizes. For every case the suite reports
+    iterations/sec        map iterations or integrator steps per second
+    RHS evaluations/sec   f_func calls per second (integrators only)
+    peak memory           peak traced allocation during one call (tracemalloc)
+A first, untimed call measures peak memory and, run under instrumentation.instrument(),
+reads the integrators' own step and f_func counters; the best of several timed calls then
+gives the throughput. Results can be saved as a JSON baseline
+and later runs compared against it: a case whose throughput drops, or whose peak memory
+grows, by more than the threshold is reported as a regression and the exit status is 1.
+Everything runs offline on the local machine.
+
+Usage:
+    python benchmark.py --save baseline.json
+    python benchmark.py --compare baseline.json --threshold 0.15
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import numpy as np
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from logistic_map import logistic
+from tent_map import tent
+from chaos_game import chaos_game
+from complex_iterated_map import complex_iterated_map
+from one_dimensional_map import one_dimensional_map
+from euler_method import euler, f as euler_f
+from runge_kutta import RK4, f as rk4_f
+import instrumentation
+
+_TRIANGLE = [(0.0, 0.0), (1.0, 0.0), (0.5, np.sqrt(3) / 2)]
+
+def _map_case(run: Callable[[int], Any], iterations: Callable[[int, Any], int]) -> Callable:
+    """
+    Build a case for an iterated map: returns run(size) and its number of iterations.
+    """
+    def case(size: int) -> Tuple[Any, int]:
+        result = run(size)
+        return result, iterations(size, result)
+    return case
+
+def _ode_case(solver: Callable, f_func: Callable[[float, float], float], kernel: str) -> Callable:
+    """
+    Build a case for an integrator over t ∈ [0, 10] with dt = 10 / size. kernel is the
+    name under which the solver reports its instrumentation counters.
+    """
+    def case(size: int) -> Tuple[Any, int]:
+        result = solver(0.0, 0.0, 10.0, 10.0 / size, f_func)
+        return result, size
+    case.kernel = kernel
+    return case
+
+# name -> (case, sizes, reduced sizes for --quick)
+CASES: Dict[str, Tuple[Callable, List[int], List[int]]] = {
+    "logistic": (_map_case(lambda n: logistic(0.2, n, 3.9), lambda n, _: n),
+                 [10 ** 4, 10 ** 5, 10 ** 6], [10 ** 4]),
+    "tent": (_map_case(lambda n: tent(0.4, n), lambda n, _: n),
+             [10 ** 4, 10 ** 5, 10 ** 6], [10 ** 4]),
+    "chaos_game": (_map_case(lambda n: chaos_game(0.5, _TRIANGLE, n), lambda n, _: n),
+                   [10 ** 4, 10 ** 5, 10 ** 6], [10 ** 4]),
+    "complex_iterated_map": (_map_case(lambda n: complex_iterated_map(0.1, 0.2, n), lambda n, _: n),
+                             [10 ** 4, 10 ** 5, 10 ** 6], [10 ** 4]),
+    "one_dimensional_map": (_map_case(one_dimensional_map, lambda n, result: (n + 1) * len(result[0])),
+                            [2 ** 7, 2 ** 9, 2 ** 11], [2 ** 9]),
+    "euler": (_ode_case(euler, euler_f, "euler"), [10 ** 4, 10 ** 5, 10 ** 6], [10 ** 4]),
+    "RK4": (_ode_case(RK4, rk4_f, "RK4"), [10 ** 4, 10 ** 5, 10 ** 6], [10 ** 4]),
+}
+
+def run_case(case: Callable, size: int, repeat: int = 3) -> Dict[str, float]:
+    """
+    Measure one benchmark case at one problem size.
+
+    Parameters:
+        case (Callable): Case function case(size) -> (result, iterations).
+        size (int): Problem size (iterations, λ-sweep length or number of steps).
+        repeat (int): Number of timed calls; the fastest is reported.
+
+    Returns:
+        Dict[str, float]: Best time, iterations/sec, RHS evaluations/sec and peak memory in bytes.
+    """
+    kernel = getattr(case, "kernel", None)
+
+    # Untimed, instrumented call: peak memory and the kernel's own counters
+    tracemalloc.start()
+    try:
+        with instrumentation.instrument() as metrics:
+            _, iterations = case(size)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case(size)
+        best = min(best, time.perf_counter() - start)
+
+    if kernel is not None:
+        # Integrator steps and RHS evaluations are counted exactly rather than inferred from dt
+        iterations = metrics.counters[kernel + ".iterations"]
+        rhs_evals = metrics.counters[kernel + ".f_evals"]
+    record = {"seconds": best, "iterations": iterations, "iterations_per_sec": iterations / best,
+              "peak_bytes": peak}
+    if kernel is not None:
+        record["rhs_evals"] = rhs_evals
+        record["rhs_evals_per_sec"] = rhs_evals / best
+    return record
+
+def run_suite(names: Optional[List[str]] = None, quick: bool = False, repeat: int = 3) -> Dict[str, Any]:
+    """
+    Run the benchmark cases and collect their results.
+
+    Parameters:
+        names (Optional[List[str]]): Cases to run; all of CASES by default.
+        quick (bool): If True, run only the reduced size of each case.
+        repeat (int): Number of timed calls per case and size.
+
+    Returns:
+        Dict[str, Any]: Baseline record with environment metadata and one entry per
+                        "name[size]" key.
+    """
+    names = list(CASES) if names is None else names
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        raise ValueError("Unknown benchmark case(s): %s" % ", ".join(unknown))
+    if not isinstance(repeat, int) or repeat <= 0:
+        raise ValueError("repeat must be a positive integer.")
+
+    results: Dict[str, Dict[str, float]] = {}
+    for name in names:
+        case, sizes, quick_sizes = CASES[name]
+        for size in (quick_sizes if quick else sizes):
+            key = "%s[%d]" % (name, size)
+            results[key] = run_case(case, size, repeat)
+            logging.info("%-28s %10.3f ms  %12.4g it/s  %10.1f KiB peak", key,
+                         1e3 * results[key]["seconds"], results[key]["iterations_per_sec"],
+                         results[key]["peak_bytes"] / 1024)
+
+    return {
+        "meta": {"python": platform.python_version(), "numpy": np.__version__,
+                 "machine": platform.machine(), "platform": platform.platform(),
+                 "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": results,
+    }
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.1) -> List[str]:
+    """
+    Compare a benchmark run against a baseline.
+
+    Parameters:
+        current (Dict[str, Any]): Record returned by run_suite().
+        baseline (Dict[str, Any]): Previously saved record.
+        threshold (float): Allowed relative loss of throughput or growth of peak memory.
+
+    Returns:
+        List[str]: One message per regression; empty if none was found.
+    """
+    if threshold < 0:
+        raise ValueError("threshold must be non-negative.")
+    regressions = []
+    for key, now in current["results"].items():
+        before = baseline["results"].get(key)
+        if before is None:
+            continue
+        for metric in ("iterations_per_sec", "rhs_evals_per_sec"):
+            if metric in now and metric in before and now[metric] < (1 - threshold) * before[metric]:
+                regressions.append("%s: %s dropped %.1f%% (%.4g -> %.4g)" % (
+                    key, metric, 100 * (1 - now[metric] / before[metric]), before[metric], now[metric]))
+        if now["peak_bytes"] > (1 + threshold) * before["peak_bytes"] and now["peak_bytes"] > 4096:
+            regressions.append("%s: peak memory grew %.1f%% (%d -> %d bytes)" % (
+                key, 100 * (now["peak_bytes"] / max(before["peak_bytes"], 1) - 1),
+                before["peak_bytes"], now["peak_bytes"]))
+    return regressions
+
+def main() -> None:
+    """
+    Main driver function running the suite from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the map and integrator kernels.")
+    parser.add_argument("cases", nargs="*", help="cases to run (default: all of %s)" % ", ".join(CASES))
+    parser.add_argument("--quick", action="store_true", help="run one small size per case")
+    parser.add_argument("--repeat", type=int, default=3, help="timed calls per case (best is kept)")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="relative slowdown or memory growth reported as a regression")
+    args = parser.parse_args()
+
+    try:
+        current = run_suite(args.cases or None, args.quick, args.repeat)
+        if args.save:
+            with open(args.save, "w") as fh:
+                json.dump(current, fh, indent=2)
+            logging.info("Baseline written to %s", args.save)
+        if args.compare:
+            with open(args.compare) as fh:
+                baseline = json.load(fh)
+            regressions = compare(current, baseline, args.threshold)
+            for message in regressions:
+                logging.warning("Regression: %s", message)
+            if regressions:
+                sys.exit(1)
+            logging.info("No regressions beyond %.0f%% against %s", 100 * args.threshold, args.compare)
+    except (ValueError, OSError) as e:
+        logging.error("An error occurred: %s", e)
+        sys.exit(2)
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    main()
@@ -0,0 +1,68 @@
+"""
+Output buffers for the iterated-map kernels.
+
+Kernels that accept dtype= and out= arguments obtain their result arrays here: either a
+fresh array of the requested precision, or the caller's own array after checking that the
+kernel can write into it. A caller-supplied array may be a view of a larger array, a
+memory map or a NumPy array over multiprocessing shared memory; results are written into
+it directly and it is returned as is.
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import numpy as np
+from typing import Optional, Tuple, Union
+
+# Floating-point dtypes the kernels can compute and store in
+FLOAT_DTYPES = (np.dtype(np.float32), np.dtype(np.float64))
+
+def output_array(shape: Tuple[int, ...], dtype: Optional[Union[type, np.dtype, str]] = None,
+                 out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Return out after checking it, or a new uninitialized array.
+
+    Parameters:
+        shape (Tuple[int, ...]): Required shape of the result.
+        dtype (Optional[type | np.dtype | str]): float32 or float64. Defaults to the dtype of
+                                                 out, or float64 for a new array.
+        out (Optional[np.ndarray]): Caller-owned, writeable array of the given shape.
+
+    Returns:
+        np.ndarray: The array the kernel writes its results into.
+    """
+    if dtype is not None:
+        dtype = np.dtype(dtype)
+        if dtype not in FLOAT_DTYPES:
+            raise ValueError("dtype must be float32 or float64, got %s." % dtype)
+    if out is None:
+        return np.empty(shape, dtype=dtype or np.float64)
+
+    if not isinstance(out, np.ndarray):
+        raise ValueError("out must be a NumPy array.")
+    if out.shape != tuple(shape):
+        raise ValueError("out must have shape %s, got %s." % (tuple(shape), out.shape))
+    if out.dtype not in FLOAT_DTYPES or (dtype is not None and out.dtype != dtype):
+        raise ValueError("out has dtype %s; expected %s." % (out.dtype, dtype or "float32 or float64"))
+    if not out.flags.writeable:
+        raise ValueError("out must be writeable.")
+    return out
+
+def output_pair(shape: Tuple[int, ...], dtype: Optional[Union[type, np.dtype, str]] = None,
+                out: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the x and y result arrays of a 2-D kernel, as output_array() does for one array.
+
+    Parameters:
+        shape (Tuple[int, ...]): Required shape of each result.
+        dtype (Optional[type | np.dtype | str]): float32 or float64.
+        out (Optional[Tuple[np.ndarray, np.ndarray]]): Caller-owned arrays (x_out, y_out).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The x and y arrays the kernel writes into.
+    """
+    if out is None:
+        return output_array(shape, dtype), output_array(shape, dtype)
+    if not isinstance(out, tuple) or len(out) != 2:
+        raise ValueError("out must be a tuple (x_out, y_out) of two arrays.")
+    return output_array(shape, dtype, out[0]), output_array(shape, dtype, out[1])
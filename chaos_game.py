@@ -5,34 +5,41 @@ This code simulates a contraction mapping where the next point is given by:
    yₙ₊₁ = a * yₙ + Pj_y
 where Pj is chosen randomly from a list of fixed points in the plane.
 The first 100 iterations are discarded to remove transient dynamics.
+chaos_game() draws vertices with the operating system's cryptographic RNG. The faster
+chaos_game_numpy() uses a seedable numpy.random.Generator, draws vertex indices in large
+blocks and evaluates the recurrence for a whole block at once with a prefix scan.
+chaos_game_ensemble() runs many independent walkers as one (walkers × 2) state array and
+spreads groups of walkers over a process pool that writes into a memory-mapped output file.
+For very large n, chaos_game_raster() bins the points into a fixed-size density raster
+as they are generated instead of keeping them in memory.
+chaos_game_ifs() is a deterministic alternative: starting from a point of the attractor,
+it applies every map x -> a * x + Pj to the whole point set at each level (a breadth-first
+expansion over address words) until a^depth times the attractor's diameter is below one
+pixel, giving complete, noise-free coverage with a known budget of |P_list|^depth points.
+Address prefixes that cannot reach the raster are pruned, so zoomed-in views stay cheap.
+attractor_extent() gives a raster extent containing the attractor for either sign of a.
+chaos_game() and chaos_game_numpy() also accept dtype= (float32/float64) and out= arrays,
+writing the kept points straight into caller-owned or shared buffers.
 
 Author: Sabneet Bains
 License: MIT License
 """
 
+import os
 import random
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
-import matplotlib.pyplot as plt
 import logging
-from typing import List, Tuple
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+from buffers import output_pair
+from density_raster import DensityRaster
+import instrumentation
 
-# Setup basic logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
-
-def chaos_game(a: float, P_list: List[Tuple[float, float]], n: int) -> Tuple[List[float], List[float]]:
+def _validate_inputs(a: float, P_list: List[Tuple[float, float]], n: int) -> None:
     """
-    Run the Chaos Game iterated map in 2D.
-
-    Parameters:
-        a (float): Contraction factor (typically between 0 and 1).
-        P_list (List[Tuple[float, float]]): List of fixed points (Pj_x, Pj_y) in the plane.
-        n (int): Number of iterations (non-negative integer).
-
-    Returns:
-        Tuple[List[float], List[float]]: Lists of x- and y-coordinates of the iterated points
-                                          after removing the first 100 transient iterations.
+    Validate the arguments shared by the Chaos Game functions.
     """
-    # Validate inputs
     if not isinstance(a, (float, int)):
         logging.error("Contraction factor a must be a number.")
         raise ValueError("a must be a number.")
@@ -45,6 +52,32 @@ def chaos_game(a: float, P_list: List[Tuple[float, float]], n: int) -> Tuple[Lis
         logging.error("Number of iterations n must be a non-negative integer.")
         raise ValueError("n must be a non-negative integer.")
 
+def chaos_game(a: float, P_list: List[Tuple[float, float]], n: int, dtype: Optional[type] = None,
+               out: Optional[Tuple[np.ndarray, np.ndarray]] = None
+               ) -> Union[Tuple[List[float], List[float]], Tuple[np.ndarray, np.ndarray]]:
+    """
+    Run the Chaos Game iterated map in 2D.
+
+    Parameters:
+        a (float): Contraction factor (typically between 0 and 1).
+        P_list (List[Tuple[float, float]]): List of fixed points (Pj_x, Pj_y) in the plane.
+        n (int): Number of iterations (non-negative integer).
+        dtype (Optional[type]): np.float32 or np.float64; if given, the points are returned as
+                                arrays of this dtype. They are always computed in double precision.
+        out (Optional[Tuple[np.ndarray, np.ndarray]]): Arrays (x_out, y_out) to write the kept
+                                                       points into and return; the transient
+                                                       iterations are never stored.
+
+    Returns:
+        Tuple[List[float], List[float]] | Tuple[np.ndarray, np.ndarray]: Lists, or arrays if
+            dtype or out is given, of x- and y-coordinates of the iterated points after
+            removing the first 100 transient iterations.
+    """
+    # Validate inputs
+    _validate_inputs(a, P_list, n)
+
+    instrumentation.record("chaos_game", iterations=n)
+
     # Use system-based RNG for better randomness
     rng = random.SystemRandom()
 
@@ -56,6 +89,27 @@ def chaos_game(a: float, P_list: List[Tuple[float, float]], n: int) -> Tuple[Lis
         logging.error("Error during random initialization: %s", e)
         raise
 
+    # Write the kept points straight into the output arrays
+    if dtype is not None or out is not None:
+        n_transient = 100
+        if n + 1 <= n_transient:
+            logging.warning("Not enough iterations to remove transients; returning full data.")
+            n_transient = 0
+        x_out, y_out = output_pair((n + 1 - n_transient,), dtype, out)
+        x, y = a * x0 + Pj[0], a * y0 + Pj[1]
+        for i in range(n + 1):
+            if i:
+                try:
+                    Pj = rng.choice(P_list)
+                except Exception as e:
+                    logging.error("Error selecting random point at iteration %d: %s", i - 1, e)
+                    raise
+                x, y = a * x + Pj[0], a * y + Pj[1]
+            if i >= n_transient:
+                x_out[i - n_transient] = x
+                y_out[i - n_transient] = y
+        return x_out, y_out
+
     # Initialize iterates
     xn: List[float] = [a * x0 + Pj[0]]
     yn: List[float] = [a * y0 + Pj[1]]
@@ -75,6 +129,460 @@ def chaos_game(a: float, P_list: List[Tuple[float, float]], n: int) -> Tuple[Lis
         return xn, yn
     return xn[100:], yn[100:]
 
+def _validate_weights(weights: Optional[Sequence[float]], n_points: int) -> Optional[np.ndarray]:
+    """
+    Validate per-vertex selection weights and normalize them to probabilities.
+    """
+    if weights is None:
+        return None
+    p = np.asarray(weights, dtype=float)
+    if p.shape != (n_points,) or np.any(p < 0) or p.sum() <= 0:
+        logging.error("weights must be %d non-negative numbers with a positive sum.", n_points)
+        raise ValueError("weights must be non-negative, one per point in P_list, with a positive sum.")
+    return p / p.sum()
+
+def _affine_scan(b: np.ndarray, a: float, start: np.ndarray) -> None:
+    """
+    Evaluate the recurrence xᵢ = a * xᵢ₋₁ + bᵢ for a whole block, in place.
+
+    Uses a Hillis-Steele prefix scan over the rows of b, so the block is processed with
+    O(log m) vectorized operations instead of m Python steps. Because a is a contraction,
+    the scan stops as soon as a^span falls below machine precision.
+
+    Parameters:
+        b (np.ndarray): (m × ...) array of offsets Pj, e.g. (m × 2) for one walker or
+                        (m × walkers × 2) for an ensemble, overwritten with the iterates xᵢ.
+        a (float): Contraction factor.
+        start (np.ndarray): State x₋₁ preceding the first row of the block (shape b.shape[1:]).
+    """
+    m = b.shape[0]
+    tol = np.finfo(float).eps * max(1 - abs(a), np.finfo(float).eps)
+    span = 1
+    factor = a
+    while span < m and abs(factor) > tol:
+        b[span:] += factor * b[:-span]
+        span *= 2
+        factor *= factor
+    powers = np.power(a, np.arange(1, m + 1)).reshape((m,) + (1,) * (b.ndim - 1))
+    b += powers * start
+
+def _chaos_game_chunks(a: float, P_list: List[Tuple[float, float]], n: int,
+                       rng: np.random.Generator, weights: Optional[np.ndarray],
+                       chunk_size: int, n_transient: int = 100) -> Iterator[np.ndarray]:
+    """
+    Yield the post-transient Chaos Game points in (m × 2) blocks of at most chunk_size rows.
+    """
+    P = np.asarray(P_list, dtype=float)
+    state = rng.uniform(-999, 999, size=2)
+    produced = 0
+    total = n + 1
+
+    while produced < total:
+        m = min(chunk_size, total - produced)
+        if weights is None:
+            idx = rng.integers(0, len(P), size=m)
+        else:
+            idx = rng.choice(len(P), size=m, p=weights)
+        block = P[idx]
+        _affine_scan(block, a, state)
+        state = block[-1].copy()
+
+        # Drop whatever part of the block still lies inside the transient
+        skip = max(0, n_transient - produced)
+        produced += m
+        if skip < m:
+            yield block[skip:]
+
+def chaos_game_numpy(a: float, P_list: List[Tuple[float, float]], n: int,
+                     seed: Union[None, int, np.random.Generator] = None,
+                     weights: Optional[Sequence[float]] = None,
+                     chunk_size: int = 2 ** 16, dtype: Optional[type] = None,
+                     out: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Run the Chaos Game with a seedable NumPy generator and block-vectorized updates.
+
+    Produces the same n+1 iterates as chaos_game() and removes the first 100 transient
+    iterations, but vertex indices are drawn chunk_size at a time and each block of the
+    recurrence is evaluated with vectorized operations, so runs are fast and reproducible.
+
+    Parameters:
+        a (float): Contraction factor (typically between 0 and 1).
+        P_list (List[Tuple[float, float]]): List of fixed points (Pj_x, Pj_y) in the plane.
+        n (int): Number of iterations (non-negative integer).
+        seed (None | int | np.random.Generator): Seed or generator for reproducible runs.
+        weights (Optional[Sequence[float]]): Relative probability of selecting each point in
+                                             P_list. Defaults to uniform selection.
+        chunk_size (int): Number of iterations evaluated per vectorized block.
+        dtype (Optional[type]): np.float32 or np.float64 storage of the points (default float64).
+                                Blocks are always evaluated in double precision.
+        out (Optional[Tuple[np.ndarray, np.ndarray]]): Arrays (x_out, y_out) of length
+                                                       n + 1 - 100 that each block is written
+                                                       into; the transient is never stored.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Arrays of x- and y-coordinates of the iterated points
+                                       after removing the first 100 transient iterations.
+    """
+    _validate_inputs(a, P_list, n)
+    if not isinstance(chunk_size, int) or chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer.")
+    p = _validate_weights(weights, len(P_list))
+    rng = np.random.default_rng(seed)
+    instrumentation.record("chaos_game_numpy", iterations=n)
+
+    n_transient = 100
+    if n + 1 <= n_transient:
+        logging.warning("Not enough iterations to remove transients; returning full data.")
+        n_transient = 0
+
+    x_out, y_out = output_pair((n + 1 - n_transient,), dtype, out)
+    filled = 0
+    for block in _chaos_game_chunks(a, P_list, n, rng, p, chunk_size, n_transient):
+        x_out[filled:filled + block.shape[0]] = block[:, 0]
+        y_out[filled:filled + block.shape[0]] = block[:, 1]
+        filled += block.shape[0]
+
+    return x_out, y_out
+
+def _advance_walkers(out: np.ndarray, a: float, P_list: List[Tuple[float, float]], n: int,
+                     n_transient: int, seeds: List[np.random.SeedSequence],
+                     weights: Optional[np.ndarray], chunk_size: int) -> None:
+    """
+    Advance one walker per seed and write their kept points into out (walkers × n_kept × 2).
+
+    Each walker owns its own generator, so its orbit does not depend on how walkers are
+    grouped across workers.
+    """
+    P = np.asarray(P_list, dtype=float)
+    rngs = [np.random.default_rng(ss) for ss in seeds]
+    g = len(rngs)
+    state = np.stack([rng.uniform(-999, 999, size=2) for rng in rngs])
+    idx = np.empty((g, chunk_size), dtype=np.intp)
+    produced = 0
+    total = n + 1
+
+    while produced < total:
+        m = min(chunk_size, total - produced)
+        for k, rng in enumerate(rngs):
+            if weights is None:
+                idx[k, :m] = rng.integers(0, len(P), size=m)
+            else:
+                idx[k, :m] = rng.choice(len(P), size=m, p=weights)
+        # (m × walkers × 2) block, advanced for every walker at once
+        block = P[idx[:, :m].T]
+        _affine_scan(block, a, state)
+        state = block[-1].copy()
+
+        # Each walker drops its own first n_transient iterates
+        skip = max(0, n_transient - produced)
+        if skip < m:
+            start = produced + skip - n_transient
+            out[:, start:start + m - skip] = block[skip:].transpose(1, 0, 2)
+        produced += m
+
+def _ensemble_worker(a: float, P_list: List[Tuple[float, float]], n: int, n_transient: int,
+                     seeds: List[np.random.SeedSequence], weights: Optional[np.ndarray],
+                     chunk_size: int, path: str, w0: int) -> int:
+    """
+    Advance walkers w0 .. w0+len(seeds)-1 and write their points into the `.npy` file at path.
+
+    Returns the number of walkers processed.
+    """
+    out = np.load(path, mmap_mode="r+")
+    try:
+        _advance_walkers(out[w0:w0 + len(seeds)], a, P_list, n, n_transient, seeds, weights, chunk_size)
+        out.flush()
+    finally:
+        del out
+    return len(seeds)
+
+def chaos_game_ensemble(a: float, P_list: List[Tuple[float, float]], n: int,
+                        n_walkers: int = 1024, n_transient: int = 100,
+                        seed: Union[None, int, np.random.SeedSequence] = None,
+                        weights: Optional[Sequence[float]] = None,
+                        n_workers: Optional[int] = None, chunk_size: int = 2 ** 12,
+                        out_path: Optional[str] = None) -> np.ndarray:
+    """
+    Run an ensemble of independent Chaos Game walkers in parallel.
+
+    Every walker starts from its own random point with its own generator spawned from
+    seed, performs n+1 iterations and discards its own first n_transient iterates.
+    Walkers are split into groups, each group is advanced as one (walkers × 2) state
+    array, and the groups run on a process pool. Workers write directly into a
+    memory-mapped `.npy` file, so no point data is pickled between processes and the
+    result is never copied. Without out_path the file is a temporary one (in /dev/shm
+    where available) that is unlinked as soon as it has been mapped.
+
+    Parameters:
+        a (float): Contraction factor (typically between 0 and 1).
+        P_list (List[Tuple[float, float]]): List of fixed points (Pj_x, Pj_y) in the plane.
+        n (int): Number of iterations per walker (must be at least n_transient).
+        n_walkers (int): Number of independent walkers (positive integer).
+        n_transient (int): Number of leading iterates discarded by each walker.
+        seed (None | int | np.random.SeedSequence): Root seed from which walker seeds are spawned.
+        weights (Optional[Sequence[float]]): Relative probability of selecting each point in P_list.
+        n_workers (Optional[int]): Number of worker processes. Defaults to os.cpu_count();
+                                   1 runs everything in the calling process and returns an
+                                   ordinary array unless out_path is given.
+        chunk_size (int): Number of iterations per vectorized block.
+        out_path (Optional[str]): If given, results are written to this `.npy` file and a
+                                  read-only memory map of it is returned.
+
+    Returns:
+        np.ndarray: (n_walkers × n_kept × 2) array of points, where n_kept = n + 1 - n_transient.
+    """
+    _validate_inputs(a, P_list, n)
+    if not isinstance(n_walkers, int) or n_walkers <= 0:
+        raise ValueError("n_walkers must be a positive integer.")
+    if not isinstance(n_transient, int) or n_transient < 0 or n_transient > n:
+        raise ValueError("n_transient must be an integer between 0 and n.")
+    if not isinstance(chunk_size, int) or chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer.")
+    p = _validate_weights(weights, len(P_list))
+
+    n_workers = n_workers or os.cpu_count() or 1
+    n_workers = max(1, min(n_workers, n_walkers))
+    shape = (n_walkers, n + 1 - n_transient, 2)
+    seeds = np.random.SeedSequence(seed).spawn(n_walkers)
+
+    if n_workers == 1 and out_path is None:
+        out = np.empty(shape)
+        _advance_walkers(out, a, P_list, n, n_transient, seeds, p, chunk_size)
+        return out
+
+    path = out_path
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix=".npy", prefix="chaos_game_ensemble-",
+                                    dir="/dev/shm" if os.path.isdir("/dev/shm") else None)
+        os.close(fd)
+    try:
+        np.lib.format.open_memmap(path, mode="w+", dtype=float, shape=shape).flush()
+        bounds = np.linspace(0, n_walkers, n_workers + 1).astype(int)
+        jobs = [(a, P_list, n, n_transient, seeds[w0:w1], p, chunk_size, path, w0)
+                for w0, w1 in zip(bounds[:-1], bounds[1:]) if w1 > w0]
+        if n_workers == 1:
+            for job in jobs:
+                _ensemble_worker(*job)
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                for future in [pool.submit(_ensemble_worker, *job) for job in jobs]:
+                    future.result()
+        return np.load(path, mmap_mode="r")
+    finally:
+        if out_path is None:
+            # The returned map keeps the data alive; only the directory entry is removed
+            try:
+                os.remove(path)
+            except OSError as e:
+                logging.warning("Could not remove temporary ensemble file %s: %s", path, e)
+
+def chaos_game_raster(a: float, P_list: List[Tuple[float, float]], n: int,
+                      raster: DensityRaster, chunk_size: int = 2 ** 16,
+                      seed: Union[None, int, np.random.Generator] = None,
+                      weights: Optional[Sequence[float]] = None,
+                      secure: bool = False) -> DensityRaster:
+    """
+    Run the Chaos Game and bin its points into a density raster as they are generated.
+
+    The recurrence is the same as chaos_game(), including the removal of the first 100
+    transient iterations, but points are produced in blocks of chunk_size and flushed
+    into the raster as soon as they are generated. Memory use therefore does not grow with n.
+
+    Parameters:
+        a (float): Contraction factor (typically between 0 and 1).
+        P_list (List[Tuple[float, float]]): List of fixed points (Pj_x, Pj_y) in the plane.
+        n (int): Number of iterations (non-negative integer).
+        raster (DensityRaster): Raster to accumulate into.
+        chunk_size (int): Number of points generated per block.
+        seed (None | int | np.random.Generator): Seed or generator for reproducible runs.
+                                                 Ignored when secure is True.
+        weights (Optional[Sequence[float]]): Relative probability of selecting each point in P_list.
+        secure (bool): Draw vertices with the cryptographic random.SystemRandom() one point at
+                       a time, as chaos_game() does, instead of the vectorized NumPy path.
+
+    Returns:
+        DensityRaster: The same raster, for convenience.
+    """
+    _validate_inputs(a, P_list, n)
+    if not isinstance(chunk_size, int) or chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer.")
+    p = _validate_weights(weights, len(P_list))
+
+    # Skip the first 100 iterations to eliminate transients
+    n_transient = 100
+    if n + 1 <= n_transient:
+        logging.warning("Not enough iterations to remove transients; returning full data.")
+        n_transient = 0
+
+    if not secure:
+        for block in _chaos_game_chunks(a, P_list, n, np.random.default_rng(seed), p, chunk_size, n_transient):
+            raster.add(block[:, 0], block[:, 1])
+        return raster
+
+    rng = random.SystemRandom()
+    xn = rng.uniform(-999, 999)
+    yn = rng.uniform(-999, 999)
+
+    x_buf = np.empty(chunk_size)
+    y_buf = np.empty(chunk_size)
+    filled = 0
+
+    for i in range(n + 1):
+        Pj = rng.choice(P_list) if p is None else rng.choices(P_list, weights=p)[0]
+        xn = a * xn + Pj[0]
+        yn = a * yn + Pj[1]
+        if i < n_transient:
+            continue
+        x_buf[filled] = xn
+        y_buf[filled] = yn
+        filled += 1
+        if filled == chunk_size:
+            raster.add(x_buf, y_buf)
+            filled = 0
+
+    if filled:
+        raster.add(x_buf[:filled], y_buf[:filled])
+
+    return raster
+
+def _attractor_disc(a: float, P: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Return the centre and radius of a disc containing the attractor, for either sign of a.
+    """
+    # Every map sends D(centre, radius) into D(a centre + Pj, |a| radius), which lies
+    # inside D whenever radius >= |Pj - (1 - a) centre| / (1 - |a|) for all j
+    centre = P.mean(axis=0) / (1 - a)
+    radius = float(np.sqrt(((P - (1 - a) * centre) ** 2).sum(axis=1)).max()) / (1 - abs(a))
+    return centre, radius
+
+def attractor_extent(a: float, P_list: List[Tuple[float, float]]) -> Tuple[float, float, float, float]:
+    """
+    Square extent (x_min, x_max, y_min, y_max) containing the Chaos Game attractor.
+
+    Parameters:
+        a (float): Contraction factor (0 < |a| < 1; negative values are allowed).
+        P_list (List[Tuple[float, float]]): List of fixed points (Pj_x, Pj_y) in the plane.
+
+    Returns:
+        Tuple[float, float, float, float]: Extent suitable for a DensityRaster.
+    """
+    if not 0 < abs(a) < 1:
+        raise ValueError("a must satisfy 0 < |a| < 1 for the maps to be contractions.")
+    centre, radius = _attractor_disc(a, np.asarray(P_list, dtype=float))
+    return (float(centre[0] - radius), float(centre[0] + radius),
+            float(centre[1] - radius), float(centre[1] + radius))
+
+def _ifs_depth(a: float, P: np.ndarray, pixel_size: float) -> int:
+    """
+    Smallest depth at which every address cylinder of the attractor is below pixel_size.
+    """
+    # Points aX + Pi and aY + Pj of the attractor are at most |Pi - Pj| + |a| diam apart,
+    # so diam <= max |Pi - Pj| / (1 - |a|) for either sign of a
+    diff = P[:, np.newaxis, :] - P[np.newaxis, :, :]
+    diameter = float(np.sqrt((diff ** 2).sum(axis=-1)).max()) / (1 - abs(a))
+    if diameter <= pixel_size:
+        return 0
+    return int(np.ceil(np.log(pixel_size / diameter) / np.log(abs(a))))
+
+def _ifs_blocks(a: float, P: np.ndarray, start: np.ndarray, depth: int, block_size: int,
+                window: Optional[Tuple[float, float, float, float]] = None) -> Iterator[np.ndarray]:
+    """
+    Yield the images of start under all address words of length depth, in (m × 2) blocks.
+
+    The word j₁…j_depth maps start to P_j₁ + a P_j₂ + ... + a^(depth-1) P_j_depth + a^depth start,
+    so words are extended from the outermost map inwards by accumulating these partial sums.
+    Levels are expanded breadth-first while the point set fits in block_size; beyond that
+    the frontier is split into pieces that are expanded one after another. All images of
+    a prefix of length k lie in its partial sum plus a^k times the attractor, so prefixes
+    whose disc cannot reach window (x_min, x_max, y_min, y_max) are dropped.
+    """
+    centre, radius = _attractor_disc(a, P)
+
+    stack = [(np.zeros((1, 2)), 0)]
+    step = max(1, block_size // len(P))
+    while stack:
+        sums, level = stack.pop()
+        while level < depth and 0 < sums.shape[0] * len(P) <= block_size:
+            sums = (sums[np.newaxis, :, :] + a ** level * P[:, np.newaxis, :]).reshape(-1, 2)
+            level += 1
+            if window is not None:
+                reach = abs(a) ** level * radius
+                x = sums[:, 0] + a ** level * centre[0]
+                y = sums[:, 1] + a ** level * centre[1]
+                sums = sums[(x + reach >= window[0]) & (x - reach <= window[1])
+                            & (y + reach >= window[2]) & (y - reach <= window[3])]
+        if sums.shape[0] == 0:
+            continue
+        if level == depth:
+            yield sums + a ** depth * start
+            continue
+        pieces = [(sums[i:i + step], level) for i in range(0, sums.shape[0], step)]
+        stack.extend(reversed(pieces))
+
+def chaos_game_ifs(a: float, P_list: List[Tuple[float, float]], raster: Optional[DensityRaster] = None,
+                   depth: Optional[int] = None, pixel_size: Optional[float] = None,
+                   block_size: int = 2 ** 20,
+                   max_points: int = 2 ** 26) -> Union[DensityRaster, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Render the Chaos Game attractor deterministically by enumerating address words.
+
+    The attractor A satisfies A = ∪ⱼ (a * A + Pj). Starting from the fixed point
+    P₀ / (1 - a), which lies on A, every address word of length depth is applied to it,
+    producing |P_list|^depth points that lie on A and come within a^depth * diam(A) of
+    every point of it. Each point carries equal mass, as in the Chaos Game with uniform
+    vertex selection. When rendering into a raster, words whose images cannot reach its
+    extent are pruned by prefix, so a zoomed-in raster costs about as much as a full view.
+
+    Parameters:
+        a (float): Contraction factor (0 < |a| < 1).
+        P_list (List[Tuple[float, float]]): List of fixed points (Pj_x, Pj_y) in the plane.
+        raster (Optional[DensityRaster]): If given, points are binned into it block by block
+                                          and the raster is returned.
+        depth (Optional[int]): Number of levels. By default, the depth at which the
+                               address cylinders are smaller than pixel_size.
+        pixel_size (Optional[float]): Target resolution. Defaults to the pixel size of raster.
+        block_size (int): Maximum number of points held per block.
+        max_points (int): Largest point set returned as arrays when no raster is given.
+
+    Returns:
+        DensityRaster | Tuple[np.ndarray, np.ndarray]: The raster, or the x- and
+        y-coordinates of the |P_list|^depth points.
+    """
+    _validate_inputs(a, P_list, 0)
+    if not 0 < abs(a) < 1:
+        raise ValueError("a must satisfy 0 < |a| < 1 for the maps to be contractions.")
+    if not isinstance(block_size, int) or block_size < len(P_list):
+        raise ValueError("block_size must be an integer of at least len(P_list).")
+
+    P = np.asarray(P_list, dtype=float)
+    if depth is None:
+        if pixel_size is None:
+            if raster is None:
+                raise ValueError("Give depth, pixel_size or a raster to set the resolution.")
+            x_min, x_max, y_min, y_max = raster.extent
+            pixel_size = min((x_max - x_min) / raster.width, (y_max - y_min) / raster.height)
+        if pixel_size <= 0:
+            raise ValueError("pixel_size must be positive.")
+        depth = _ifs_depth(a, P, pixel_size)
+    elif not isinstance(depth, int) or depth < 0:
+        raise ValueError("depth must be a non-negative integer.")
+
+    n_points = len(P_list) ** depth
+    logging.info("Expanding the IFS to depth %d (%d points)", depth, n_points)
+    instrumentation.record("chaos_game_ifs", iterations=n_points)
+
+    if raster is not None:
+        # Address prefixes whose images all fall outside the raster are never expanded
+        for block in _ifs_blocks(a, P, P[0] / (1 - a), depth, block_size, window=raster.extent):
+            raster.add(block[:, 0], block[:, 1])
+        return raster
+
+    if n_points > max_points:
+        raise ValueError("Depth %d gives %d points, more than max_points; render into a raster instead."
+                         % (depth, n_points))
+    points = np.concatenate(list(_ifs_blocks(a, P, P[0] / (1 - a), depth, block_size)))
+    return points[:, 0].copy(), points[:, 1].copy()
+
 def main() -> None:
     # Contraction factor and parameters
     a = 41 / 108
@@ -83,19 +591,23 @@ def main() -> None:
 
     logging.info("Starting Chaos Game simulation with a = %f, n = %d", a, n)
     try:
-        xn, yn = chaos_game(a, P_list, n)
+        raster = DensityRaster(attractor_extent(a, P_list), width=2048, height=2048)
+        chaos_game_raster(a, P_list, n, raster)
     except Exception as e:
         logging.error("Simulation failed: %s", e)
         return
 
     logging.info("Simulation completed, now plotting results.")
-    plt.figure(figsize=(8, 8))
-    plt.scatter(xn, yn, color='#cd0066', s=0.05)
-    plt.xlabel('xₙ')
-    plt.ylabel('yₙ')
-    plt.title('The Chaos Game: 2-D Iterated Map')
-    plt.axis('equal')
+    with instrumentation.phase("plotting"):
+        import matplotlib.pyplot as plt
+        plt.figure(figsize=(8, 8))
+        plt.imshow(raster.tone_map('log'), extent=raster.extent, cmap='RdPu')
+        plt.xlabel('xₙ')
+        plt.ylabel('yₙ')
+        plt.title('The Chaos Game: 2-D Iterated Map')
+        plt.axis('equal')
     plt.show()
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
     main()
@@ -0,0 +1,269 @@
+"""
+Single command-line entry point for running the models headless.
+
+Every model runs without matplotlib and writes its results as binary NumPy output
+instead of opening a plot window. Results with a single array are written as `.npy`
+when the output path ends in `.npy`; otherwise all arrays are stored in one `.npz`
+archive under the names listed below.
+
+    logistic      x                      logistic map orbit
+    tent          x                      tent map orbit
+    chaos-game    x, y | counts, extent  chaos game points, or a density raster
+    complex-map   x, y                   complex-valued iterated map orbit
+    bifurcation   lambdas, x | counts, extent
+                                         λ sweep of xₙ₊₁ = xₙ * exp(λ * (1 - xₙ))
+    lyapunov      params, exponents      Lyapunov exponents over a parameter grid
+    basin         (.npy label map)       basin image of the complex-valued map
+    euler, rk4    t, x                   ODE trajectory of dx/dt = f(t, x)
+    system        t, x                   RK4 ensemble of the Lorenz, Rössler, Attractor or RPSLK system
+    siqr          counts, grid           SIQR cellular automaton S/I/Q/R time series and final grid
+
+Usage:
+    python cli.py bifurcation --n 512 --raster 2500 1600 -o bifurcation.npz
+    python cli.py rk4 --dt 1e-5 --every 1000 -o rk4.npz --metrics rk4.json
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import argparse
+import contextlib
+import sys
+import numpy as np
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from chaos_game import attractor_extent, chaos_game_ifs, chaos_game_numpy, chaos_game_raster
+from complex_iterated_map import complex_iterated_map_batched, render_basin
+from density_raster import DensityRaster
+from euler_method import euler, f as euler_f
+import instrumentation
+from logistic_map import logistic_blocks
+from lyapunov import lyapunov_exponential, lyapunov_logistic, lyapunov_tent
+from ode_systems import RPSLK_X0, SYSTEMS, random_initial_conditions, simulate
+from one_dimensional_map import one_dimensional_map_batched, one_dimensional_map_raster
+from runge_kutta import RK4, f as rk4_f
+from siqr_automaton import siqr
+from tent_map import tent_blocks
+from trajectory_recorder import TrajectoryRecorder
+
+# Vertices of the regular pentagon used by chaos_game.main()
+_PENTAGON = [(951, 309), (588, -809), (-588, -809), (-951, 309), (0, 1000)]
+
+def _point(text: str) -> Tuple[float, float]:
+    """
+    Parse an "x,y" command-line point.
+    """
+    try:
+        x, y = (float(v) for v in text.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError("points must be given as x,y (got %r)" % text)
+    return x, y
+
+def _run_logistic(args: argparse.Namespace) -> Dict[str, np.ndarray]:
+    return {"x": np.concatenate(list(logistic_blocks(args.x0, args.r, args.n, args.n_transient)))}
+
+def _run_tent(args: argparse.Namespace) -> Dict[str, np.ndarray]:
+    return {"x": np.concatenate(list(tent_blocks(args.x0, args.n, args.n_transient)))}
+
+def _run_chaos_game(args: argparse.Namespace) -> Dict[str, np.ndarray]:
+    points = args.points or _PENTAGON
+    if args.raster:
+        raster = DensityRaster(attractor_extent(args.a, points), width=args.raster[0], height=args.raster[1])
+        if args.ifs:
+            chaos_game_ifs(args.a, points, raster, depth=args.depth)
+        else:
+            chaos_game_raster(args.a, points, args.n, raster, seed=args.seed)
+        return {"counts": raster.counts, "extent": np.array(raster.extent)}
+    if args.ifs:
+        if args.depth is None:
+            raise ValueError("--ifs without --raster needs --depth.")
+        x, y = chaos_game_ifs(args.a, points, depth=args.depth)
+        return {"x": x, "y": y}
+    x, y = chaos_game_numpy(args.a, points, args.n, seed=args.seed)
+    return {"x": x, "y": y}
+
+def _run_complex_map(args: argparse.Namespace) -> Dict[str, np.ndarray]:
+    x, y = complex_iterated_map_batched(args.x0, args.y0, args.n, args.n_transient)
+    return {"x": x[0], "y": y[0]}
+
+def _run_bifurcation(args: argparse.Namespace) -> Dict[str, np.ndarray]:
+    if args.raster:
+        raster = DensityRaster((args.lam_start, args.lam_stop, 0.0, 5.5),
+                               width=args.raster[0], height=args.raster[1])
+        one_dimensional_map_raster(raster, args.n, args.lam_start, args.lam_stop, args.lam_step,
+                                   args.x0, args.n_transient)
+        return {"counts": raster.counts, "extent": np.array(raster.extent)}
+    lambdas, x = one_dimensional_map_batched(args.n, args.lam_start, args.lam_stop, args.lam_step,
+                                             args.x0, args.n_transient)
+    return {"lambdas": lambdas, "x": x}
+
+def _run_lyapunov(args: argparse.Namespace) -> Dict[str, np.ndarray]:
+    sweep = {"logistic": lyapunov_logistic, "tent": lyapunov_tent, "exponential": lyapunov_exponential}[args.map]
+    params = np.linspace(args.start, args.stop, args.num)
+    exponents, counts = sweep(params, n=args.n, n_transient=args.n_transient, tol=args.tol)
+    return {"params": params, "exponents": exponents, "counts": counts}
+
+def _run_basin(args: argparse.Namespace) -> Dict[str, np.ndarray]:
+    if not args.output.endswith(".npy"):
+        raise ValueError("basin writes a memory-mapped label map; the output path must end in .npy.")
+    render_basin(args.output, args.width, args.height, max_iter=args.max_iter, mode=args.mode,
+                 n_workers=args.workers)
+    return {}
+
+def _run_ode(args: argparse.Namespace) -> Dict[str, np.ndarray]:
+    solver, f_func = (euler, euler_f) if args.model == "euler" else (RK4, rk4_f)
+    recorder = TrajectoryRecorder(every=args.every)
+    solver(args.t0, args.x0, args.t_end, args.dt, f_func, recorder=recorder)
+    t, x = recorder.finalize()
+    return {"t": t, "x": x}
+
+def _run_system(args: argparse.Namespace) -> Dict[str, np.ndarray]:
+    if args.name == "rpslk":
+        x0 = np.tile(RPSLK_X0, (args.n_traj, 1))
+    else:
+        x0 = random_initial_conditions(args.n_traj, SYSTEMS[args.name][1], seed=args.seed)
+    t, x = simulate(args.name, x0, args.dt, args.t_end, args.every)
+    return {"t": t, "x": x}
+
+def _run_siqr(args: argparse.Namespace) -> Dict[str, np.ndarray]:
+    counts, grid = siqr(args.n, args.alpha, args.gamma, args.q, args.beta0, args.max_iter, args.seed)
+    return {"counts": counts, "grid": grid}
+
+def _write(path: str, arrays: Dict[str, np.ndarray]) -> None:
+    """
+    Write the result arrays to a `.npy` file (single array) or a `.npz` archive.
+    """
+    if path.endswith(".npy"):
+        if len(arrays) != 1:
+            raise ValueError("This model produces %s; use a .npz output path." % ", ".join(arrays))
+        np.save(path, next(iter(arrays.values())))
+    else:
+        np.savez(path, **arrays)
+
+def _parser() -> argparse.ArgumentParser:
+    """
+    Build the argument parser with one sub-command per model.
+    """
+    parser = argparse.ArgumentParser(description="Run a nonlinear-dynamics model headless.")
+    parser.add_argument("--log-level", default="INFO", help="logging level (default: INFO)")
+    models = parser.add_subparsers(dest="model", required=True)
+
+    def model(name: str, run, help_text: str) -> argparse.ArgumentParser:
+        sub = models.add_parser(name, help=help_text)
+        sub.add_argument("-o", "--output", required=True, help="output .npz (or .npy) file")
+        sub.add_argument("--metrics", metavar="PATH", help="write instrumentation metrics as JSON")
+        sub.set_defaults(run=run)
+        return sub
+
+    sub = model("logistic", _run_logistic, "logistic map orbit")
+    sub.add_argument("--x0", type=float, default=0.2)
+    sub.add_argument("--r", type=float, default=3.9)
+    sub.add_argument("--n", type=int, default=1010)
+    sub.add_argument("--n-transient", type=int, default=0)
+
+    sub = model("tent", _run_tent, "tent map orbit")
+    sub.add_argument("--x0", type=float, default=0.4)
+    sub.add_argument("--n", type=int, default=1005)
+    sub.add_argument("--n-transient", type=int, default=0)
+
+    sub = model("chaos-game", _run_chaos_game, "chaos game points or density raster")
+    sub.add_argument("--a", type=float, default=41 / 108)
+    sub.add_argument("--points", type=_point, nargs="+", metavar="X,Y",
+                     help="fixed points (default: regular pentagon)")
+    sub.add_argument("--n", type=int, default=2 ** 18)
+    sub.add_argument("--seed", type=int)
+    sub.add_argument("--raster", type=int, nargs=2, metavar=("WIDTH", "HEIGHT"),
+                     help="bin the points into a raster instead of storing them")
+    sub.add_argument("--ifs", action="store_true",
+                     help="enumerate the attractor deterministically instead of playing the game")
+    sub.add_argument("--depth", type=int, help="address depth for --ifs (default: one pixel)")
+
+    sub = model("complex-map", _run_complex_map, "complex-valued iterated map orbit")
+    sub.add_argument("--x0", type=float, default=2.46954962375565)
+    sub.add_argument("--y0", type=float, default=-1.51067616887886)
+    sub.add_argument("--n", type=int, default=2 ** 15)
+    sub.add_argument("--n-transient", type=int, default=100)
+
+    sub = model("bifurcation", _run_bifurcation, "λ sweep of the one-dimensional map")
+    sub.add_argument("--n", type=int, default=2 ** 9)
+    sub.add_argument("--lam-start", type=float, default=1.5)
+    sub.add_argument("--lam-stop", type=float, default=4.0)
+    sub.add_argument("--lam-step", type=float, default=0.001)
+    sub.add_argument("--x0", type=float, default=0.5)
+    sub.add_argument("--n-transient", type=int, default=255)
+    sub.add_argument("--raster", type=int, nargs=2, metavar=("WIDTH", "HEIGHT"),
+                     help="bin the iterates into a raster instead of storing them")
+
+    sub = model("lyapunov", _run_lyapunov, "Lyapunov exponents over a parameter grid")
+    sub.add_argument("--map", choices=("logistic", "tent", "exponential"), default="logistic")
+    sub.add_argument("--start", type=float, default=2.5)
+    sub.add_argument("--stop", type=float, default=4.0)
+    sub.add_argument("--num", type=int, default=10000)
+    sub.add_argument("--n", type=int, default=10000)
+    sub.add_argument("--n-transient", type=int, default=1000)
+    sub.add_argument("--tol", type=float)
+
+    sub = model("basin", _run_basin, "basin image of the complex-valued map")
+    sub.add_argument("--width", type=int, default=2048)
+    sub.add_argument("--height", type=int, default=2048)
+    sub.add_argument("--max-iter", type=int, default=256)
+    sub.add_argument("--mode", choices=("attractor", "escape"), default="attractor")
+    sub.add_argument("--workers", type=int)
+
+    for name in ("euler", "rk4"):
+        sub = model(name, _run_ode, "%s trajectory of dx/dt = f(t, x)" % name.upper())
+        sub.add_argument("--t0", type=float, default=0.0)
+        sub.add_argument("--x0", type=float, default=0.0)
+        sub.add_argument("--t-end", type=float, default=10.0)
+        sub.add_argument("--dt", type=float, default=1e-5)
+        sub.add_argument("--every", type=int, default=1000, help="keep every k-th step")
+
+    sub = model("system", _run_system, "RK4 ensemble of a continuous system from the MATLAB models")
+    sub.add_argument("--name", choices=tuple(SYSTEMS), default="lorenz")
+    sub.add_argument("--n-traj", type=int, default=1, help="number of trajectories")
+    sub.add_argument("--dt", type=float, default=0.01)
+    sub.add_argument("--t-end", type=float, help="end time (default: time span of the MATLAB script)")
+    sub.add_argument("--every", type=int, default=1, help="keep every k-th step")
+    sub.add_argument("--seed", type=int)
+
+    sub = model("siqr", _run_siqr, "SIQR cellular automaton")
+    sub.add_argument("--n", type=int, default=160, help="grid size N")
+    sub.add_argument("--alpha", type=float, default=0.7, help="lockdown strength")
+    sub.add_argument("--gamma", type=float, default=0.06, help="recovery rate")
+    sub.add_argument("--q", type=float, default=0.1, help="quarantine rate")
+    sub.add_argument("--beta0", type=float, default=0.4, help="base transmission rate")
+    sub.add_argument("--max-iter", type=int, default=5000)
+    sub.add_argument("--seed", type=int)
+
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Main driver function: parse the command line, run the model and write its output.
+
+    Parameters:
+        argv (Optional[List[str]]): Arguments; sys.argv[1:] by default.
+
+    Returns:
+        int: Process exit status.
+    """
+    args = _parser().parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s [%(levelname)s] %(message)s")
+
+    try:
+        # Kernels are only instrumented when metrics are requested
+        with instrumentation.instrument() if args.metrics else contextlib.nullcontext() as metrics:
+            arrays = args.run(args)
+            if arrays:
+                _write(args.output, arrays)
+        logging.info("Wrote %s", args.output)
+        if args.metrics:
+            metrics.to_json(args.metrics)
+    except Exception as e:
+        logging.error("An error occurred: %s", e)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,6 +5,19 @@ This script defines a function to iterate the map:
    xₙ₊₁ = π + 1/2 * (xₙ * cos(xₙ² + yₙ²) - yₙ * sin(xₙ² + yₙ²))
    yₙ₊₁ = 1/2 * (xₙ * sin(xₙ² + yₙ²) + yₙ * cos(xₙ² + yₙ²))
 for a specified number of iterations, starting from given initial conditions.
+complex_iterated_map_batched() advances many initial conditions together, computing the
+phase xₙ² + yₙ² and its cosine and sine only once per step, and
+complex_iterated_map_blocks() streams the orbits lazily as NumPy blocks.
+render_basin() iterates every point of a W×H grid of initial conditions and records a
+per-pixel escape time or final attractor cell, processing tiles on a worker pool and
+streaming them into a memory-mapped `.npy` file; basin_labels() computes the same labels
+for a single in-memory tile. The map contracts towards π, |zₙ₊₁ - π| = |zₙ| / 2, so for
+an escape radius of at least 2π a point either escapes on the first step or never, and
+escape-time maps only show the disc |z₁| <= escape_radius. Orbits from the default
+region do not settle on a fixed point but on one chaotic attractor, so attractor-cell
+labels are only informative where orbits converge; elsewhere they are -1.
+complex_iterated_map() and complex_iterated_map_batched() accept dtype= (float32/float64)
+and out= arrays, so orbits can be written straight into caller-owned or shared buffers.
 The first 100 iterations are discarded to remove transient dynamics, and the final
 results are plotted as a scatter plot in the complex plane.
 
@@ -12,16 +25,164 @@ Author: Sabneet Bains
 License: MIT License
 """
 
+import os
 import random
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
-import matplotlib.pyplot as plt
 import logging
-from typing import Tuple
+from typing import Iterator, Optional, Tuple, Union
+from buffers import output_pair
+from trajectory_recorder import TrajectoryRecorder
+import instrumentation
 
-# Setup basic logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+def _step_map(xn: np.ndarray, yn: np.ndarray, phase: np.ndarray, cos_p: np.ndarray,
+              sin_p: np.ndarray, tmp: np.ndarray) -> None:
+    """
+    Advance every orbit by one iteration, in place.
+
+    Parameters:
+        xn (np.ndarray): Current x-values, overwritten with xₙ₊₁.
+        yn (np.ndarray): Current y-values, overwritten with yₙ₊₁.
+        phase, cos_p, sin_p, tmp (np.ndarray): Work buffers of the same shape as xn.
+    """
+    # Phase xₙ² + yₙ² and its trig values, each computed once per step
+    np.multiply(xn, xn, out=phase)
+    np.multiply(yn, yn, out=tmp)
+    phase += tmp
+    np.cos(phase, out=cos_p)
+    np.sin(phase, out=sin_p)
+
+    # xₙ₊₁ = π + 1/2 * (xₙ cos - yₙ sin), yₙ₊₁ = 1/2 * (xₙ sin + yₙ cos)
+    np.multiply(xn, cos_p, out=tmp)
+    tmp -= yn * sin_p
+    xn *= sin_p
+    yn *= cos_p
+    yn += xn
+    yn *= 0.5
+    np.multiply(tmp, 0.5, out=xn)
+    xn += np.pi
+
+def complex_iterated_map_batched(x0: Union[float, np.ndarray], y0: Union[float, np.ndarray],
+                                 n: int, n_transient: int = 100, dtype: Optional[type] = None,
+                                 out: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the complex-valued iterated map for many initial conditions at once.
+
+    All orbits are advanced together as NumPy state vectors. As in complex_iterated_map(),
+    the first iterate is computed from (x0, y0), the map is iterated n more times, and the
+    first n_transient iterates are discarded without being stored.
+
+    Parameters:
+        x0 (float | np.ndarray): Initial x-values, one per orbit.
+        y0 (float | np.ndarray): Initial y-values, one per orbit (same shape as x0).
+        n (int): Number of iterations to perform.
+        n_transient (int): Number of leading iterates to discard (at most n + 1).
+        dtype (Optional[type]): np.float32 or np.float64 precision of the state and the
+                                results (default float64, or the dtype of out).
+        out (Optional[Tuple[np.ndarray, np.ndarray]]): (n_orbits × n_kept) arrays to write the
+                                                       results into and return.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (n_orbits × n_kept) arrays of x and y coordinates,
+                                       where n_kept = n + 1 - n_transient.
+    """
+    x_init = np.atleast_1d(np.asarray(x0, dtype=float)).ravel()
+    y_init = np.atleast_1d(np.asarray(y0, dtype=float)).ravel()
+    if x_init.shape != y_init.shape:
+        raise ValueError("x0 and y0 must contain the same number of initial conditions.")
+    if not isinstance(n, int) or n < 0:
+        raise ValueError("Number of iterations n must be a non-negative integer.")
+    if not isinstance(n_transient, int) or not 0 <= n_transient <= n + 1:
+        raise ValueError("n_transient must be an integer between 0 and n + 1.")
+
+    n_kept = n + 1 - n_transient
+    x_results, y_results = output_pair((x_init.size, n_kept), dtype, out)
+
+    # Step in the precision of the results
+    xn = x_init.astype(x_results.dtype)
+    yn = y_init.astype(x_results.dtype)
+    phase, cos_p, sin_p, tmp = (np.empty_like(xn) for _ in range(4))
+    instrumentation.record("complex_iterated_map_batched", iterations=(n + 1) * xn.size)
+
+    with instrumentation.phase("transient"):
+        for _ in range(n_transient):
+            _step_map(xn, yn, phase, cos_p, sin_p, tmp)
+    with instrumentation.phase("steady_state"):
+        for i in range(n_transient, n + 1):
+            _step_map(xn, yn, phase, cos_p, sin_p, tmp)
+            x_results[:, i - n_transient] = xn
+            y_results[:, i - n_transient] = yn
+
+    return x_results, y_results
+
+def complex_iterated_map_blocks(x0: Union[float, np.ndarray], y0: Union[float, np.ndarray],
+                                n: Optional[int] = None, n_transient: int = 0,
+                                block_size: int = 4096) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Lazily generate iterates of the complex-valued map in blocks.
+
+    As in logistic_blocks(), the stream contains z(0) = (x0, y0), z(1), ..., z(n) (or runs
+    forever if n is None), minus the first n_transient, which are computed but never
+    stored; the iterates of complex_iterated_map_batched(n, n_transient=k) are those of
+    n + 1 and n_transient=k + 1 here. To resume a stream, pass the last x and y values
+    received as (x0, y0) with n_transient=1. The arguments are checked when the function
+    is called, not when the first block is requested.
+
+    Parameters:
+        x0 (float | np.ndarray): Initial x-value(s).
+        y0 (float | np.ndarray): Initial y-value(s) (same shape as x0).
+        n (Optional[int]): Index of the last iterate to produce, or None for an unbounded stream.
+        n_transient (int): Number of leading iterates (counting (x0, y0)) to skip.
+        block_size (int): Maximum number of iterates per yielded block.
+
+    Returns:
+        Iterator[Tuple[np.ndarray, np.ndarray]]: Generator of blocks of x and y coordinates,
+            of shape (m,) for scalar initial conditions or (n_orbits × m) for arrays.
+    """
+    if n is not None and (not isinstance(n, int) or n < 0):
+        raise ValueError("Number of iterations n must be a non-negative integer.")
+    if not isinstance(n_transient, int) or n_transient < 0:
+        raise ValueError("n_transient must be a non-negative integer.")
+    if not isinstance(block_size, int) or block_size <= 0:
+        raise ValueError("block_size must be a positive integer.")
+
+    scalar = np.ndim(x0) == 0 and np.ndim(y0) == 0
+    xn = np.atleast_1d(np.array(x0, dtype=float)).ravel()
+    yn = np.atleast_1d(np.array(y0, dtype=float)).ravel()
+    if xn.shape != yn.shape:
+        raise ValueError("x0 and y0 must contain the same number of initial conditions.")
+    return _iterate_blocks(xn, yn, scalar, n, n_transient, block_size)
+
+def _iterate_blocks(xn: np.ndarray, yn: np.ndarray, scalar: bool, n: Optional[int],
+                    n_transient: int, block_size: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Generator behind complex_iterated_map_blocks(), run on validated arguments.
+    """
+    phase, cos_p, sin_p, tmp = (np.empty_like(xn) for _ in range(4))
+
+    # Skip the transient without storing it
+    for _ in range(n_transient):
+        _step_map(xn, yn, phase, cos_p, sin_p, tmp)
+
+    index = n_transient
+    while n is None or index <= n:
+        m = block_size if n is None else min(block_size, n + 1 - index)
+        # Stage time-major so each step writes a contiguous row
+        x_block = np.empty((m, xn.size))
+        y_block = np.empty((m, yn.size))
+        for i in range(m):
+            x_block[i] = xn
+            y_block[i] = yn
+            _step_map(xn, yn, phase, cos_p, sin_p, tmp)
+        index += m
+        if scalar:
+            yield x_block[:, 0].copy(), y_block[:, 0].copy()
+        else:
+            yield np.ascontiguousarray(x_block.T), np.ascontiguousarray(y_block.T)
 
-def complex_iterated_map(x0: float, y0: float, n: int) -> Tuple[np.ndarray, np.ndarray]:
+def complex_iterated_map(x0: float, y0: float, n: int, recorder: Optional[TrajectoryRecorder] = None,
+                         dtype: Optional[type] = None,
+                         out: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> Tuple[np.ndarray, np.ndarray]:
     """
     Compute the complex-valued iterated map.
     
@@ -29,6 +190,13 @@ def complex_iterated_map(x0: float, y0: float, n: int) -> Tuple[np.ndarray, np.n
         x0 (float): Initial x-value.
         y0 (float): Initial y-value.
         n (int): Number of iterations to perform.
+        recorder (Optional[TrajectoryRecorder]): If given, each kept point is offered to it as the
+                                                 sample (i, (xᵢ, yᵢ)) with state_shape (2,), and
+                                                 only the final point is returned.
+        dtype (Optional[type]): np.float32 or np.float64 storage of the results (default float64).
+                                The orbit is always computed in double precision.
+        out (Optional[Tuple[np.ndarray, np.ndarray]]): Arrays (x_out, y_out) of the kept length to
+                                                       write the results into and return.
         
     Returns:
         Tuple[np.ndarray, np.ndarray]: Arrays of x and y coordinates after discarding the first 100 iterations.
@@ -38,26 +206,205 @@ def complex_iterated_map(x0: float, y0: float, n: int) -> Tuple[np.ndarray, np.n
         raise ValueError("Initial conditions x0 and y0 must be numeric.")
     if not isinstance(n, int) or n < 0:
         raise ValueError("Number of iterations n must be a non-negative integer.")
+    if recorder is not None and out is not None:
+        raise ValueError("recorder and out cannot be combined.")
 
-    # Pre-allocate arrays for performance
-    xn = np.empty(n + 1)
-    yn = np.empty(n + 1)
+    if n < 100:
+        logging.warning("Number of iterations is less than 100; no transient removal performed.")
+    instrumentation.record("complex_iterated_map", iterations=n + 1)
     
-    # Initial iteration: compute first values from x0, y0
-    xn[0] = np.pi + 0.5 * (x0 * np.cos(x0**2 + y0**2) - y0 * np.sin(x0**2 + y0**2))
-    yn[0] = 0.5 * (x0 * np.sin(x0**2 + y0**2) + y0 * np.cos(x0**2 + y0**2))
+    # Stream the orbit into the recorder, keeping only the current point
+    if recorder is not None:
+        n_transient = 100 if n >= 100 else 0
+        x, y = x0, y0
+        for i in range(n + 1):
+            phase = x**2 + y**2
+            cos_p, sin_p = np.cos(phase), np.sin(phase)
+            x, y = np.pi + 0.5 * (x * cos_p - y * sin_p), 0.5 * (x * sin_p + y * cos_p)
+            if i >= n_transient:
+                recorder.record(i, (x, y))
+        return np.array([x]), np.array([y])
     
-    # Iterate the map
-    for i in range(n):
-        xn[i+1] = np.pi + 0.5 * (xn[i] * np.cos(xn[i]**2 + yn[i]**2) - yn[i] * np.sin(xn[i]**2 + yn[i]**2))
-        yn[i+1] = 0.5 * (xn[i] * np.sin(xn[i]**2 + yn[i]**2) + yn[i] * np.cos(xn[i]**2 + yn[i]**2))
+    # Allocate only the kept iterates; the first 100 are computed but never stored
+    n_transient = 100 if n >= 100 else 0
+    xn, yn = output_pair((n + 1 - n_transient,), dtype, out)
     
-    # Remove transient dynamics (first 100 iterations)
-    if n < 100:
-        logging.warning("Number of iterations is less than 100; no transient removal performed.")
-        return xn, yn
+    # Iterate the map, computing the phase and its trig values once per step
+    x, y = x0, y0
+    for i in range(n + 1):
+        phase = x**2 + y**2
+        cos_p, sin_p = np.cos(phase), np.sin(phase)
+        x, y = np.pi + 0.5 * (x * cos_p - y * sin_p), 0.5 * (x * sin_p + y * cos_p)
+        if i >= n_transient:
+            xn[i - n_transient] = x
+            yn[i - n_transient] = y
+    return xn, yn
+
+def _basin_tile(x0: np.ndarray, y0: np.ndarray, max_iter: int, mode: str,
+                escape_radius: float, tol: float,
+                cell_extent: Tuple[float, float, float, float],
+                cell_grid: Tuple[int, int]) -> np.ndarray:
+    """
+    Iterate a flat array of initial conditions and return one integer label per point.
+
+    In 'escape' mode the label is the iteration at which |z| first exceeds escape_radius
+    (max_iter if it never does). Since |zₙ₊₁| <= π + |zₙ| / 2, a point inside a radius of
+    at least 2π stays inside, so such runs stop after the first step. In 'attractor' mode
+    the label is the index of the attractor cell containing the point once it converges
+    (|zₙ₊₁ - zₙ| < tol), or -1 if it converges outside cell_extent or has not converged
+    after max_iter iterations; the label therefore does not depend on where a chaotic
+    orbit happens to be when iteration stops. Finished points are compacted out of the
+    active set, so later iterations only touch live points.
+    """
+    labels = np.full(x0.size, max_iter if mode == "escape" else -1, dtype=np.int32)
+    live = np.arange(x0.size)
+    xn = x0.astype(float)
+    yn = y0.astype(float)
+    phase, cos_p, sin_p, tmp = (np.empty_like(xn) for _ in range(4))
+    r2 = escape_radius * escape_radius
+    cx_min, cx_max, cy_min, cy_max = cell_extent
+    ncx, ncy = cell_grid
+
+    def cell_of(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        col = np.floor((x - cx_min) / (cx_max - cx_min) * ncx)
+        row = np.floor((cy_max - y) / (cy_max - cy_min) * ncy)
+        inside = (col >= 0) & (col < ncx) & (row >= 0) & (row < ncy)
+        return np.where(inside, row * ncx + col, -1).astype(np.int32)
+
+    for i in range(max_iter):
+        if live.size == 0:
+            break
+        k = live.size
+        if mode == "attractor":
+            x_prev = xn.copy()
+            y_prev = yn.copy()
+        _step_map(xn, yn, phase[:k], cos_p[:k], sin_p[:k], tmp[:k])
+
+        if mode == "escape":
+            done = xn * xn + yn * yn > r2
+            labels[live[done]] = i + 1
+        else:
+            done = (xn - x_prev) ** 2 + (yn - y_prev) ** 2 < tol * tol
+            labels[live[done]] = cell_of(xn[done], yn[done])
+
+        # Compact finished points out of the active set
+        if done.any():
+            keep = ~done
+            live = live[keep]
+            xn = xn[keep]
+            yn = yn[keep]
+        if mode == "escape" and escape_radius >= 2 * np.pi:
+            break
+
+    return labels
+
+def basin_labels(extent: Tuple[float, float, float, float], width: int, height: int,
+                 max_iter: int = 256, mode: str = "attractor", escape_radius: float = 10.0,
+                 tol: float = 1e-9,
+                 cell_extent: Tuple[float, float, float, float] = (0.0, 2 * np.pi, -np.pi, np.pi),
+                 cell_grid: Tuple[int, int] = (64, 64)) -> np.ndarray:
+    """
+    Compute the basin-of-attraction or escape-time labels of a width × height pixel grid in memory.
+
+    See render_basin() for the parameters; row 0 is the top (y_max) of the extent.
+
+    Returns:
+        np.ndarray: (height × width) int32 label array.
+    """
+    if mode not in ("escape", "attractor"):
+        raise ValueError("mode must be 'escape' or 'attractor'.")
+    x_min, x_max, y_min, y_max = extent
+    # Pixel centres
+    xs = x_min + (np.arange(width) + 0.5) * (x_max - x_min) / width
+    ys = y_max - (np.arange(height) + 0.5) * (y_max - y_min) / height
+    gx, gy = np.meshgrid(xs, ys)
+    labels = _basin_tile(gx.ravel(), gy.ravel(), max_iter, mode, escape_radius, tol, cell_extent, cell_grid)
+    return labels.reshape(height, width)
+
+def _basin_worker(out_path: str, rows: Tuple[int, int], cols: Tuple[int, int],
+                  extent: Tuple[float, float, float, float], shape: Tuple[int, int],
+                  max_iter: int, mode: str, escape_radius: float, tol: float,
+                  cell_extent: Tuple[float, float, float, float],
+                  cell_grid: Tuple[int, int]) -> Tuple[int, int]:
+    """
+    Render one tile of the basin map and write it into the memory-mapped output file.
+    """
+    height, width = shape
+    x_min, x_max, y_min, y_max = extent
+    # Pixel centres; row 0 is the top (y_max) of the extent
+    xs = x_min + (np.arange(*cols) + 0.5) * (x_max - x_min) / width
+    ys = y_max - (np.arange(*rows) + 0.5) * (y_max - y_min) / height
+    gx, gy = np.meshgrid(xs, ys)
+
+    labels = _basin_tile(gx.ravel(), gy.ravel(), max_iter, mode, escape_radius, tol,
+                         cell_extent, cell_grid)
+
+    out = np.load(out_path, mmap_mode="r+")
+    out[rows[0]:rows[1], cols[0]:cols[1]] = labels.reshape(gy.shape)
+    out.flush()
+    del out
+    return rows[0], cols[0]
+
+def render_basin(out_path: str, width: int, height: int,
+                 extent: Tuple[float, float, float, float] = (-2 * np.pi, 2 * np.pi, -2 * np.pi, 2 * np.pi),
+                 max_iter: int = 256, mode: str = "attractor", escape_radius: float = 10.0,
+                 tol: float = 1e-9,
+                 cell_extent: Tuple[float, float, float, float] = (0.0, 2 * np.pi, -np.pi, np.pi),
+                 cell_grid: Tuple[int, int] = (64, 64), tile_size: int = 512,
+                 n_workers: Optional[int] = None) -> np.ndarray:
+    """
+    Render a per-pixel basin-of-attraction or escape-time map of the complex map.
+
+    Every pixel of a width × height grid over extent is used as an initial condition.
+    The grid is split into tile_size × tile_size tiles, which are iterated on a process
+    pool and written straight into a memory-mapped int32 `.npy` file, so only one tile
+    per worker is ever held in memory.
+
+    Parameters:
+        out_path (str): Destination `.npy` file for the (height × width) label map.
+        width (int): Number of pixel columns.
+        height (int): Number of pixel rows.
+        extent (Tuple[float, float, float, float]): (x_min, x_max, y_min, y_max) of the initial conditions.
+        max_iter (int): Maximum number of iterations per pixel.
+        mode (str): 'escape' for escape time, or 'attractor' for the cell of the fixed point
+                    the orbit converges to (-1 if it does not converge within max_iter).
+        escape_radius (float): Radius |z| beyond which a point counts as escaped ('escape' mode).
+        tol (float): Step size |zₙ₊₁ - zₙ| below which a point counts as converged ('attractor' mode).
+        cell_extent (Tuple[float, float, float, float]): Region divided into attractor cells.
+                                                          The default disc |z - π| <= π contains the attractor.
+        cell_grid (Tuple[int, int]): Number of attractor cells along x and y.
+        tile_size (int): Edge length of a tile in pixels.
+        n_workers (Optional[int]): Number of worker processes. Defaults to os.cpu_count();
+                                   1 renders every tile in the calling process.
+
+    Returns:
+        np.ndarray: Read-only memory map of the (height × width) int32 label array.
+    """
+    if mode not in ("escape", "attractor"):
+        raise ValueError("mode must be 'escape' or 'attractor'.")
+    for name, value in (("width", width), ("height", height), ("max_iter", max_iter),
+                        ("tile_size", tile_size)):
+        if not isinstance(value, int) or value <= 0:
+            raise ValueError(f"{name} must be a positive integer.")
+    if extent[1] <= extent[0] or extent[3] <= extent[2]:
+        raise ValueError("extent must satisfy x_min < x_max and y_min < y_max.")
+
+    np.lib.format.open_memmap(out_path, mode="w+", dtype=np.int32, shape=(height, width)).flush()
+    jobs = [(out_path, (r, min(r + tile_size, height)), (c, min(c + tile_size, width)), extent,
+             (height, width), max_iter, mode, escape_radius, tol, cell_extent, cell_grid)
+            for r in range(0, height, tile_size) for c in range(0, width, tile_size)]
+
+    n_workers = max(1, min(n_workers or os.cpu_count() or 1, len(jobs)))
+    logging.info("Rendering %d x %d basin map in %d tiles on %d workers", width, height, len(jobs), n_workers)
+    if n_workers == 1:
+        for job in jobs:
+            _basin_worker(*job)
     else:
-        return xn[100:], yn[100:]
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            for future in [pool.submit(_basin_worker, *job) for job in jobs]:
+                future.result()
+
+    return np.load(out_path, mmap_mode="r")
 
 def main() -> None:
     try:
@@ -70,15 +417,18 @@ def main() -> None:
         xn, yn = complex_iterated_map(x0, y0, n)
         
         # Plotting the results in the complex plane
-        plt.figure(figsize=(8, 8))
-        plt.scatter(xn, yn, color='#cd0066', s=0.05)
-        plt.xlabel('Re(z)')
-        plt.ylabel('Im(z)')
-        plt.title('Complex-Valued Iterated Map')
-        plt.axis('equal')
+        with instrumentation.phase("plotting"):
+            import matplotlib.pyplot as plt
+            plt.figure(figsize=(8, 8))
+            plt.scatter(xn, yn, color='#cd0066', s=0.05)
+            plt.xlabel('Re(z)')
+            plt.ylabel('Im(z)')
+            plt.title('Complex-Valued Iterated Map')
+            plt.axis('equal')
         plt.show()
     except Exception as e:
         logging.error("An error occurred: %s", e)
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
     main()
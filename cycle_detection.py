@@ -0,0 +1,209 @@
+"""
+Period detection with early termination for batched 1-D map parameter sweeps.
+
+Across much of a bifurcation diagram the orbit locks onto a fixed point or a short
+periodic cycle long before the last iteration. periodic_sweep() advances every parameter
+value as one state vector and stages the iterates time-major in blocks of
+max(128, 4 * max_period) steps. At the end of each block that is followed by at least
+another full block of steps (freezing later saves less than the test costs), the last
+iterate of every column is compared with the max_period iterates before it in a single vectorized test,
+and the smallest lag k whose iterate lies within tol * max(|x|, 1) of the last one is a
+candidate cycle of length k. The floor of 1 keeps the tolerance absolute near 0, so
+cycles through (or converging to) 0 are matched as well.
+A candidate is confirmed by requiring every one of the last k iterates to repeat the
+iterate k steps earlier, and its label is reduced to the smallest divisor of k over which
+the cycle values repeat (within √tol, since orbits that approach the cycle while
+oscillating can first match after a multiple of the period). Confirmed columns are frozen:
+their cycle values are recorded, phase-aligned to the first kept iterate, and they are
+compacted out of the live set, so further compute and output are spent only on chaotic
+parameters. Detection runs once per block rather than once per step, so the per-step work
+is the map step plus one row write, and the staged blocks that overlap the kept window
+are the returned iterates, so no column is ever iterated twice. The result is compact:
+iterates are returned only for unresolved parameters, and a frozen parameter is fully
+described by its period and cycle. expand_sweep() materializes the full
+(n_params × n_kept) array when it is really needed.
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import numpy as np
+import logging
+from typing import Callable, Tuple
+
+def _tolerance(b: np.ndarray, tol: float) -> np.ndarray:
+    """
+    Matching distance tol * max(|b|, 1): relative, with an absolute floor of tol so that
+    cycles through (or converging to) 0 can still be matched.
+    """
+    return tol * np.maximum(np.abs(b), 1.0)
+
+def _close(a: np.ndarray, b: np.ndarray, tol: float) -> np.ndarray:
+    """
+    Closeness test |a - b| <= tol * max(|b|, 1) used for cycle matching.
+    """
+    return np.abs(a - b) <= _tolerance(b, tol)
+
+def _detect_cycles(block: np.ndarray, max_period: int, tol: float) -> np.ndarray:
+    """
+    Find the columns of a time-major block of iterates that have settled onto a cycle.
+
+    Parameters:
+        block (np.ndarray): (n_steps × m) consecutive iterates, n_steps >= 2 * max_period.
+        max_period (int): Longest cycle that is detected.
+        tol (float): Matching tolerance passed to _close().
+
+    Returns:
+        np.ndarray: Minimal period of each column, 0 where no cycle was confirmed.
+    """
+    # Compare the last iterate with each of the max_period before it; after reversing the
+    # rows, row k - 1 holds the test at lag k, so argmax finds the smallest matching lag
+    distance = block[-1 - max_period:-1] - block[-1]
+    np.abs(distance, out=distance)
+    hits = (distance <= _tolerance(block[-1], tol))[::-1]
+    first = hits.argmax(axis=0)
+    periods = np.where(hits[first, np.arange(hits.shape[1])], first + 1, 0)
+    cols = np.flatnonzero(periods)
+    k = periods[cols]
+
+    # Confirm: each of the last k iterates repeats the iterate k steps earlier
+    j = np.arange(k.max(initial=1))[:, np.newaxis]
+    recent = block[-1 - j, cols]
+    confirmed = np.all((j >= k) | _close(recent, block[-1 - j - k, cols], tol), axis=0)
+    periods[cols[~confirmed]] = 0
+    cols, k, recent = cols[confirmed], k[confirmed], recent[:, confirmed]
+
+    # Reduce each label to the smallest divisor of k over which the last k values repeat
+    loose = np.sqrt(tol)
+    minimal = k.copy()
+    for d in range(1, int(k.max(initial=1))):
+        rows = np.flatnonzero((minimal > d) & (k % d == 0))
+        if rows.size == 0:
+            continue
+        within = j[:-d] < k[rows] - d
+        repeats = np.all(~within | _close(recent[:-d, rows], recent[d:, rows], loose), axis=0)
+        minimal[rows[repeats]] = d
+    periods[cols] = minimal
+    return periods
+
+def periodic_sweep(step: Callable[[np.ndarray, np.ndarray], np.ndarray], params: np.ndarray,
+                   x0: float, n: int, n_transient: int, max_period: int = 64,
+                   tol: float = 1e-10) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Iterate a 1-D map over a parameter grid, freezing columns that settle onto a cycle.
+
+    The first iterate is computed from x0, the map is iterated n more times, and the
+    first n_transient iterates are discarded, as in one_dimensional_map_batched().
+
+    Parameters:
+        step (Callable[[np.ndarray, np.ndarray], np.ndarray]): Function step(x, p) returning
+            f(x; p) for arrays of states x and parameters p.
+        params (np.ndarray): 1-D grid of parameter values.
+        x0 (float): Initial condition shared by every parameter value.
+        n (int): Number of iterations to perform. Must be greater than n_transient.
+        n_transient (int): Number of leading iterates to discard.
+        max_period (int): Longest cycle that is detected (positive integer).
+        tol (float): Relative distance below which two iterates are considered equal
+                     (absolute for iterates smaller than 1 in magnitude).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]:
+            - x: (n_unresolved × n_kept) array of iterates of the parameter values whose period
+              is 0, in the order of params, where n_kept = n + 1 - n_transient.
+            - periods: Detected period for each parameter value (0 if none was found).
+            - cycles: (n_params × max_period) array of cycle values, NaN-padded past the period
+              and aligned so that kept iterate j of a frozen parameter is cycles[:, j % period].
+    """
+    if not isinstance(n, int) or not isinstance(n_transient, int) or n_transient < 0:
+        raise ValueError("n and n_transient must be integers with n_transient >= 0.")
+    if n <= n_transient:
+        raise ValueError("n must be greater than n_transient to allow for transient removal.")
+    if not isinstance(max_period, int) or max_period <= 0:
+        raise ValueError("max_period must be a positive integer.")
+    if tol <= 0:
+        raise ValueError("tol must be positive.")
+
+    params = np.asarray(params, dtype=float).ravel()
+    n_params = params.size
+    n_kept = n + 1 - n_transient
+
+    periods = np.zeros(n_params, dtype=np.int64)
+    cycles = np.full((n_params, max_period), np.nan)
+
+    live = np.arange(n_params)
+    p = params.copy()
+    x = np.full(n_params, x0, dtype=float)
+
+    # Iterates of the live columns are staged time-major in blocks of block_size steps;
+    # blocks that overlap the kept window are retained together with the live indices
+    # their columns belong to. live only ever shrinks, so every unresolved row is in
+    # every retained block
+    block_size = max(128, 4 * max_period)
+    blocks = []
+    for start in range(0, n + 1, block_size):
+        block = np.empty((min(block_size, n + 1 - start), live.size))
+        for row in range(block.shape[0]):
+            x = step(x, p)
+            block[row] = x
+        end = start + block.shape[0]
+        if end > n_transient:
+            skip = max(n_transient - start, 0)
+            blocks.append((live, start + skip - n_transient, block[skip:]))
+        # Freezing only pays off if at least another block of steps remains
+        if n + 1 - end < block_size:
+            continue
+
+        found = _detect_cycles(block, max_period, tol)
+        frozen = found > 0
+        if not frozen.any():
+            continue
+        rows = live[frozen]
+        k = found[frozen]
+        periods[rows] = k
+        # The block ends at iterate end - 1, i.e. kept column end - 1 - n_transient; pick
+        # the last k iterates in the phase that makes cycles[:, j % k] kept column j
+        t = np.arange(max_period)[np.newaxis, :]
+        phase = (t - (end - n_transient)) % k[:, np.newaxis]
+        aligned = block[block.shape[0] - k[:, np.newaxis] + phase, np.flatnonzero(frozen)[:, np.newaxis]]
+        aligned[t >= k[:, np.newaxis]] = np.nan
+        cycles[rows] = aligned
+
+        keep = ~frozen
+        live, p, x = live[keep], p[keep], x[keep]
+        if live.size == 0:
+            break
+
+    # Gather the rows of the unresolved parameters from the staged blocks
+    x_results = np.empty((live.size, n_kept))
+    if live.size:
+        for columns_live, col, values in blocks:
+            if columns_live.size != live.size:
+                values = values[:, np.searchsorted(columns_live, live)]
+            x_results[:, col:col + values.shape[0]] = values.T
+
+    logging.info("Cycle detection froze %d of %d parameter values", np.count_nonzero(periods), n_params)
+    return x_results, periods, cycles
+
+def expand_sweep(x: np.ndarray, periods: np.ndarray, cycles: np.ndarray) -> np.ndarray:
+    """
+    Materialize the full array of kept iterates from the compact result of periodic_sweep().
+
+    Parameters:
+        x (np.ndarray): (n_unresolved × n_kept) iterates of the parameters with period 0.
+        periods (np.ndarray): Detected period of each parameter value.
+        cycles (np.ndarray): Phase-aligned cycle values of each parameter value.
+
+    Returns:
+        np.ndarray: (n_params × n_kept) array of iterates. Frozen rows repeat their cycle from
+                    the first kept iterate on, including any iterates before the freeze that
+                    were still approaching it.
+    """
+    n_kept = x.shape[1]
+    out = np.empty((periods.size, n_kept))
+    out[periods == 0] = x
+    for k in np.unique(periods[periods > 0]):
+        group = np.flatnonzero(periods == k)
+        for start in range(0, group.size, 4096):
+            rows = group[start:start + 4096]
+            out[rows] = np.tile(cycles[rows, :k], n_kept // k + 1)[:, :n_kept]
+    return out
@@ -0,0 +1,221 @@
+"""
+Fixed-memory density raster for large point clouds.
+
+Instead of keeping every iterate and scatter-plotting millions of points, iterates are
+binned into a fixed-size 2-D histogram while they are generated:
+    counts[row, col] += 1   for every point (x, y) falling in pixel (row, col)
+Row 0 of the raster corresponds to the top (y_max) of the extent, so the counts can be
+written straight to an image. Counts default to uint64; a narrower dtype is promoted to
+uint64 before any pixel could wrap around. The raster supports log/gamma tone mapping and can be
+saved as a raw `.npy` count array or as an 8-bit PNG written with the standard library;
+encode_png() produces the PNG bytes of any RGB array in memory.
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import struct
+import zlib
+import numpy as np
+import logging
+from typing import Optional, Tuple
+
+def encode_png(rgb: np.ndarray) -> bytes:
+    """
+    Encode an 8-bit RGB image as PNG bytes using only the standard library.
+
+    Parameters:
+        rgb (np.ndarray): (height × width × 3) uint8 array; row 0 is the top of the image.
+
+    Returns:
+        bytes: The PNG file contents.
+    """
+    height, width = rgb.shape[:2]
+    # Each PNG scanline is prefixed with a filter-type byte (0 = none)
+    scanlines = np.zeros((height, 1 + 3 * width), dtype=np.uint8)
+    scanlines[:, 1:] = rgb.reshape(height, -1)
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(scanlines.tobytes(), 6)) + chunk(b"IEND", b""))
+
+class DensityRaster:
+    """
+    Streaming 2-D histogram accumulator with constant memory use.
+
+    Attributes:
+        extent (Tuple[float, float, float, float]): (x_min, x_max, y_min, y_max) of the raster.
+        width (int): Number of pixel columns.
+        height (int): Number of pixel rows.
+        counts (np.ndarray): (height × width) array of per-pixel hit counts.
+        n_points (int): Number of points binned inside the extent.
+        n_clipped (int): Number of points that fell outside the extent and were dropped.
+    """
+
+    def __init__(self, extent: Tuple[float, float, float, float], width: int = 4096,
+                 height: int = 4096, dtype: type = np.uint64) -> None:
+        """
+        Create an empty raster.
+
+        Parameters:
+            extent (Tuple[float, float, float, float]): (x_min, x_max, y_min, y_max) of the raster.
+            width (int): Number of pixel columns (positive integer).
+            height (int): Number of pixel rows (positive integer).
+            dtype (type): Unsigned integer dtype of the count array; promoted to uint64
+                          once the total count could overflow it.
+        """
+        x_min, x_max, y_min, y_max = (float(v) for v in extent)
+        if x_max <= x_min or y_max <= y_min:
+            logging.error("Invalid raster extent %s.", extent)
+            raise ValueError("extent must satisfy x_min < x_max and y_min < y_max.")
+        if not isinstance(width, int) or not isinstance(height, int) or width <= 0 or height <= 0:
+            logging.error("Raster size must be positive integers, got %r x %r.", width, height)
+            raise ValueError("width and height must be positive integers.")
+
+        self.extent = (x_min, x_max, y_min, y_max)
+        self.width = width
+        self.height = height
+        self.counts = np.zeros((height, width), dtype=dtype)
+        self.n_points = 0
+        self.n_clipped = 0
+        # Pixels per unit length along each axis
+        self._x_scale = width / (x_max - x_min)
+        self._y_scale = height / (y_max - y_min)
+
+    def add(self, x: np.ndarray, y: np.ndarray) -> None:
+        """
+        Bin a block of points into the raster. The points themselves are not retained.
+
+        Parameters:
+            x (np.ndarray): x-coordinates of the points.
+            y (np.ndarray): y-coordinates of the points (same shape as x, or broadcastable to it).
+        """
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        x = x.ravel()
+        y = y.ravel()
+        x_min, _, _, y_max = self.extent
+
+        col = np.floor((x - x_min) * self._x_scale)
+        row = np.floor((y_max - y) * self._y_scale)
+        inside = (col >= 0) & (col < self.width) & (row >= 0) & (row < self.height)
+        n_inside = int(np.count_nonzero(inside))
+
+        flat = row[inside].astype(np.intp) * self.width + col[inside].astype(np.intp)
+        self._reserve(self.n_points + n_inside)
+        counts = self.counts.reshape(-1)
+        if 8 * n_inside >= counts.size:
+            # Dense block: one pass over the whole raster
+            counts += np.bincount(flat, minlength=counts.size).astype(counts.dtype, copy=False)
+        else:
+            # Sparse block: only touch the pixels that were hit
+            pixels, hits = np.unique(flat, return_counts=True)
+            counts[pixels] += hits.astype(counts.dtype, copy=False)
+
+        self.n_points += n_inside
+        self.n_clipped += x.size - n_inside
+
+    def merge(self, other: "DensityRaster") -> None:
+        """
+        Add the counts of another raster with the same geometry into this one.
+
+        Parameters:
+            other (DensityRaster): Raster to merge (e.g. produced by a worker process).
+        """
+        if other.extent != self.extent or other.counts.shape != self.counts.shape:
+            raise ValueError("Rasters must share the same extent and size to be merged.")
+        self._reserve(self.n_points + other.n_points)
+        self.counts += other.counts.astype(self.counts.dtype, copy=False)
+        self.n_points += other.n_points
+        self.n_clipped += other.n_clipped
+
+    def _reserve(self, total: int) -> None:
+        """
+        Promote the count array to uint64 if a pixel could exceed its current dtype.
+
+        Parameters:
+            total (int): Upper bound on any single pixel count (the total binned points).
+        """
+        if total > np.iinfo(self.counts.dtype).max:
+            self.counts = self.counts.astype(np.uint64)
+
+    def tone_map(self, mode: str = "log", gamma: float = 2.2, peak: Optional[float] = None) -> np.ndarray:
+        """
+        Map raw counts to intensities in [0, 1].
+
+        Parameters:
+            mode (str): 'log' for log(1 + c) / log(1 + c_max), 'gamma' for (c / c_max)^(1/gamma),
+                        or 'linear' for c / c_max.
+            gamma (float): Gamma exponent used when mode is 'gamma' (must be positive).
+            peak (Optional[float]): Count mapped to full intensity; defaults to the largest
+                                    count. A fixed peak keeps adjacent tiles consistent.
+
+        Returns:
+            np.ndarray: (height × width) float array of intensities.
+        """
+        if peak is None:
+            peak = float(self.counts.max()) if self.counts.size else 0.0
+        if peak <= 0:
+            return np.zeros(self.counts.shape)
+
+        if mode == "log":
+            intensity = np.log1p(self.counts, dtype=float) / np.log1p(peak)
+        elif mode == "gamma":
+            if gamma <= 0:
+                raise ValueError("gamma must be positive.")
+            intensity = (self.counts / peak) ** (1.0 / gamma)
+        elif mode == "linear":
+            intensity = self.counts / peak
+        else:
+            logging.error("Unknown tone mapping mode '%s'.", mode)
+            raise ValueError("mode must be 'log', 'gamma' or 'linear'.")
+        return np.minimum(intensity, 1.0, out=intensity)
+
+    def save_npy(self, path: str) -> None:
+        """
+        Save the raw count array as a `.npy` file.
+
+        Parameters:
+            path (str): Destination file path.
+        """
+        np.save(path, self.counts)
+
+    def to_png(self, mode: str = "log", gamma: float = 2.2,
+               color: Tuple[int, int, int] = (0xcd, 0x00, 0x66),
+               background: Tuple[int, int, int] = (255, 255, 255),
+               peak: Optional[float] = None) -> bytes:
+        """
+        Encode the tone-mapped raster as 8-bit RGB PNG bytes without using matplotlib.
+
+        Parameters:
+            mode (str): Tone mapping mode passed to tone_map().
+            gamma (float): Gamma exponent passed to tone_map().
+            color (Tuple[int, int, int]): RGB color of the densest pixels.
+            background (Tuple[int, int, int]): RGB color of empty pixels.
+            peak (Optional[float]): Count mapped to full intensity, passed to tone_map().
+
+        Returns:
+            bytes: The PNG file contents.
+        """
+        intensity = self.tone_map(mode, gamma, peak)[..., np.newaxis]
+        bg = np.asarray(background, dtype=float)
+        fg = np.asarray(color, dtype=float)
+        return encode_png(np.rint(bg + (fg - bg) * intensity).astype(np.uint8))
+
+    def save_png(self, path: str, mode: str = "log", gamma: float = 2.2,
+                 color: Tuple[int, int, int] = (0xcd, 0x00, 0x66),
+                 background: Tuple[int, int, int] = (255, 255, 255)) -> None:
+        """
+        Save the tone-mapped raster as an 8-bit RGB PNG without using matplotlib.
+
+        Parameters:
+            path (str): Destination file path.
+            mode (str): Tone mapping mode passed to tone_map().
+            gamma (float): Gamma exponent passed to tone_map().
+            color (Tuple[int, int, int]): RGB color of the densest pixels.
+            background (Tuple[int, int, int]): RGB color of empty pixels.
+        """
+        with open(path, "wb") as fh:
+            fh.write(self.to_png(mode, gamma, color, background))
@@ -12,10 +12,9 @@ License: MIT License
 
 import numpy as np
 import logging
-from typing import Callable
-
-# Setup basic logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+from typing import Callable, Optional
+from trajectory_recorder import TrajectoryRecorder
+import instrumentation
 
 def f(t: float, x: float) -> float:
     """
@@ -36,7 +35,8 @@ def f(t: float, x: float) -> float:
     return result
 
 def euler(t0: float, x0: float, t_end: float, dt: float, 
-          f_func: Callable[[float, float], float]) -> float:
+          f_func: Callable[[float, float], float],
+          recorder: Optional[TrajectoryRecorder] = None) -> float:
     """
     Solve an ODE using the Euler method.
 
@@ -46,6 +46,8 @@ def euler(t0: float, x0: float, t_end: float, dt: float,
         t_end (float): End time.
         dt (float): Time step.
         f_func (Callable[[float, float], float]): Function f(t, x) defining dx/dt.
+        recorder (Optional[TrajectoryRecorder]): If given, every (t, x) sample including the
+                                                 initial condition is offered to it.
 
     Returns:
         float: Approximation of x at time t_end.
@@ -58,11 +60,23 @@ def euler(t0: float, x0: float, t_end: float, dt: float,
 
     tn = t0
     xn = x0
+    if recorder is not None:
+        recorder.record(tn, xn)
+
+    # The number of steps follows from the accumulated tn, so it is counted in the loop
+    # and reported afterwards. When instrumented, f_step counts RHS evaluations;
+    # otherwise it is f_func itself
+    f_step = instrumentation.counted(f_func, "euler.f_evals")
+    n_steps = 0
 
     while tn < t_end:
-        xn = xn + dt * f_func(tn, xn)
+        xn = xn + dt * f_step(tn, xn)
         tn += dt
+        n_steps += 1
+        if recorder is not None:
+            recorder.record(tn, xn)
 
+    instrumentation.record("euler", iterations=n_steps)
     return xn
 
 def main() -> None:
@@ -81,4 +95,5 @@ def main() -> None:
         logging.error("An error occurred in main: %s", e)
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
     main()
@@ -0,0 +1,170 @@
+"""
+Opt-in instrumentation of the map and integrator kernels.
+
+Inside an instrument() block (or a function decorated with @instrumented), the kernels
+report what they did into a Metrics record:
+    counters   "<kernel>.calls", "<kernel>.iterations", "<kernel>.f_evals",
+               "<kernel>.rejected_steps", ...
+    phases     wall-clock and CPU time of named phases such as "transient",
+               "steady_state" and "plotting", accumulated over all calls
+The record can be exported as a dict or JSON. Outside such a block every hook reduces
+to a single global check per kernel call (no per-iteration work), so instrumentation
+costs nothing measurable when disabled. The active record is per process; sweeps run on
+a process pool are only instrumented in the parent.
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import contextlib
+import functools
+import json
+import time
+import logging
+from typing import Any, Callable, Dict, Iterator, Optional
+
+class Metrics:
+    """
+    Counters and phase timings collected while instrumentation is enabled.
+
+    Attributes:
+        counters (Dict[str, int]): Event counts keyed by "<kernel>.<event>".
+        phases (Dict[str, Dict[str, float]]): Per-phase wall time, CPU time and number of entries.
+    """
+
+    def __init__(self) -> None:
+        self.counters: Dict[str, int] = {}
+        self.phases: Dict[str, Dict[str, float]] = {}
+
+    def count(self, name: str, k: int = 1) -> None:
+        """
+        Add k to the counter name.
+        """
+        self.counters[name] = self.counters.get(name, 0) + int(k)
+
+    def add_time(self, name: str, wall: float, cpu: float) -> None:
+        """
+        Add one timed entry of the phase name.
+        """
+        entry = self.phases.setdefault(name, {"wall_s": 0.0, "cpu_s": 0.0, "calls": 0})
+        entry["wall_s"] += wall
+        entry["cpu_s"] += cpu
+        entry["calls"] += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Return the metrics as a plain, JSON-serializable dict.
+        """
+        return {"counters": dict(self.counters),
+                "phases": {name: dict(entry) for name, entry in self.phases.items()}}
+
+    def to_json(self, path: Optional[str] = None) -> str:
+        """
+        Serialize the metrics to JSON, optionally writing them to path.
+
+        Parameters:
+            path (Optional[str]): File receiving the JSON record.
+
+        Returns:
+            str: The JSON text.
+        """
+        text = json.dumps(self.as_dict(), indent=2, sort_keys=True)
+        if path is not None:
+            with open(path, "w") as fh:
+                fh.write(text)
+        return text
+
+# Record receiving the events, or None when instrumentation is disabled
+_active: Optional[Metrics] = None
+
+# Shared no-op context returned by phase() when disabled
+_NULL_PHASE = contextlib.nullcontext()
+
+def enabled() -> bool:
+    """
+    Return True if an instrument() block is active.
+    """
+    return _active is not None
+
+def record(kernel: str, **counts: int) -> None:
+    """
+    Report one call of a kernel and its event counts, e.g. record("logistic", iterations=n).
+    """
+    if _active is None:
+        return
+    _active.count(kernel + ".calls")
+    for event, k in counts.items():
+        _active.count(kernel + "." + event, k)
+
+@contextlib.contextmanager
+def _timed_phase(metrics: Metrics, name: str) -> Iterator[None]:
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield
+    finally:
+        metrics.add_time(name, time.perf_counter() - wall, time.process_time() - cpu)
+
+def phase(name: str) -> contextlib.AbstractContextManager:
+    """
+    Context manager timing a named phase such as "transient", "steady_state" or "plotting".
+    """
+    if _active is None:
+        return _NULL_PHASE
+    return _timed_phase(_active, name)
+
+def counted(f_func: Callable, name: str) -> Callable:
+    """
+    Wrap a right-hand side so its evaluations are counted under name.
+
+    When instrumentation is disabled f_func is returned unchanged, so the integrator
+    loop pays nothing.
+    """
+    if _active is None:
+        return f_func
+    metrics = _active
+
+    @functools.wraps(f_func)
+    def wrapper(*args: Any) -> Any:
+        metrics.count(name)
+        return f_func(*args)
+
+    return wrapper
+
+@contextlib.contextmanager
+def instrument(metrics: Optional[Metrics] = None) -> Iterator[Metrics]:
+    """
+    Enable instrumentation of the kernels for the duration of a with block.
+
+    Parameters:
+        metrics (Optional[Metrics]): Record to accumulate into; a new one by default.
+
+    Yields:
+        Metrics: The record receiving counters and phase timings.
+    """
+    global _active
+    metrics = Metrics() if metrics is None else metrics
+    previous, _active = _active, metrics
+    try:
+        with _timed_phase(metrics, "total"):
+            yield metrics
+    finally:
+        _active = previous
+
+def instrumented(func: Callable) -> Callable:
+    """
+    Decorator running func under instrument().
+
+    The metrics of the most recent call are available as wrapper.last_metrics and are
+    logged at INFO level.
+    """
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with instrument() as metrics:
+            try:
+                return func(*args, **kwargs)
+            finally:
+                wrapper.last_metrics = metrics
+                logging.info("Metrics for %s: %s", func.__qualname__, json.dumps(metrics.as_dict()))
+
+    wrapper.last_metrics = None
+    return wrapper
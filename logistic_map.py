@@ -6,6 +6,10 @@ The logistic map is defined by the recurrence:
 This script calculates the iterates of the logistic map for a given initial
 condition, number of iterations, and logistic parameter r. The parameter r is
 computed using a given formula involving cube roots and square roots.
+logistic_blocks() streams the orbit lazily as NumPy blocks, so unbounded orbits can be
+consumed in O(block) memory. With dtype= or out=, logistic() writes the orbit into a
+float32/float64 array instead of a Python list. logistic_step() applies the map to whole
+arrays of states and parameters at once.
 
 Author: Sabneet Bains
 License: MIT License
@@ -13,12 +17,27 @@ License: MIT License
 
 import numpy as np
 import logging
-from typing import List
+from typing import Iterator, List, Optional, Tuple, Union
+from buffers import output_array
+from trajectory_recorder import TrajectoryRecorder
+from cycle_detection import periodic_sweep
+import instrumentation
 
-# Configure basic logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+def logistic_step(x: np.ndarray, r: np.ndarray) -> np.ndarray:
+    """
+    Apply the logistic map elementwise: return r * x * (1 - x) as a new array.
+
+    Parameters:
+        x (np.ndarray): Current iterates.
+        r (np.ndarray): Logistic parameter of each entry of x (or a scalar).
 
-def logistic(x0: float, n: int, r: float) -> List[float]:
+    Returns:
+        np.ndarray: The next iterates.
+    """
+    return r * x * (1 - x)
+
+def logistic(x0: float, n: int, r: float, recorder: Optional[TrajectoryRecorder] = None,
+             dtype: Optional[type] = None, out: Optional[np.ndarray] = None) -> Union[List[float], np.ndarray]:
     """
     Compute the iterates of the logistic map.
     
@@ -29,9 +48,16 @@ def logistic(x0: float, n: int, r: float) -> List[float]:
         x0 (float): The initial condition (typically in the interval [0, 1]).
         n (int): The number of iterations to perform.
         r (float): The logistic map parameter.
+        recorder (Optional[TrajectoryRecorder]): If given, each iterate xᵢ is offered to it as
+                                                 the sample (i, xᵢ) instead of being accumulated.
+        dtype (Optional[type]): np.float32 or np.float64; if given, the iterates are returned
+                                as an array of this dtype. They are always computed in double precision.
+        out (Optional[np.ndarray]): Array of shape (n+1,) to write the iterates into and return.
         
     Returns:
-        List[float]: A list of iterates starting with x0 and containing n+1 values.
+        List[float] | np.ndarray: A list of iterates starting with x0 and containing n+1 values,
+                                  or an array of them if dtype or out is given.
+                                  If a recorder is given, the list holds only the final iterate.
     """
     # Warn if x0 is outside the typical range for the logistic map
     if not (0 <= x0 <= 1):
@@ -39,6 +65,28 @@ def logistic(x0: float, n: int, r: float) -> List[float]:
     # Validate that number of iterations is non-negative
     if n < 0:
         raise ValueError("Number of iterations n must be a non-negative integer.")
+    if recorder is not None and out is not None:
+        raise ValueError("recorder and out cannot be combined.")
+    instrumentation.record("logistic", iterations=n)
+    
+    # Stream the orbit into the recorder, keeping only the current iterate
+    if recorder is not None:
+        x = x0
+        recorder.record(0, x)
+        for i in range(n):
+            x = r * x * (1 - x)
+            recorder.record(i + 1, x)
+        return [x]
+    
+    # Write the orbit straight into the output array
+    if dtype is not None or out is not None:
+        xn_out = output_array((n + 1,), dtype, out)
+        x = float(x0)
+        xn_out[0] = x
+        for i in range(n):
+            x = r * x * (1 - x)
+            xn_out[i + 1] = x
+        return xn_out
     
     # Initialize list with the initial condition
     xn: List[float] = [x0]
@@ -50,6 +98,90 @@ def logistic(x0: float, n: int, r: float) -> List[float]:
     
     return xn
 
+def logistic_blocks(x0: float, r: float, n: Optional[int] = None, n_transient: int = 0,
+                    block_size: int = 4096) -> Iterator[np.ndarray]:
+    """
+    Lazily generate iterates of the logistic map in blocks.
+    
+    The stream contains the same iterates x(0) = x0, x(1), ..., x(n) as logistic(), minus
+    the first n_transient, which are computed but never stored. To resume a stream, pass
+    the last value received as x0 together with n_transient=1. The arguments are checked
+    when the function is called, not when the first block is requested.
+    
+    Parameters:
+        x0 (float): The initial condition (typically in the interval [0, 1]).
+        r (float): The logistic map parameter.
+        n (Optional[int]): Index of the last iterate to produce, or None for an unbounded stream.
+        n_transient (int): Number of leading iterates (counting x0) to skip.
+        block_size (int): Maximum number of iterates per yielded block.
+        
+    Returns:
+        Iterator[np.ndarray]: Generator of consecutive 1-D blocks of iterates.
+    """
+    if n is not None and (not isinstance(n, int) or n < 0):
+        raise ValueError("Number of iterations n must be a non-negative integer.")
+    if not isinstance(n_transient, int) or n_transient < 0:
+        raise ValueError("n_transient must be a non-negative integer.")
+    if not isinstance(block_size, int) or block_size <= 0:
+        raise ValueError("block_size must be a positive integer.")
+    if not (0 <= x0 <= 1):
+        logging.warning("Initial condition x0 = %f is outside the typical range [0, 1].", x0)
+    return _iterate_blocks(float(x0), float(r), n, n_transient, block_size)
+
+def _iterate_blocks(x: float, r: float, n: Optional[int], n_transient: int,
+                    block_size: int) -> Iterator[np.ndarray]:
+    """
+    Generator behind logistic_blocks(), run on validated arguments.
+    """
+    # Skip the transient without storing it
+    for _ in range(n_transient):
+        x = r * x * (1 - x)
+    
+    index = n_transient
+    while n is None or index <= n:
+        m = block_size if n is None else min(block_size, n + 1 - index)
+        block = np.empty(m)
+        for i in range(m):
+            block[i] = x
+            x = r * x * (1 - x)
+        index += m
+        yield block
+
+def logistic_sweep(r_values: np.ndarray, x0: float = 0.2, n: int = 1010, n_transient: int = 1001,
+                   max_period: int = 64, tol: float = 1e-10) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Iterate the logistic map for a whole grid of r values with cycle-detection early termination.
+
+    Every r is advanced together as one state vector. The iterates x(0) .. x(n) are
+    produced as by logistic(), and the first n_transient of them are discarded. Values of r
+    whose orbit locks onto a cycle of period <= max_period are frozen and labelled with
+    their period (see cycle_detection.periodic_sweep()).
+
+    Parameters:
+        r_values (np.ndarray): 1-D grid of logistic map parameters.
+        x0 (float): The initial condition shared by every r.
+        n (int): The number of iterations to perform. Must be greater than n_transient.
+        n_transient (int): Number of leading iterates (counting x0) to discard.
+        max_period (int): Longest cycle that is detected.
+        tol (float): Relative distance below which two iterates are considered equal.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]:
+            - x: (n_unresolved × n_kept) array of iterates x(n_transient) .. x(n) of the r
+              values whose period is 0; cycle_detection.expand_sweep() gives every row.
+            - periods: Detected period for each r (0 for chaotic or unresolved r).
+            - cycles: (n_r × max_period) array of cycle values, NaN-padded and aligned so that
+              kept iterate j of a frozen r is cycles[:, j % period].
+    """
+    if not (0 <= x0 <= 1):
+        logging.warning("Initial condition x0 = %f is outside the typical range [0, 1].", x0)
+    if not isinstance(n_transient, int) or n_transient < 1:
+        raise ValueError("n_transient must be a positive integer.")
+    
+    # periodic_sweep() starts from the first iterate x(1), so shift the transient by one
+    return periodic_sweep(logistic_step, r_values, x0, n - 1, n_transient - 1,
+                          max_period, tol)
+
 def main() -> None:
     """
     Main driver function for the Logistic Map simulation.
@@ -69,15 +201,15 @@ def main() -> None:
         n = 1010  # Total number of iterations
         
         logging.info("Running logistic map with x0 = %f and n = %d", x0, n)
-        # Compute the iterates using the logistic map function
-        result = logistic(x0, n, r)
+        # Stream only the iterates after the transient; the first 1001 are never stored
+        iterates_to_print = np.concatenate(list(logistic_blocks(x0, r, n, n_transient=1001)))
         
         # Print iterates from index 1001 to 1010 (i.e., 10 values after transient)
-        iterates_to_print = result[1001:1011]
-        print("x(1010) iterates (indices 1001 to 1010):", iterates_to_print)
+        print("x(1010) iterates (indices 1001 to 1010):", iterates_to_print.tolist())
         
     except Exception as e:
         logging.error("An error occurred: %s", e)
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
     main()
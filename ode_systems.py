@@ -0,0 +1,249 @@
+"""
+Vectorized right-hand sides of the continuous systems from the MATLAB models.
+
+Each function f(t, p) evaluates a whole batch of states at once: p has shape (..., N),
+the last axis holding the state variables, and the derivative has the same shape.
+They can therefore be passed directly to RK4_batch() and DOPRI5() in runge_kutta.py
+to integrate M trajectories as one (M × N) state.
+
+    lorenz      N = 3   dx/dt = σ(y - x),  dy/dt = x(ρ - z) - y,  dz/dt = xy - βz
+                        σ = 10, β = 8/3, ρ = 22                            (Lorenz.m)
+    rossler     N = 3   dx/dt = -(y + z),  dy/dt = x + ay,  dz/dt = b + xz - cz
+                        a = 0.2, b = a, c = 6.3                            (Rossler.m)
+    attractor   N = 3   dx/dt = -αx + sin y,  dy/dt = -αy + sin z,  dz/dt = -αz + sin x
+                        α = 0.3                                            (Attractor.m)
+    rpslk       N = 5   Rock-Paper-Scissors-Lizard-Spock replicator system
+                        with the extra parameter a = 1       (Rock_Paper_Scissors_Lizard_Spock.m)
+
+The post-processing of the MATLAB scripts is available as trim_transient() (drop the
+leading samples, p(n:end, :)) and round_small() (p(abs(p) < 1e-3) = 0). simulate()
+integrates an ensemble with RK4_batch and applies both, with the time span, transient
+length and rounding of the original script for each system.
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+from functools import partial
+import numpy as np
+import logging
+from typing import Callable, Dict, Optional, Tuple, Union
+from runge_kutta import RK4_batch
+from trajectory_recorder import TrajectoryRecorder
+
+def lorenz(t: float, p: np.ndarray, sigma: float = 10.0, beta: float = 8 / 3,
+           rho: float = 22.0) -> np.ndarray:
+    """
+    Lorenz system for a batch of states.
+
+    Parameters:
+        t (float): Time (unused; the system is autonomous).
+        p (np.ndarray): States of shape (..., 3) holding (x, y, z).
+        sigma, beta, rho (float): System parameters.
+
+    Returns:
+        np.ndarray: Derivatives with the same shape as p.
+    """
+    x, y, z = p[..., 0], p[..., 1], p[..., 2]
+    dp = np.empty_like(p)
+    dp[..., 0] = sigma * (y - x)
+    dp[..., 1] = x * (rho - z) - y
+    dp[..., 2] = x * y - beta * z
+    return dp
+
+def rossler(t: float, p: np.ndarray, a: float = 0.2, b: Optional[float] = None,
+            c: float = 6.3) -> np.ndarray:
+    """
+    Rössler system for a batch of states.
+
+    Parameters:
+        t (float): Time (unused; the system is autonomous).
+        p (np.ndarray): States of shape (..., 3) holding (x, y, z).
+        a, c (float): System parameters.
+        b (Optional[float]): System parameter; defaults to a, as in Rossler.m.
+
+    Returns:
+        np.ndarray: Derivatives with the same shape as p.
+    """
+    b = a if b is None else b
+    x, y, z = p[..., 0], p[..., 1], p[..., 2]
+    dp = np.empty_like(p)
+    dp[..., 0] = -(y + z)
+    dp[..., 1] = x + a * y
+    dp[..., 2] = b + x * z - c * z
+    return dp
+
+def attractor(t: float, p: np.ndarray, alpha: float = 0.3) -> np.ndarray:
+    """
+    Cyclically symmetric attractor dx/dt = -αx + sin(y) (and cyclic) for a batch of states.
+
+    Parameters:
+        t (float): Time (unused; the system is autonomous).
+        p (np.ndarray): States of shape (..., 3) holding (x, y, z).
+        alpha (float): Damping parameter α.
+
+    Returns:
+        np.ndarray: Derivatives with the same shape as p.
+    """
+    # sin of the next variable in the cycle x -> y -> z -> x
+    return np.sin(np.roll(p, -1, axis=-1)) - alpha * p
+
+# Sign pattern of the payoff terms: row i gives the coefficients of (R, P, S, L, K) in dpᵢ/dt / pᵢ.
+# Entries of +1 are multiplied by a, as in Rock_Paper_Scissors_Lizard_Spock.m.
+_RPSLK_PAYOFF = np.array([
+    [0, -1, 1, 1, -1],
+    [1, 0, -1, -1, 1],
+    [-1, 1, 0, 1, -1],
+    [-1, 1, -1, 0, 1],
+    [1, -1, 1, -1, 0],
+], dtype=float)
+
+def rpslk(t: float, p: np.ndarray, a: float = 1.0) -> np.ndarray:
+    """
+    Rock-Paper-Scissors-Lizard-Spock system for a batch of states.
+
+    Each component follows dpᵢ/dt = pᵢ * ((A p)ᵢ - (a - 1) * Σ_{j<k} pⱼpₖ), where A has
+    entries a for winning and -1 for losing pairs. For a = 1 the quadratic term vanishes.
+
+    Parameters:
+        t (float): Time (unused; the system is autonomous).
+        p (np.ndarray): States of shape (..., 5) holding (R, P, S, L, K).
+        a (float): Payoff of a win.
+
+    Returns:
+        np.ndarray: Derivatives with the same shape as p.
+    """
+    payoff = np.where(_RPSLK_PAYOFF > 0, a * _RPSLK_PAYOFF, _RPSLK_PAYOFF)
+    growth = p @ payoff.T
+    if a != 1:
+        # Sum of all pairwise products Σ_{j<k} pⱼpₖ = ((Σp)² - Σp²) / 2
+        total = p.sum(axis=-1)
+        pairs = 0.5 * (total * total - np.einsum("...i,...i->...", p, p))
+        growth -= (a - 1) * pairs[..., np.newaxis]
+    return p * growth
+
+def trim_transient(t: np.ndarray, x: np.ndarray, n: int,
+                   clamp: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Drop leading samples the way the MATLAB scripts do with t(n:end) and p(n:end, :).
+
+    Samples from the n-th (1-based) onwards are kept when there are more than n samples.
+    Otherwise all samples are kept, or, with clamp=True, only the last one, matching
+    the min(n, length(t)) index of Attractor.m. The result is a view; nothing is copied.
+
+    Parameters:
+        t (np.ndarray): Sample times.
+        x (np.ndarray): Samples along the first axis.
+        n (int): 1-based index of the first kept sample (positive integer).
+        clamp (bool): Clamp the start index to the last sample instead of keeping everything.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Trimmed times and samples.
+    """
+    if not isinstance(n, int) or n <= 0:
+        raise ValueError("n must be a positive integer.")
+    if len(t) > n:
+        start = n - 1
+    elif clamp:
+        start = max(len(t) - 1, 0)
+    else:
+        start = 0
+    return t[start:], x[start:]
+
+def round_small(x: np.ndarray, threshold: float = 1e-3) -> np.ndarray:
+    """
+    Set entries with |x| < threshold to zero in place, as p(abs(p) < 1e-3) = 0 in MATLAB.
+
+    Parameters:
+        x (np.ndarray): Array to modify (must be writable).
+        threshold (float): Magnitude below which entries are zeroed.
+
+    Returns:
+        np.ndarray: The same array, for convenience.
+    """
+    x[np.abs(x) < threshold] = 0
+    return x
+
+# name -> (rhs, dimension, t_end, transient start index, clamp, round threshold),
+# following the time span and post-processing of each MATLAB script
+SYSTEMS: Dict[str, Tuple[Callable, int, float, Optional[int], bool, Optional[float]]] = {
+    "lorenz": (lorenz, 3, 10.0, 50, False, None),
+    "rossler": (rossler, 3, 500.0, 5000, False, None),
+    "attractor": (attractor, 3, 1000.0, 2000, True, None),
+    "rpslk": (rpslk, 5, 200.0, None, False, 1e-3),
+}
+
+# Initial condition of Rock_Paper_Scissors_Lizard_Spock.m
+RPSLK_X0 = np.array([0.000, 0.150, 0.300, 0.550, 0.000])
+
+def random_initial_conditions(n: int, dim: int = 3,
+                              seed: Union[None, int, np.random.Generator] = None) -> np.ndarray:
+    """
+    Draw n initial conditions uniformly from [0, 10]^dim, as the MATLAB scripts do with 10 * rand.
+
+    Parameters:
+        n (int): Number of initial conditions.
+        dim (int): State dimension.
+        seed (None | int | np.random.Generator): Seed or generator for reproducible draws.
+
+    Returns:
+        np.ndarray: (n × dim) array of initial conditions.
+    """
+    return 10 * np.random.default_rng(seed).random((n, dim))
+
+def simulate(name: str, x0: np.ndarray, dt: float = 0.01, t_end: Optional[float] = None,
+             every: int = 1, **params: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Integrate an ensemble of one of the SYSTEMS with RK4_batch and post-process it like MATLAB.
+
+    The transient is trimmed by sample index and small values are rounded as in the
+    original script. Because the MATLAB scripts count ode45's adaptive samples, the
+    equivalent transient in time depends on dt and every.
+
+    Parameters:
+        name (str): One of 'lorenz', 'rossler', 'attractor' or 'rpslk'.
+        x0 (np.ndarray): Initial conditions, an (M × N) batch or a single N-vector.
+        dt (float): Time step of RK4.
+        t_end (Optional[float]): End time; defaults to the time span of the MATLAB script.
+        every (int): Keep every k-th step.
+        **params (float): Parameters passed to the right-hand side (e.g. rho=28).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Sample times and states of shape (n_samples,) + x0.shape.
+    """
+    if name not in SYSTEMS:
+        raise ValueError("Unknown system %r; expected one of %s." % (name, ", ".join(SYSTEMS)))
+    rhs, dim, default_t_end, transient, clamp, threshold = SYSTEMS[name]
+    x0 = np.asarray(x0, dtype=float)
+    if x0.shape[-1] != dim:
+        raise ValueError("The %s system has %d state variables; x0 has %d." % (name, dim, x0.shape[-1]))
+
+    f_func = partial(rhs, **params) if params else rhs
+    recorder = TrajectoryRecorder(state_shape=x0.shape, every=every)
+    RK4_batch(0.0, x0, default_t_end if t_end is None else t_end, dt, f_func, recorder=recorder)
+    t, x = recorder.finalize()
+
+    if transient is not None:
+        t, x = trim_transient(t, x, transient, clamp)
+    if threshold is not None:
+        round_small(x, threshold)
+    return t, x
+
+def main() -> None:
+    """
+    Main driver function integrating an ensemble of Lorenz trajectories and the RPSLK system.
+    """
+    try:
+        x0 = random_initial_conditions(1000, seed=0)
+        logging.info("Integrating %d Lorenz trajectories with RK4", x0.shape[0])
+        t, x = simulate("lorenz", x0, dt=0.001, every=10)
+        print("Lorenz ensemble: %d samples of shape %s, mean z = %.4f" % (t.size, x.shape[1:], x[..., 2].mean()))
+
+        t, x = simulate("rpslk", RPSLK_X0, dt=0.01)
+        print("RPSLK state at t = %.1f:" % t[-1], x[-1].tolist())
+    except Exception as e:
+        logging.error("An error occurred: %s", e)
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    main()
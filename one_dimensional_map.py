@@ -5,6 +5,11 @@ This script computes a one-dimensional iterated map defined by:
     xₙ₊₁ = xₙ * exp(λ * (1 - xₙ))
 for λ values ranging from 1.5 to 4.0 (with a step of 0.001). For each λ, the map is
 iterated for n steps and the first 255 iterations are discarded to remove transient dynamics.
+All λ values are advanced together as a single NumPy state vector, so large λ sweeps
+avoid a Python loop per parameter value. one_dimensional_map_blocks() streams the orbits
+lazily as NumPy blocks, and one_dimensional_map_step() applies one step to whole arrays.
+With dtype= the sweep is stepped in float32 or float64, and out= lets the iterates be
+written straight into a caller-owned or shared buffer.
 The resulting values are plotted as a scatter plot with λ on the x-axis and xₙ on the y-axis.
 
 Author: Sabneet Bains
@@ -12,14 +17,252 @@ License: MIT License
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
 import logging
-from typing import Tuple, List
+from typing import Iterator, List, Optional, Tuple, Union
+from buffers import output_array
+from density_raster import DensityRaster
+from cycle_detection import periodic_sweep
+import instrumentation
 
-# Configure basic logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+def _step_map(xn: np.ndarray, lambdas: np.ndarray, scratch: np.ndarray) -> None:
+    """
+    Advance every λ of the state vector by one iteration, in place.
+
+    Parameters:
+        xn (np.ndarray): Current iterates, overwritten with xₙ₊₁ = xₙ * exp(λ * (1 - xₙ)).
+        lambdas (np.ndarray): λ value of each entry of xn.
+        scratch (np.ndarray): Work buffer of the same shape as xn.
+    """
+    np.subtract(1.0, xn, out=scratch)
+    scratch *= lambdas
+    np.exp(scratch, out=scratch)
+    xn *= scratch
+
+def one_dimensional_map_step(xn: np.ndarray, lambdas: np.ndarray) -> np.ndarray:
+    """
+    Apply the map elementwise: return xₙ₊₁ = xₙ * exp(λ * (1 - xₙ)) as a new array.
+
+    Parameters:
+        xn (np.ndarray): Current iterates.
+        lambdas (np.ndarray): λ value of each entry of xn (or a scalar).
+
+    Returns:
+        np.ndarray: The next iterates.
+    """
+    x_next = np.subtract(1.0, xn)
+    x_next *= lambdas
+    np.exp(x_next, out=x_next)
+    x_next *= xn
+    return x_next
+
+def _validate_sweep(n: int, lam_start: float, lam_stop: float, lam_step: float,
+                    n_transient: int) -> None:
+    """
+    Validate the arguments shared by the batched λ-sweep functions.
+    """
+    if not isinstance(n, int) or not isinstance(n_transient, int):
+        raise ValueError("n and n_transient must be integers.")
+    if n_transient < 0:
+        raise ValueError("n_transient must be a non-negative integer.")
+    if n <= n_transient:
+        raise ValueError("n must be greater than n_transient to allow for transient removal.")
+    if lam_step <= 0:
+        raise ValueError("lam_step must be positive.")
+    if lam_stop <= lam_start:
+        raise ValueError("lam_stop must be greater than lam_start.")
+
+def one_dimensional_map_batched(n: int, lam_start: float = 1.5, lam_stop: float = 4.0,
+                                lam_step: float = 0.001, x0: float = 0.5,
+                                n_transient: int = 255, dtype: Optional[type] = None,
+                                out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the one-dimensional iterated map for every λ value at once.
+
+    The iterated map is given by:
+        xₙ₊₁ = xₙ * exp(λ * (1 - xₙ))
+    All λ in [lam_start, lam_stop) (step lam_step) are stepped together as one state
+    vector. The first iterate is computed from x0, the map is then iterated n more times,
+    and the first n_transient iterates are discarded without being stored.
+
+    Parameters:
+        n (int): Number of iterations to perform for each λ. Must be greater than n_transient.
+        lam_start (float): First λ value of the sweep.
+        lam_stop (float): End of the λ range (exclusive).
+        lam_step (float): Spacing between consecutive λ values (must be positive).
+        x0 (float): Initial condition shared by every λ.
+        n_transient (int): Number of leading iterates to discard.
+        dtype (Optional[type]): np.float32 or np.float64 precision of the state and the
+                                iterates (default float64, or the dtype of out).
+        out (Optional[np.ndarray]): (n_lambda × n_kept) array to write the iterates into.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]:
+            - lambdas: 1-D array of the n_lambda λ values.
+            - x: (n_lambda × n_kept) array of iterates, one row per λ (out if given),
+              where n_kept = n + 1 - n_transient.
+    """
+    _validate_sweep(n, lam_start, lam_stop, lam_step, n_transient)
+
+    lambdas = np.arange(lam_start, lam_stop, lam_step)
+    n_kept = n + 1 - n_transient
+    x_results = output_array((lambdas.size, n_kept), dtype, out)
+
+    # State vector holding the current iterate of every λ, plus a scratch buffer
+    # so each step runs without allocating temporaries.
+    xn = np.full(lambdas.size, x0, dtype=x_results.dtype)
+    scratch = np.empty_like(xn)
+    lam = lambdas.astype(xn.dtype, copy=False)
+    instrumentation.record("one_dimensional_map", iterations=(n + 1) * lambdas.size)
 
-def one_dimensional_map(n: int) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+    with instrumentation.phase("transient"):
+        for _ in range(n_transient):
+            _step_map(xn, lam, scratch)
+    with instrumentation.phase("steady_state"):
+        # Stage time-major so each step writes a contiguous row, then copy each block
+        # into the (possibly caller-owned) output with one transposed assignment
+        block = np.empty((min(256, n_kept), lambdas.size), dtype=x_results.dtype)
+        for col in range(0, n_kept, block.shape[0]):
+            rows = block[:min(block.shape[0], n_kept - col)]
+            for row in rows:
+                _step_map(xn, lam, scratch)
+                row[:] = xn
+            x_results[:, col:col + rows.shape[0]] = rows.T
+
+    return lambdas, x_results
+
+def one_dimensional_map_periods(n: int, lam_start: float = 1.5, lam_stop: float = 4.0,
+                                lam_step: float = 0.001, x0: float = 0.5, n_transient: int = 255,
+                                max_period: int = 64, tol: float = 1e-10
+                                ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute the λ sweep of the one-dimensional map with cycle-detection early termination.
+
+    Same iteration as one_dimensional_map_batched(), but every λ whose orbit locks onto a
+    cycle of period <= max_period is frozen and labelled with its period (see
+    cycle_detection.periodic_sweep()), so only chaotic λ values run for all n iterations.
+
+    Parameters:
+        n (int): Number of iterations to perform for each λ. Must be greater than n_transient.
+        lam_start (float): First λ value of the sweep.
+        lam_stop (float): End of the λ range (exclusive).
+        lam_step (float): Spacing between consecutive λ values (must be positive).
+        x0 (float): Initial condition shared by every λ.
+        n_transient (int): Number of leading iterates to discard.
+        max_period (int): Longest cycle that is detected.
+        tol (float): Relative distance below which two iterates are considered equal.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+            - lambdas: 1-D array of the n_lambda λ values.
+            - x: (n_unresolved × n_kept) array of iterates of the λ values whose period is 0;
+              cycle_detection.expand_sweep() gives every row.
+            - periods: Detected period for each λ (0 for chaotic or unresolved λ).
+            - cycles: (n_lambda × max_period) array of cycle values, NaN-padded and aligned so
+              that kept iterate j of a frozen λ is cycles[:, j % period].
+    """
+    _validate_sweep(n, lam_start, lam_stop, lam_step, n_transient)
+
+    lambdas = np.arange(lam_start, lam_stop, lam_step)
+    x, periods, cycles = periodic_sweep(one_dimensional_map_step, lambdas, x0, n, n_transient, max_period, tol)
+    return lambdas, x, periods, cycles
+
+def one_dimensional_map_raster(raster: DensityRaster, n: int, lam_start: float = 1.5,
+                               lam_stop: float = 4.0, lam_step: float = 0.001, x0: float = 0.5,
+                               n_transient: int = 255) -> DensityRaster:
+    """
+    Accumulate the bifurcation diagram of the one-dimensional map into a density raster.
+
+    The iteration is identical to one_dimensional_map_batched(), but each kept step is
+    binned into the raster (λ on the x-axis, xₙ on the y-axis) and then discarded, so
+    memory use is fixed by the raster size regardless of n or the number of λ values.
+
+    Parameters:
+        raster (DensityRaster): Raster to accumulate into.
+        n (int): Number of iterations to perform for each λ. Must be greater than n_transient.
+        lam_start (float): First λ value of the sweep.
+        lam_stop (float): End of the λ range (exclusive).
+        lam_step (float): Spacing between consecutive λ values (must be positive).
+        x0 (float): Initial condition shared by every λ.
+        n_transient (int): Number of leading iterates to discard.
+
+    Returns:
+        DensityRaster: The same raster, for convenience.
+    """
+    _validate_sweep(n, lam_start, lam_stop, lam_step, n_transient)
+
+    lambdas = np.arange(lam_start, lam_stop, lam_step)
+    xn = np.full(lambdas.size, x0, dtype=float)
+    scratch = np.empty_like(xn)
+
+    for i in range(n + 1):
+        _step_map(xn, lambdas, scratch)
+        if i >= n_transient:
+            raster.add(lambdas, xn)
+
+    return raster
+
+def one_dimensional_map_blocks(lam: Union[float, np.ndarray], x0: Union[float, np.ndarray] = 0.5,
+                               n: Optional[int] = None, n_transient: int = 0,
+                               block_size: int = 4096) -> Iterator[np.ndarray]:
+    """
+    Lazily generate iterates of xₙ₊₁ = xₙ * exp(λ * (1 - xₙ)) in blocks.
+
+    Iterates are numbered as in one_dimensional_map_batched(): iterate 0 is computed from
+    x0, and the stream contains iterates 0, 1, ..., n (or runs forever if n is None), minus
+    the first n_transient, which are computed but never stored. The blocks of
+    one_dimensional_map_blocks(lambdas, x0, n, n_transient) therefore concatenate to the
+    rows of one_dimensional_map_batched(n, x0=x0, n_transient=n_transient) for the same λ.
+    To resume a stream, pass the last column received as x0 with n_transient=0. The
+    arguments are checked when the function is called, not when the first block is
+    requested.
+
+    Parameters:
+        lam (float | np.ndarray): A single λ or a 1-D array of λ values advanced together.
+        x0 (float | np.ndarray): Initial condition, shared or one per λ.
+        n (Optional[int]): Index of the last iterate to produce, or None for an unbounded stream.
+        n_transient (int): Number of leading iterates to skip.
+        block_size (int): Maximum number of iterates per yielded block.
+
+    Returns:
+        Iterator[np.ndarray]: Generator of blocks of shape (m,) for a scalar λ, or
+                              (n_lambda × m) for an array of λ.
+    """
+    if n is not None and (not isinstance(n, int) or n < 0):
+        raise ValueError("n must be a non-negative integer.")
+    if not isinstance(n_transient, int) or n_transient < 0:
+        raise ValueError("n_transient must be a non-negative integer.")
+    if not isinstance(block_size, int) or block_size <= 0:
+        raise ValueError("block_size must be a positive integer.")
+
+    scalar = np.ndim(lam) == 0
+    lambdas = np.atleast_1d(np.asarray(lam, dtype=float))
+    xn = np.array(np.broadcast_to(np.asarray(x0, dtype=float), lambdas.shape))
+    return _iterate_blocks(xn, lambdas, scalar, n, n_transient, block_size)
+
+def _iterate_blocks(xn: np.ndarray, lambdas: np.ndarray, scalar: bool, n: Optional[int],
+                    n_transient: int, block_size: int) -> Iterator[np.ndarray]:
+    """
+    Generator behind one_dimensional_map_blocks(), run on validated arguments.
+    """
+    scratch = np.empty_like(xn)
+
+    # Skip the transient without storing it
+    for _ in range(n_transient):
+        _step_map(xn, lambdas, scratch)
+
+    index = n_transient
+    while n is None or index <= n:
+        m = block_size if n is None else min(block_size, n + 1 - index)
+        # Stage time-major so each step writes a contiguous row
+        block = np.empty((m, lambdas.size))
+        for i in range(m):
+            _step_map(xn, lambdas, scratch)
+            block[i] = xn
+        index += m
+        yield block[:, 0].copy() if scalar else np.ascontiguousarray(block.T)
+
+def one_dimensional_map(n: int, dtype: Optional[type] = None,
+                        out: Optional[np.ndarray] = None) -> Tuple[List[np.ndarray], List[np.ndarray]]:
     """
     Compute the one-dimensional iterated map for a range of λ values.
     
@@ -27,40 +270,26 @@ def one_dimensional_map(n: int) -> Tuple[List[np.ndarray], List[np.ndarray]]:
         xₙ₊₁ = xₙ * exp(λ * (1 - xₙ))
     For each λ in [1.5, 4.0) (step 0.001), the system is iterated for n iterations,
     and the first 255 iterations are discarded to remove transients.
+    This is a thin wrapper around one_dimensional_map_batched() that keeps the
+    original per-λ list output.
     
     Parameters:
         n (int): Number of iterations to perform for each λ. Must be greater than 255.
+        dtype (Optional[type]): np.float32 or np.float64 precision, passed to one_dimensional_map_batched().
+        out (Optional[np.ndarray]): (n_lambda × (n - 254)) array to write the iterates into.
         
     Returns:
         Tuple[List[np.ndarray], List[np.ndarray]]:
-            - x: List of numpy arrays containing the iterated values (after transient removal).
+            - x: List of numpy arrays containing the iterated values (after transient removal);
+              with out, these are views of its rows.
             - y: List of numpy arrays containing the corresponding λ values.
     """
     if n <= 255:
         raise ValueError("n must be greater than 255 to allow for transient removal.")
     
-    x_results: List[np.ndarray] = []
-    y_results: List[np.ndarray] = []
-    
-    # Iterate over each lambda value in the specified range
-    for lam in np.arange(1.5, 4, 0.001):
-        x0 = 0.5  # initial condition
-        # Initialize iterates: first value computed from x0 and lambda
-        xn = [x0 * np.exp(lam * (1 - x0))]
-        yn = [lam]
-        
-        # Perform n iterations of the map
-        for i in range(n):
-            next_val = xn[i] * np.exp(lam * (1 - xn[i]))
-            xn.append(next_val)
-            yn.append(lam)
-        
-        # Discard the first 255 iterations (transients)
-        xn_trimmed = np.array(xn[255:])
-        yn_trimmed = np.array(yn[255:])
-        
-        x_results.append(xn_trimmed)
-        y_results.append(yn_trimmed)
+    lambdas, x = one_dimensional_map_batched(n, dtype=dtype, out=out)
+    x_results: List[np.ndarray] = list(x)
+    y_results: List[np.ndarray] = [np.full(x.shape[1], lam, dtype=x.dtype) for lam in lambdas]
     
     return x_results, y_results
 
@@ -73,24 +302,25 @@ def main() -> None:
         n = 2 ** 9  # 512 iterations
         
         logging.info("Running one-dimensional iterated map with n = %d iterations per lambda", n)
-        x_results, y_results = one_dimensional_map(n)
-        
-        # Concatenate results from all lambda values for plotting
-        x_concat = np.concatenate(x_results)
-        y_concat = np.concatenate(y_results)
+        # Bin iterates into a fixed-size raster instead of keeping every point
+        raster = DensityRaster((1.5, 4.0, 0.0, 5.5), width=2500, height=1600)
+        one_dimensional_map_raster(raster, n)
         
         # Plot the bifurcation diagram: lambda vs. xₙ
-        plt.figure(figsize=(8, 6))
-        plt.scatter(y_concat, x_concat, color='#cd0066', s=0.01)
-        plt.xlim(1.5, 4)
-        plt.xlabel('λ')
-        plt.ylabel('xₙ')
-        plt.title('One-Dimensional Iterated Map')
-        plt.grid(True)
+        with instrumentation.phase("plotting"):
+            import matplotlib.pyplot as plt
+            plt.figure(figsize=(8, 6))
+            plt.imshow(raster.tone_map('log'), extent=raster.extent, aspect='auto', cmap='RdPu')
+            plt.xlim(1.5, 4)
+            plt.xlabel('λ')
+            plt.ylabel('xₙ')
+            plt.title('One-Dimensional Iterated Map')
+            plt.grid(True)
         plt.show()
         
     except Exception as e:
         logging.error("An error occurred: %s", e)
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
     main()
@@ -0,0 +1,309 @@
+"""
+Correlation dimension and recurrence analysis of orbits and point clouds.
+
+The Grassberger-Procaccia correlation sum of N points,
+    C(r) = (1 / (N (N - 1))) * #{(i, j) : i != j, |xᵢ - xⱼ| < r},
+scales as C(r) ~ r^D₂ on an attractor, where D₂ is the correlation dimension. The
+recurrence matrix Rᵢⱼ = Θ(ε - |xᵢ - xⱼ|) holds the same pairs at a single radius, and
+its density, the recurrence rate, equals C(ε).
+
+A naive pair count is O(N²). Here the points are hashed into a uniform grid with cells
+as large as the query radius, so only pairs in adjacent cells are compared, and the
+candidate pairs are tested in bounded batches with vectorized NumPy code. The correlation
+sum builds one grid for every factor of 16 in radius, can restrict the reference points i to a random
+subsample of n_ref points, and draws a uniform sample of max_candidates candidate pairs
+when there are more; all three keep the estimate of C(r) unbiased. A Theiler window
+excludes pairs that are close in time (|i - j| <= theiler) and therefore trivially close
+in space.
+
+Inputs are (N × d) arrays, e.g. np.column_stack((x, y)) from chaos_game_numpy() or
+complex_iterated_map(); scalar orbits of the 1-D maps can be embedded with delay_embed().
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import itertools
+import numpy as np
+import logging
+from typing import Iterator, Optional, Tuple, Union
+
+def delay_embed(x: np.ndarray, dim: int, tau: int = 1) -> np.ndarray:
+    """
+    Build delay vectors (xᵢ, xᵢ₊τ, ..., xᵢ₊₍dim₋₁₎τ) from a scalar series without copying.
+
+    Parameters:
+        x (np.ndarray): 1-D time series.
+        dim (int): Embedding dimension (positive integer).
+        tau (int): Delay in samples (positive integer).
+
+    Returns:
+        np.ndarray: Read-only (N - (dim - 1) * tau) × dim view of x.
+    """
+    if not isinstance(dim, int) or dim <= 0 or not isinstance(tau, int) or tau <= 0:
+        raise ValueError("dim and tau must be positive integers.")
+    x = np.asarray(x, dtype=float).ravel()
+    span = (dim - 1) * tau + 1
+    if x.size < span:
+        raise ValueError("The series is too short for this embedding.")
+    return np.lib.stride_tricks.sliding_window_view(x, span)[:, ::tau]
+
+def _as_points(points: np.ndarray) -> np.ndarray:
+    """
+    Return the points as a finite (N × d) float array.
+    """
+    points = np.asarray(points, dtype=float)
+    if points.ndim == 1:
+        points = points[:, np.newaxis]
+    if points.ndim != 2 or points.shape[0] < 2:
+        raise ValueError("points must be an (N x d) array with N >= 2.")
+    if not np.all(np.isfinite(points)):
+        raise ValueError("points must be finite.")
+    return points
+
+def _validate(theiler: int, metric: str, max_pairs: int) -> None:
+    """
+    Validate the options shared by the public functions.
+    """
+    if not isinstance(theiler, int) or theiler < 0:
+        raise ValueError("theiler must be a non-negative integer.")
+    if metric not in ("euclidean", "chebyshev"):
+        raise ValueError("metric must be 'euclidean' or 'chebyshev'.")
+    if not isinstance(max_pairs, int) or max_pairs <= 0:
+        raise ValueError("max_pairs must be a positive integer.")
+
+def _candidate_runs(points: np.ndarray, ref: np.ndarray,
+                    radius: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Hash the points into cells of edge radius and list the candidate partners of the reference points.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: The point indices sorted by
+        cell, and for every run of candidates (one reference point and one neighbouring
+        cell) the reference index, the start of the run in the sorted indices and its length.
+    """
+    d = points.shape[1]
+    # Row-major cell keys; the +1 margin keeps the keys of neighbouring cells in range
+    keys = np.zeros(points.shape[0], dtype=np.int64)
+    strides = np.empty(d, dtype=np.int64)
+    size = 1.0
+    for k in reversed(range(d)):
+        column = np.floor((points[:, k] - points[:, k].min()) / radius).astype(np.int64)
+        column += 1
+        strides[k] = int(size)
+        keys += column * strides[k]
+        size *= float(column.max() + 2)
+        if size >= 2.0 ** 62:
+            raise ValueError("radius is too small for the extent of the points.")
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+    offsets = np.array(list(itertools.product((-1, 0, 1), repeat=d))) @ strides
+
+    ref_keys = keys[ref]
+    starts, counts = [], []
+    for offset in offsets:
+        lo = np.searchsorted(sorted_keys, ref_keys + offset, side="left")
+        starts.append(lo)
+        counts.append(np.searchsorted(sorted_keys, ref_keys + offset, side="right") - lo)
+    run_ref = np.tile(ref, offsets.size)
+    run_start = np.concatenate(starts)
+    run_count = np.concatenate(counts)
+    keep = run_count > 0
+    return order, run_ref[keep], run_start[keep], run_count[keep]
+
+def _close_pairs(points: np.ndarray, ref: np.ndarray, radius: float, theiler: int, metric: str,
+                 max_pairs: int, max_candidates: Optional[int] = None,
+                 rng: Optional[np.random.Generator] = None
+                 ) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray, float]]:
+    """
+    Yield batches (i, j, distance, weight) of pairs with i in ref, |i - j| > theiler and distance < radius.
+
+    All candidate pairs are tested, max_pairs at a time, with weight 1. If there are more
+    than max_candidates, that many are drawn uniformly with replacement instead and every
+    hit carries the weight (number of candidates) / max_candidates, so the weighted count
+    is an unbiased estimate of the number of close pairs.
+    """
+    order, run_ref, run_start, run_count = _candidate_runs(points, ref, radius)
+    run_end = np.cumsum(run_count)
+    total = int(run_end[-1]) if run_end.size else 0
+    sampled = max_candidates is not None and total > max_candidates
+    n_test = max_candidates if sampled else total
+    weight = total / max_candidates if sampled else 1.0
+
+    for first in range(0, n_test, max_pairs):
+        size = min(max_pairs, n_test - first)
+        if sampled:
+            position = np.sort(rng.integers(total, size=size))
+        else:
+            position = np.arange(first, first + size)
+        run = np.searchsorted(run_end, position, side="right")
+        i = run_ref[run]
+        j = order[run_start[run] + position - (run_end[run] - run_count[run])]
+        delta = points[i] - points[j]
+        if metric == "euclidean":
+            dist = np.sqrt(np.einsum("ij,ij->i", delta, delta))
+        else:
+            dist = np.abs(delta).max(axis=1)
+        hit = (dist < radius) & (np.abs(i - j) > theiler)
+        yield i[hit], j[hit], dist[hit], weight
+
+def correlation_sum(points: np.ndarray, radii: np.ndarray, n_ref: Optional[int] = None,
+                    theiler: int = 0, seed: Union[None, int, np.random.Generator] = None,
+                    metric: str = "euclidean", max_candidates: Optional[int] = 2 ** 22,
+                    max_pairs: int = 2 ** 22) -> np.ndarray:
+    """
+    Estimate the correlation sum C(r) for several radii.
+
+    Parameters:
+        points (np.ndarray): (N × d) points, or a 1-D array of scalar points.
+        radii (np.ndarray): Positive radii r.
+        n_ref (Optional[int]): Number of randomly chosen reference points; all N by default.
+        theiler (int): Pairs with |i - j| <= theiler are excluded (0 excludes only i = j).
+        seed (None | int | np.random.Generator): Seed for the random subsamples.
+        metric (str): 'euclidean' or 'chebyshev' (maximum norm).
+        max_candidates (Optional[int]): Candidate pairs tested per grid before
+                                        sampling them; None always tests all of them.
+        max_pairs (int): Number of candidate pairs tested per vectorized batch.
+
+    Returns:
+        np.ndarray: C(r) for every radius, the fraction of eligible pairs closer than r.
+    """
+    points = _as_points(points)
+    radii = np.asarray(radii, dtype=float).ravel()
+    if radii.size == 0 or np.any(radii <= 0):
+        raise ValueError("radii must be positive.")
+    _validate(theiler, metric, max_pairs)
+    if max_candidates is not None and (not isinstance(max_candidates, int) or max_candidates <= 0):
+        raise ValueError("max_candidates must be a positive integer or None.")
+
+    n = points.shape[0]
+    rng = np.random.default_rng(seed)
+    if n_ref is None or n_ref >= n:
+        ref = np.arange(n)
+    elif not isinstance(n_ref, int) or n_ref <= 0:
+        raise ValueError("n_ref must be a positive integer.")
+    else:
+        ref = np.sort(rng.choice(n, size=n_ref, replace=False))
+
+    # One grid for every factor of 16 in radius, with cells as large as the largest radius of the group
+    counts = np.zeros(radii.size)
+    sorted_index = np.argsort(radii)
+    sorted_radii = radii[sorted_index]
+    hi = radii.size
+    while hi > 0:
+        radius = sorted_radii[hi - 1]
+        lo = int(np.searchsorted(sorted_radii, radius / 16, side="right"))
+        group = sorted_radii[lo:hi]
+        hist = np.zeros(group.size + 1)
+        for _, _, dist, weight in _close_pairs(points, ref, float(radius), theiler, metric,
+                                               max_pairs, max_candidates, rng):
+            # A pair at distance d counts for every radius r > d
+            hist += weight * np.bincount(np.searchsorted(group, dist, side="right"), minlength=group.size + 1)
+        counts[sorted_index[lo:hi]] = np.cumsum(hist)[:group.size]
+        hi = lo
+
+    # Number of eligible partners j of the reference points outside the Theiler window
+    partners = n - (np.minimum(ref + theiler, n - 1) - np.maximum(ref - theiler, 0) + 1)
+    return counts / max(int(partners.sum()), 1)
+
+def correlation_dimension(points: np.ndarray, radii: Optional[np.ndarray] = None, n_radii: int = 16,
+                          fit_range: Optional[Tuple[float, float]] = None, n_ref: Optional[int] = None,
+                          theiler: int = 0, seed: Union[None, int, np.random.Generator] = None,
+                          metric: str = "euclidean", max_candidates: Optional[int] = 2 ** 22,
+                          max_pairs: int = 2 ** 22) -> Tuple[float, np.ndarray, np.ndarray]:
+    """
+    Estimate the Grassberger-Procaccia correlation dimension D₂ of a point set.
+
+    D₂ is the least-squares slope of log C(r) against log r over the radii in fit_range
+    with C(r) > 0.
+
+    Parameters:
+        points (np.ndarray): (N × d) points, or a 1-D array of scalar points.
+        radii (Optional[np.ndarray]): Radii at which C(r) is evaluated. Defaults to n_radii
+                                      log-spaced values from 10⁻³ to 10⁻¹ of the extent.
+        n_radii (int): Number of default radii.
+        fit_range (Optional[Tuple[float, float]]): (r_min, r_max) of the scaling region.
+        n_ref, theiler, seed, metric, max_candidates, max_pairs: As in correlation_sum().
+
+    Returns:
+        Tuple[float, np.ndarray, np.ndarray]: The dimension estimate, the radii and C(r).
+    """
+    points = _as_points(points)
+    if radii is None:
+        extent = float(np.ptp(points, axis=0).max())
+        if extent == 0:
+            raise ValueError("All points coincide; the correlation dimension is 0.")
+        radii = np.logspace(np.log10(1e-3 * extent), np.log10(1e-1 * extent), n_radii)
+    radii = np.asarray(radii, dtype=float).ravel()
+
+    c = correlation_sum(points, radii, n_ref, theiler, seed, metric, max_candidates, max_pairs)
+    use = c > 0
+    if fit_range is not None:
+        use &= (radii >= fit_range[0]) & (radii <= fit_range[1])
+    if np.count_nonzero(use) < 2:
+        raise ValueError("Fewer than two radii with C(r) > 0 in the fit range; use larger radii or more points.")
+    slope = np.polyfit(np.log(radii[use]), np.log(c[use]), 1)[0]
+    return float(slope), radii, c
+
+def recurrence_matrix(points: np.ndarray, eps: float, theiler: int = 0, metric: str = "euclidean",
+                      max_pairs: int = 2 ** 22) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build the sparse recurrence matrix Rᵢⱼ = Θ(ε - |xᵢ - xⱼ|) of an orbit.
+
+    Parameters:
+        points (np.ndarray): (N × d) orbit, or a 1-D array of scalar states.
+        eps (float): Recurrence threshold ε (positive).
+        theiler (int): Pairs with |i - j| <= theiler are left out (0 leaves out the diagonal).
+        metric (str): 'euclidean' or 'chebyshev' (maximum norm).
+        max_pairs (int): Number of candidate pairs tested per vectorized batch.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Row and column indices of the nonzero entries in
+        row-major order; the matrix is symmetric. They can be passed to
+        scipy.sparse.coo_matrix((np.ones(rows.size), (rows, cols)), shape=(N, N)).
+    """
+    points = _as_points(points)
+    if eps <= 0:
+        raise ValueError("eps must be positive.")
+    _validate(theiler, metric, max_pairs)
+
+    rows, cols = [], []
+    for i, j, _, _ in _close_pairs(points, np.arange(points.shape[0]), float(eps), theiler, metric, max_pairs):
+        rows.append(i)
+        cols.append(j)
+    rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+    cols = np.concatenate(cols) if cols else np.empty(0, dtype=np.int64)
+    order = np.lexsort((cols, rows))
+    return rows[order], cols[order]
+
+def recurrence_rate(points: np.ndarray, eps: float, n_ref: Optional[int] = None, theiler: int = 0,
+                    seed: Union[None, int, np.random.Generator] = None, metric: str = "euclidean",
+                    max_candidates: Optional[int] = 2 ** 22, max_pairs: int = 2 ** 22) -> float:
+    """
+    Fraction of nonzero entries of the recurrence matrix outside the Theiler window, i.e. C(ε).
+
+    See correlation_sum() for the parameters.
+    """
+    return float(correlation_sum(points, [eps], n_ref, theiler, seed, metric, max_candidates, max_pairs)[0])
+
+def main() -> None:
+    """
+    Main driver function estimating correlation dimensions of the Chaos Game and logistic map.
+    """
+    from chaos_game import chaos_game_numpy
+    from logistic_map import logistic_blocks
+
+    try:
+        x, y = chaos_game_numpy(0.5, [(0.0, 0.0), (1.0, 0.0), (0.5, np.sqrt(3) / 2)], 10 ** 6, seed=0)
+        dimension, _, _ = correlation_dimension(np.column_stack((x, y)), n_ref=20000, seed=0)
+        print("Sierpinski triangle: D2 = %.3f (log 3 / log 2 = %.3f)" % (dimension, np.log(3) / np.log(2)))
+
+        orbit = np.concatenate(list(logistic_blocks(0.2, 4.0, 10 ** 6, n_transient=1000)))
+        dimension, _, _ = correlation_dimension(delay_embed(orbit, 2), n_ref=20000, seed=0)
+        print("Logistic map at r = 4, delay-embedded in 2-D: D2 = %.3f" % dimension)
+    except Exception as e:
+        logging.error("An error occurred: %s", e)
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    main()
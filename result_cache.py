@@ -0,0 +1,421 @@
+"""
+Content-addressed on-disk cache for orbits, diagrams and integrator results.
+
+Expensive calls such as one_dimensional_map(), chaos_game(), complex_iterated_map(),
+logistic() and RK4() are keyed on
+    sha256(function name, all bound arguments, code version)
+where array arguments are hashed by content, callables (e.g. f_func) by name, source,
+bytecode, defaults, closure cells and the values of the globals they reference, and the
+code version is the hash of the defining source file and of every local module it
+imports, directly or transitively. A changed argument, seed or edited module therefore
+never returns a stale result. Only reproducible calls are cached: a function with a seed
+parameter must be given a seed, and any other function must be declared deterministic by
+the caller, since functions such as chaos_game() draw from an unseeded generator. Results are stored as `.npy`
+files and returned as read-only memory maps, so a repeat call is a zero-copy lookup.
+The cache directory is capped in size: least recently used entries are evicted first.
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import ast
+import functools
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+import logging
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Bump to invalidate every cache entry after a change to the storage or key layout
+CACHE_FORMAT_VERSION = 2
+
+class _Uncacheable(Exception):
+    """
+    Raised internally when an argument or result cannot be keyed or stored.
+    """
+
+@functools.lru_cache(maxsize=None)
+def _source_hash(path: str) -> str:
+    """
+    Hash the contents of a source file, used as the code version of a function.
+    """
+    with open(path, "rb") as fh:
+        return hashlib.sha256(fh.read()).hexdigest()
+
+@functools.lru_cache(maxsize=None)
+def _local_imports(path: str) -> Tuple[str, ...]:
+    """
+    Return the source files of the modules imported by path that live in its directory.
+    """
+    with open(path, "rb") as fh:
+        tree = ast.parse(fh.read(), path)
+    names = set()
+    # Imports inside functions (e.g. lazy plotting imports) count as well
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names.add(node.module.split(".")[0])
+    directory = os.path.dirname(path)
+    candidates = (os.path.join(directory, name + ".py") for name in sorted(names))
+    return tuple(c for c in candidates if os.path.isfile(c))
+
+def _code_version(func: Callable) -> str:
+    """
+    Return an identifier of the code implementing func: the hash of its source file and
+    of the local modules that file imports, directly or transitively.
+    """
+    # Functions typed into a REPL or `python -c` have no readable source file
+    try:
+        path = inspect.getsourcefile(func)
+        if path is None:
+            raise _Uncacheable("source of %r is not available" % func)
+        files = set()
+        pending = [os.path.abspath(path)]
+        while pending:
+            current = pending.pop()
+            if current not in files:
+                files.add(current)
+                pending.extend(_local_imports(current))
+        h = hashlib.sha256()
+        for current in sorted(files):
+            h.update(("%s:%s;" % (os.path.basename(current), _source_hash(current))).encode())
+        return h.hexdigest()
+    except (OSError, TypeError, SyntaxError) as e:
+        raise _Uncacheable("source of %r cannot be read: %s" % (func, e))
+
+def _feed_code(h: "hashlib._Hash", code: Any, names: set) -> None:
+    """
+    Feed the bytecode and constants of a code object (and its nested code objects) into a
+    hash, collecting the global names it references.
+    """
+    h.update(code.co_code)
+    names.update(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            _feed_code(h, const, names)
+        else:
+            h.update(repr(const).encode())
+
+def _feed_function(h: "hashlib._Hash", func: Callable, seen: Tuple[int, ...]) -> None:
+    """
+    Feed a function into a hash: its name, code version and bytecode, and the values it
+    captures through defaults, closure cells and referenced globals, so that two lambdas
+    with the same source but different captured values get different keys.
+    """
+    h.update(("func:%s.%s:%s" % (func.__module__, func.__qualname__, _code_version(func))).encode())
+    if id(func) in seen:
+        # Recursive reference; the function is already being hashed further up
+        return
+    seen = seen + (id(func),)
+    names: set = set()
+    _feed_code(h, func.__code__, names)
+    _feed(h, func.__defaults__ or (), seen)
+    _feed(h, func.__kwdefaults__ or {}, seen)
+
+    for cell in func.__closure__ or ():
+        try:
+            contents = cell.cell_contents
+        except ValueError:
+            h.update(b"cell:empty")
+            continue
+        _feed(h, contents, seen)
+
+    for name in sorted(names):
+        if name not in func.__globals__:
+            continue
+        value = func.__globals__[name]
+        h.update(("global:%s" % name).encode())
+        if inspect.ismodule(value):
+            h.update(("module:" + value.__name__).encode())
+        elif inspect.isfunction(value):
+            # Helpers are keyed by their code, not by the module state they touch
+            h.update(("func:%s.%s:%s" % (value.__module__, value.__qualname__, _code_version(value))).encode())
+            _feed_code(h, value.__code__, set())
+        elif inspect.isclass(value) or inspect.isbuiltin(value) or isinstance(value, np.ufunc):
+            # Classes (including scalar types such as np.float32), builtins and ufuncs by name
+            h.update(("object:%s.%s" % (getattr(value, "__module__", None), value.__name__)).encode())
+        else:
+            _feed(h, value, seen)
+
+def _feed(h: "hashlib._Hash", value: Any, seen: Tuple[int, ...] = ()) -> None:
+    """
+    Feed a canonical encoding of an argument value into a hash.
+    """
+    if value is None or isinstance(value, (bool, int, str)):
+        h.update(repr((type(value).__name__, value)).encode())
+    elif isinstance(value, (float, np.floating)):
+        h.update(("float:" + float(value).hex()).encode())
+    elif isinstance(value, np.integer):
+        h.update(repr(("int", int(value))).encode())
+    elif isinstance(value, np.dtype) or (isinstance(value, type) and issubclass(value, (np.generic, float, int))):
+        # dtype= arguments such as np.float32
+        h.update(("dtype:" + np.dtype(value).str).encode())
+    elif isinstance(value, np.ndarray):
+        h.update(repr(("ndarray", value.dtype.str, value.shape)).encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        h.update(("%s:%d[" % (type(value).__name__, len(value))).encode())
+        for item in value:
+            _feed(h, item, seen)
+        h.update(b"]")
+    elif isinstance(value, dict):
+        h.update(b"dict{")
+        for key in sorted(value):
+            _feed(h, key, seen)
+            _feed(h, value[key], seen)
+        h.update(b"}")
+    elif inspect.isfunction(value):
+        _feed_function(h, value, seen)
+    else:
+        raise _Uncacheable("argument of type %s cannot be used as a cache key" % type(value).__name__)
+
+def cache_key(func: Callable, *args: Any, **kwargs: Any) -> str:
+    """
+    Compute the content-addressed key of a call func(*args, **kwargs).
+
+    Parameters:
+        func (Callable): The function being called.
+        *args, **kwargs: Its arguments; defaults are filled in before hashing.
+
+    Returns:
+        str: Hex digest identifying the call.
+    """
+    bound = inspect.signature(func).bind(*args, **kwargs)
+    bound.apply_defaults()
+    h = hashlib.sha256()
+    h.update(("v%d:" % CACHE_FORMAT_VERSION).encode())
+    _feed(h, func)
+    for name, value in bound.arguments.items():
+        h.update(name.encode())
+        _feed(h, value)
+    return h.hexdigest()
+
+def _store(value: Any, directory: str, counter: list) -> Dict[str, Any]:
+    """
+    Write a result to `.npy` files and return a JSON description of its structure.
+    """
+    def save(array: np.ndarray) -> str:
+        name = "%d.npy" % counter[0]
+        counter[0] += 1
+        np.save(os.path.join(directory, name), array)
+        return name
+
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            raise _Uncacheable("object arrays cannot be cached")
+        return {"type": "array", "file": save(value)}
+    if isinstance(value, (float, int, np.floating, np.integer)) and not isinstance(value, bool):
+        return {"type": "scalar", "file": save(np.asarray(value))}
+    if isinstance(value, (list, tuple)):
+        # Lists of equally shaped arrays or of numbers are stacked into a single file
+        if value and all(isinstance(v, (np.ndarray, float, int, np.floating)) for v in value):
+            shapes = {np.shape(v) for v in value}
+            if len(shapes) == 1:
+                return {"type": "stacked", "container": type(value).__name__,
+                        "scalar_items": shapes == {()}, "file": save(np.asarray(value))}
+        return {"type": type(value).__name__, "items": [_store(v, directory, counter) for v in value]}
+    raise _Uncacheable("results of type %s cannot be cached" % type(value).__name__)
+
+def _load(spec: Dict[str, Any], directory: str) -> Any:
+    """
+    Rebuild a cached result from its structure description, memory-mapping the arrays.
+    """
+    kind = spec["type"]
+    if kind == "array":
+        return np.load(os.path.join(directory, spec["file"]), mmap_mode="r")
+    if kind == "scalar":
+        return np.load(os.path.join(directory, spec["file"])).item()
+    if kind == "stacked":
+        stacked = np.load(os.path.join(directory, spec["file"]), mmap_mode="r")
+        if spec["scalar_items"]:
+            # Sequences of numbers come back as one zero-copy 1-D array
+            return stacked
+        rows = list(stacked)
+        return tuple(rows) if spec["container"] == "tuple" else rows
+    items = [_load(item, directory) for item in spec["items"]]
+    return tuple(items) if kind == "tuple" else items
+
+def _entry_size(path: str) -> int:
+    """
+    Return the total size in bytes of the files of a cache entry.
+    """
+    return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+
+class ResultCache:
+    """
+    Size-capped, content-addressed cache of function results on disk.
+
+    Attributes:
+        directory (str): Root directory holding one sub-directory per cached call.
+        max_bytes (int): Total size above which least recently used entries are evicted.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = 2 * 1024 ** 3) -> None:
+        """
+        Create a cache.
+
+        Parameters:
+            directory (Optional[str]): Cache root. Defaults to $NONLINEAR_DYNAMICS_CACHE or
+                                       ~/.cache/nonlinear_dynamics.
+            max_bytes (int): Size cap in bytes (positive integer).
+        """
+        if not isinstance(max_bytes, int) or max_bytes <= 0:
+            raise ValueError("max_bytes must be a positive integer.")
+        if directory is None:
+            directory = os.environ.get("NONLINEAR_DYNAMICS_CACHE",
+                                       os.path.join(os.path.expanduser("~"), ".cache", "nonlinear_dynamics"))
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def call(self, func: Callable, /, *args: Any, deterministic: bool = False, **kwargs: Any) -> Any:
+        """
+        Return func(*args, **kwargs), from the cache when an identical call was stored.
+
+        Only reproducible calls are cached: a function with a seed parameter is cached when
+        a seed is passed, and any other function only when deterministic is True. Calls
+        that write into caller-owned out= buffers, whose arguments cannot be keyed (e.g.
+        recorder or raster objects) or whose results cannot be stored are computed without
+        caching as well.
+
+        Parameters:
+            func (Callable): Function to call.
+            *args, **kwargs: Arguments passed to func.
+            deterministic (bool): Declare that func without a seed parameter returns the same
+                                  result for the same arguments (e.g. logistic or RK4, but
+                                  not chaos_game).
+
+        Returns:
+            Any: The result; arrays are returned as read-only memory maps.
+        """
+        try:
+            bound = inspect.signature(func).bind(*args, **kwargs)
+            bound.apply_defaults()
+            if "seed" in bound.arguments:
+                if bound.arguments["seed"] is None:
+                    raise _Uncacheable("unseeded calls are not reproducible")
+            elif not deterministic:
+                raise _Uncacheable("function has no seed and was not declared deterministic")
+            if bound.arguments.get("out") is not None:
+                raise _Uncacheable("results written into out= buffers are not cached")
+            key = cache_key(func, *args, **kwargs)
+        except _Uncacheable as e:
+            logging.info("Not caching %s: %s", func.__qualname__, e)
+            return func(*args, **kwargs)
+
+        entry = os.path.join(self.directory, key)
+        meta_path = os.path.join(entry, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path) as fh:
+                spec = json.load(fh)
+            os.utime(meta_path)
+            logging.info("Cache hit for %s (%s)", func.__qualname__, key[:12])
+            return _load(spec, entry)
+
+        result = func(*args, **kwargs)
+        staging = tempfile.mkdtemp(prefix=".tmp-", dir=self.directory)
+        try:
+            spec = _store(result, staging, [0])
+            with open(os.path.join(staging, "meta.json"), "w") as fh:
+                json.dump(spec, fh)
+            if _entry_size(staging) > self.max_bytes:
+                raise _Uncacheable("result is larger than max_bytes")
+            os.replace(staging, entry)
+        except (_Uncacheable, OSError) as e:
+            shutil.rmtree(staging, ignore_errors=True)
+            logging.info("Not caching %s: %s", func.__qualname__, e)
+            return result
+
+        self._evict(keep=entry)
+        return _load(spec, entry)
+
+    def _entries(self) -> list:
+        """
+        List cached entries as (last access time, size in bytes, path).
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            meta_path = os.path.join(path, "meta.json")
+            if name.startswith(".") or not os.path.exists(meta_path):
+                continue
+            entries.append((os.path.getmtime(meta_path), _entry_size(path), path))
+        return entries
+
+    def size(self) -> int:
+        """
+        Return the total size of all cached entries in bytes.
+        """
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """
+        Remove least recently used entries, other than keep, until the cache fits within max_bytes.
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            # Memory maps already handed out stay valid on POSIX after the files are removed
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            logging.info("Evicted cache entry %s", os.path.basename(path))
+
+    def clear(self) -> None:
+        """
+        Remove every cached entry.
+        """
+        for _, _, path in self._entries():
+            shutil.rmtree(path, ignore_errors=True)
+
+def cached(func: Callable, cache: Optional[ResultCache] = None, deterministic: bool = False) -> Callable:
+    """
+    Wrap a function so that its calls go through a ResultCache.
+
+    Parameters:
+        func (Callable): Function to wrap, e.g. one_dimensional_map or RK4.
+        cache (Optional[ResultCache]): Cache to use. Defaults to a ResultCache() in the
+                                       default directory, created on first call.
+        deterministic (bool): Passed to ResultCache.call(); required for caching functions
+                              that have no seed parameter.
+
+    Returns:
+        Callable: Wrapper with the same signature as func.
+    """
+    state = {"cache": cache}
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if state["cache"] is None:
+            state["cache"] = ResultCache()
+        return state["cache"].call(func, *args, deterministic=deterministic, **kwargs)
+
+    return wrapper
+
+def main() -> None:
+    """
+    Main driver function timing a cold and a cached call of one_dimensional_map.
+    """
+    import time
+    from one_dimensional_map import one_dimensional_map
+
+    try:
+        cached_map = cached(one_dimensional_map, deterministic=True)
+        for label in ("cold", "cached"):
+            start = time.perf_counter()
+            x_results, _ = cached_map(2 ** 9)
+            logging.info("%s call: %d λ values in %.3f s", label, len(x_results), time.perf_counter() - start)
+    except Exception as e:
+        logging.error("An error occurred: %s", e)
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    main()
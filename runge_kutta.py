@@ -7,7 +7,10 @@ For this example:
     f(t, x) = (3/10) * (1 / cos(x/6))
 
 The RK4 method approximates the solution at t_end starting from initial conditions (t0, x0)
-with a fixed time step dt.
+with a fixed time step dt. RK4_batch() applies the same scheme to an N-dimensional state
+and a batch of M initial conditions at once, evaluating the right-hand side once per stage
+on the whole (M × N) batch. DOPRI5() is an adaptive Dormand-Prince 5(4) solver with
+rtol/atol error control and dense output at arbitrary observation times.
 
 Author: Sabneet Bains
 License: MIT License
@@ -15,10 +18,33 @@ License: MIT License
 
 import numpy as np
 import logging
-from typing import Callable
+from typing import Callable, Dict, Optional, Sequence, Tuple, Union
+from trajectory_recorder import TrajectoryRecorder
+import instrumentation
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+# Dormand-Prince 5(4) Butcher tableau
+_DP_C = np.array([0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1])
+_DP_A = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+]
+_DP_B = np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84])
+# Difference between the 5th- and embedded 4th-order weights (7th stage is the FSAL stage)
+_DP_E = np.array([-71 / 57600, 0, 71 / 16695, -71 / 1920, 17253 / 339200, -22 / 525, 1 / 40])
+# Coefficients of the 4th-order continuous extension (dense output) in powers of θ
+_DP_P = np.array([
+    [1, -8048581381 / 2820520608, 8663915743 / 2820520608, -12715105075 / 11282082432],
+    [0, 0, 0, 0],
+    [0, 131558114200 / 32700410799, -68118460800 / 10900136933, 87487479700 / 32700410799],
+    [0, -1754552775 / 470086768, 14199869525 / 1410260304, -10690763975 / 1880347072],
+    [0, 127303824393 / 49829197408, -318862633887 / 49829197408, 701980252875 / 199316789632],
+    [0, -282668133 / 205662961, 2019193451 / 616988883, -1453857185 / 822651844],
+    [0, 40617522 / 29380423, -110615467 / 29380423, 69997945 / 29380423],
+])
 
 def f(t: float, x: float) -> float:
     """
@@ -39,7 +65,8 @@ def f(t: float, x: float) -> float:
         raise
     return result
 
-def RK4(t0: float, x0: float, t_end: float, dt: float, f_func: Callable[[float, float], float]) -> float:
+def RK4(t0: float, x0: float, t_end: float, dt: float, f_func: Callable[[float, float], float],
+        recorder: Optional[TrajectoryRecorder] = None) -> float:
     """
     Solve an ODE using the classical fourth-order Runge-Kutta method.
 
@@ -49,6 +76,8 @@ def RK4(t0: float, x0: float, t_end: float, dt: float, f_func: Callable[[float,
         t_end (float): End time for the integration.
         dt (float): Time step (must be positive).
         f_func (Callable[[float, float], float]): Function f(t, x) representing the derivative.
+        recorder (Optional[TrajectoryRecorder]): If given, every (t, x) sample including the
+                                                 initial condition is offered to it.
 
     Returns:
         float: Approximation of x at time t_end.
@@ -62,19 +91,193 @@ def RK4(t0: float, x0: float, t_end: float, dt: float, f_func: Callable[[float,
     tn = t0
     xn = x0
     n_steps = int((t_end - t0) / dt)
+    # When instrumented, f_step counts RHS evaluations; otherwise it is f_func itself
+    instrumentation.record("RK4", iterations=n_steps)
+    f_step = instrumentation.counted(f_func, "RK4.f_evals")
+    if recorder is not None:
+        recorder.record(tn, xn)
     
     for i in range(n_steps):
-        k1 = f_func(tn, xn)
-        k2 = f_func(tn + 0.5 * dt, xn + 0.5 * dt * k1)
-        k3 = f_func(tn + 0.5 * dt, xn + 0.5 * dt * k2)
-        k4 = f_func(tn + dt, xn + dt * k3)
+        k1 = f_step(tn, xn)
+        k2 = f_step(tn + 0.5 * dt, xn + 0.5 * dt * k1)
+        k3 = f_step(tn + 0.5 * dt, xn + 0.5 * dt * k2)
+        k4 = f_step(tn + dt, xn + dt * k3)
         
         # Update state and time using the RK4 formula
         xn += (dt / 6) * (k1 + 2 * k2 + 2 * k3 + k4)
         tn += dt
+        if recorder is not None:
+            recorder.record(tn, xn)
     
     return xn
 
+def RK4_batch(t0: float, x0: np.ndarray, t_end: float, dt: float,
+              f_func: Callable[[float, np.ndarray], np.ndarray],
+              record: bool = False,
+              recorder: Optional[TrajectoryRecorder] = None) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Solve a system of ODEs for a batch of initial conditions using classical RK4.
+
+    The right-hand side is called once per stage with the whole batch, so f_func must
+    accept a time and an (M × N) state array and return the (M × N) array of derivatives.
+
+    Parameters:
+        t0 (float): Initial time.
+        x0 (np.ndarray): Initial conditions, either an (M × N) batch or a single N-vector.
+        t_end (float): End time for the integration.
+        dt (float): Time step (must be positive).
+        f_func (Callable[[float, np.ndarray], np.ndarray]): Vectorized derivative f(t, X).
+        record (bool): If True, also return the state at every step.
+        recorder (Optional[TrajectoryRecorder]): If given, the batch state at every step is
+                                                 offered to it (state_shape must equal x0's shape).
+
+    Returns:
+        np.ndarray: Approximation of the state at t_end, with the same shape as x0.
+        If record is True, a tuple (t, trajectory) is returned instead, where t holds the
+        n_steps + 1 sample times and trajectory has shape (n_steps + 1,) + x0.shape.
+    """
+    # Input validation
+    if dt <= 0:
+        raise ValueError("Time step dt must be positive.")
+    if t_end <= t0:
+        raise ValueError("t_end must be greater than t0.")
+
+    xn = np.array(x0, dtype=float)
+    n_steps = int((t_end - t0) / dt)
+    tn = t0
+    instrumentation.record("RK4_batch", iterations=n_steps)
+    f_step = instrumentation.counted(f_func, "RK4_batch.f_evals")
+
+    if record:
+        trajectory = np.empty((n_steps + 1,) + xn.shape)
+        trajectory[0] = xn
+    if recorder is not None:
+        recorder.record(tn, xn)
+    # One buffer per stage: f_func may return its input (or a view of it) as k
+    stage2, stage3, stage4 = (np.empty_like(xn) for _ in range(3))
+
+    for i in range(n_steps):
+        k1 = f_step(tn, xn)
+        np.multiply(k1, 0.5 * dt, out=stage2)
+        stage2 += xn
+        k2 = f_step(tn + 0.5 * dt, stage2)
+        np.multiply(k2, 0.5 * dt, out=stage3)
+        stage3 += xn
+        k3 = f_step(tn + 0.5 * dt, stage3)
+        np.multiply(k3, dt, out=stage4)
+        stage4 += xn
+        k4 = f_step(tn + dt, stage4)
+
+        # Update state and time using the RK4 formula
+        xn += (dt / 6) * (k1 + 2 * (k2 + k3) + k4)
+        tn = t0 + (i + 1) * dt
+        if record:
+            trajectory[i + 1] = xn
+        if recorder is not None:
+            recorder.record(tn, xn)
+
+    if record:
+        return t0 + dt * np.arange(n_steps + 1), trajectory
+    return xn
+
+def DOPRI5(t0: float, x0: Union[float, np.ndarray], t_end: float, dt: float,
+           f_func: Callable[[float, np.ndarray], np.ndarray], rtol: float = 1e-6,
+           atol: float = 1e-9, t_eval: Optional[Sequence[float]] = None,
+           max_steps: int = 10 ** 6) -> Tuple[np.ndarray, Dict[str, int]]:
+    """
+    Solve an ODE with the adaptive Dormand-Prince 5(4) embedded Runge-Kutta method.
+
+    The call shape mirrors RK4(); dt is only the initial step size; subsequent steps are
+    chosen so that the embedded error estimate stays within atol + rtol * |x|. Solutions
+    at the times in t_eval are obtained from the 4th-order dense output of each accepted
+    step, so observations never force smaller steps.
+
+    Parameters:
+        t0 (float): Initial time.
+        x0 (float | np.ndarray): Initial condition (scalar or array state).
+        t_end (float): End time for the integration.
+        dt (float): Initial time step (must be positive).
+        f_func (Callable[[float, np.ndarray], np.ndarray]): Function f(t, x) representing the derivative.
+        rtol (float): Relative error tolerance.
+        atol (float): Absolute error tolerance.
+        t_eval (Optional[Sequence[float]]): Increasing observation times within [t0, t_end].
+        max_steps (int): Maximum number of attempted steps before giving up.
+
+    Returns:
+        Tuple[np.ndarray, Dict[str, int]]:
+            - The state at t_end, or the states at t_eval stacked along a new first axis.
+            - Statistics with the number of accepted and rejected steps and f_func evaluations.
+    """
+    # Input validation
+    if dt <= 0:
+        raise ValueError("Time step dt must be positive.")
+    if t_end <= t0:
+        raise ValueError("t_end must be greater than t0.")
+    if rtol <= 0 or atol < 0:
+        raise ValueError("rtol must be positive and atol non-negative.")
+
+    xn = np.array(x0, dtype=float)
+    if t_eval is not None:
+        t_eval = np.asarray(t_eval, dtype=float)
+        if np.any(np.diff(t_eval) < 0) or (t_eval.size and (t_eval[0] < t0 or t_eval[-1] > t_end)):
+            raise ValueError("t_eval must be increasing and lie within [t0, t_end].")
+        x_eval = np.empty(t_eval.shape + xn.shape)
+        n_done = int(np.searchsorted(t_eval, t0, side="right"))
+        x_eval[:n_done] = xn
+
+    stats = {"n_accepted": 0, "n_rejected": 0, "n_fevals": 0}
+    K = np.empty((7,) + xn.shape)
+    K[0] = f_func(t0, xn)
+    stats["n_fevals"] += 1
+
+    tn = t0
+    h = min(dt, t_end - t0)
+    while tn < t_end:
+        if stats["n_accepted"] + stats["n_rejected"] >= max_steps:
+            logging.error("DOPRI5 exceeded max_steps=%d at t=%f.", max_steps, tn)
+            raise RuntimeError("Maximum number of steps exceeded.")
+        h = min(h, t_end - tn)
+
+        for s in range(1, 6):
+            dx = np.tensordot(_DP_A[s], K[:s], axes=(0, 0)) * h
+            K[s] = f_func(tn + _DP_C[s] * h, xn + dx)
+        x_new = xn + h * np.tensordot(_DP_B, K[:6], axes=(0, 0))
+        K[6] = f_func(tn + h, x_new)
+        stats["n_fevals"] += 6
+
+        # Scaled RMS norm of the embedded error estimate
+        scale = atol + rtol * np.maximum(np.abs(xn), np.abs(x_new))
+        error = h * np.tensordot(_DP_E, K, axes=(0, 0)) / scale
+        err_norm = float(np.sqrt(np.mean(np.square(error))))
+
+        if err_norm <= 1:
+            t_new = tn + h
+            if t_eval is not None:
+                n_next = int(np.searchsorted(t_eval, t_new, side="right"))
+                if n_next > n_done:
+                    theta = (t_eval[n_done:n_next] - tn) / h
+                    powers = np.cumprod(np.tile(theta[:, np.newaxis], (1, 4)), axis=1)
+                    Q = np.tensordot(_DP_P, K, axes=(0, 0))
+                    x_eval[n_done:n_next] = xn + h * np.tensordot(powers, Q, axes=(1, 0))
+                    n_done = n_next
+            tn = t_new
+            xn = x_new
+            K[0] = K[6]  # First-same-as-last
+            stats["n_accepted"] += 1
+            factor = 10.0 if err_norm == 0 else min(10.0, max(0.2, 0.9 * err_norm ** -0.2))
+        else:
+            stats["n_rejected"] += 1
+            factor = max(0.2, 0.9 * err_norm ** -0.2)
+        h *= factor
+
+    logging.info("DOPRI5 finished: %d accepted steps, %d rejected steps, %d f evaluations",
+                 stats["n_accepted"], stats["n_rejected"], stats["n_fevals"])
+    instrumentation.record("DOPRI5", iterations=stats["n_accepted"], rejected_steps=stats["n_rejected"],
+                           f_evals=stats["n_fevals"])
+    if t_eval is not None:
+        return x_eval, stats
+    return xn, stats
+
 def main() -> None:
     """
     Main driver function to run the RK4 simulation.
@@ -87,10 +290,15 @@ def main() -> None:
         
         logging.info("Starting RK4 integration with t0=%.3f, x0=%.3f, t_end=%.3f, dt=%.8f", t0, x0, t_end, dt)
         result = RK4(t0, x0, t_end, dt, f)
-        logging.info("Integration complete.")
+        logging.info("Integration complete (%d f evaluations).", 4 * int((t_end - t0) / dt))
         print("x(" + str(t_end) + ") ≈", result)
+
+        # Adaptive solver at comparable accuracy, for reference
+        adaptive, stats = DOPRI5(t0, x0, t_end, 0.01, f, rtol=1e-10, atol=1e-12)
+        print("x(" + str(t_end) + ") ≈", float(adaptive), "(DOPRI5, %d f evaluations)" % stats["n_fevals"])
     except Exception as e:
         logging.error("An error occurred in main: %s", e)
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
     main()
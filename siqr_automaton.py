@@ -0,0 +1,213 @@
+"""
+Headless SIQR (Susceptible, Infected, Quarantined, Removed) cellular automaton.
+
+This is the model of the SIQR_Cellular_Automaton.m app without the user interface.
+Each cell of an N × N grid holds one of the states S = 0, I = 1, Q = 2, R = 3, and one
+time step applies, in order:
+    1) S -> I  with probability 1 - (1 - p)^k, where k is the number of infected cells
+               in the Moore neighbourhood and p = (1 - α) * β₀ (α = lockdown strength)
+    2) I -> Q  with probability q (quarantine rate)
+    3) Q -> R  with probability γ (recovery rate)
+Each transition sees the grid left by the previous one, as in the MATLAB loop. The run
+stops once no cell is infected or quarantined.
+
+States are stored as a uint8 grid. Neighbour counts are integer sums of eight shifted
+copies of the infected mask, evaluated only inside the bounding box of the infected cells.
+The infected and quarantined cells are tracked as index lists, so random numbers are
+drawn only for cells that can actually transition. Runs are reproducible from a seed.
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import numpy as np
+import logging
+from typing import Tuple, Union
+
+SUSCEPTIBLE, INFECTED, QUARANTINED, REMOVED = 0, 1, 2, 3
+
+class SIQRAutomaton:
+    """
+    SIQR cellular automaton on an N × N grid with zero (non-infected) boundaries.
+
+    Attributes:
+        grid (np.ndarray): (N × N) uint8 array of cell states.
+        alpha (float): Lockdown strength α in [0, 1]; may be changed between steps.
+        gamma (float): Recovery rate γ (Q -> R probability); may be changed between steps.
+        q (float): Quarantine rate (I -> Q probability); may be changed between steps.
+        beta0 (float): Base transmission rate β₀.
+        t (int): Number of steps taken.
+    """
+
+    def __init__(self, n: int = 160, alpha: float = 0.7, gamma: float = 0.06, q: float = 0.1,
+                 beta0: float = 0.4, seed: Union[None, int, np.random.Generator] = None) -> None:
+        """
+        Create a grid of susceptible cells with a single infected cell in the centre.
+
+        Parameters:
+            n (int): Grid size N (positive integer).
+            alpha (float): Lockdown strength α in [0, 1].
+            gamma (float): Recovery rate γ in [0, 1].
+            q (float): Quarantine rate in [0, 1].
+            beta0 (float): Base transmission rate β₀ in [0, 1].
+            seed (None | int | np.random.Generator): Seed or generator for reproducible runs.
+        """
+        if not isinstance(n, int) or n <= 0:
+            raise ValueError("n must be a positive integer.")
+        for name, value in (("alpha", alpha), ("gamma", gamma), ("q", q), ("beta0", beta0)):
+            if not 0 <= value <= 1:
+                raise ValueError("%s must lie in [0, 1]." % name)
+
+        self.n = n
+        self.alpha = alpha
+        self.gamma = gamma
+        self.q = q
+        self.beta0 = beta0
+        self.rng = np.random.default_rng(seed)
+        self.t = 0
+
+        # The MATLAB app infects cell (round(N/2), round(N/2)) in 1-based indexing
+        center = int(np.floor(n / 2 + 0.5)) - 1
+        self.grid = np.zeros((n, n), dtype=np.uint8)
+        self.grid[center, center] = INFECTED
+        self._infected = np.array([center * n + center], dtype=np.int64)
+        self._quarantined = np.empty(0, dtype=np.int64)
+        self.n_removed = 0
+
+    def counts(self) -> np.ndarray:
+        """
+        Return the current number of S, I, Q and R cells.
+        """
+        n_i, n_q = self._infected.size, self._quarantined.size
+        return np.array([self.n * self.n - n_i - n_q - self.n_removed, n_i, n_q, self.n_removed],
+                        dtype=np.int64)
+
+    @property
+    def active(self) -> bool:
+        """
+        True while any cell is infected or quarantined.
+        """
+        return self._infected.size > 0 or self._quarantined.size > 0
+
+    def _neighbour_counts(self) -> Tuple[int, int, np.ndarray]:
+        """
+        Count infected Moore neighbours inside the bounding box of the infected cells.
+
+        Returns:
+            Tuple[int, int, np.ndarray]: Row and column offset of the box, and the uint8
+                                         neighbour counts of every cell in it.
+        """
+        rows, cols = np.divmod(self._infected, self.n)
+        r0, r1 = max(int(rows.min()) - 1, 0), min(int(rows.max()) + 2, self.n)
+        c0, c1 = max(int(cols.min()) - 1, 0), min(int(cols.max()) + 2, self.n)
+
+        padded = np.zeros((r1 - r0 + 2, c1 - c0 + 2), dtype=np.uint8)
+        np.equal(self.grid[r0:r1, c0:c1], INFECTED, out=padded[1:-1, 1:-1].view(bool))
+        h, w = r1 - r0, c1 - c0
+        k = np.zeros((h, w), dtype=np.uint8)
+        for dr in (0, 1, 2):
+            for dc in (0, 1, 2):
+                if dr != 1 or dc != 1:
+                    k += padded[dr:dr + h, dc:dc + w]
+        return r0, c0, k
+
+    def step(self) -> bool:
+        """
+        Advance the automaton by one time step.
+
+        Returns:
+            bool: True if cells are still infected or quarantined afterwards.
+        """
+        flat = self.grid.reshape(-1)
+
+        # 1) S -> I, drawing only for susceptible cells with at least one infected neighbour
+        if self._infected.size:
+            r0, c0, k = self._neighbour_counts()
+            box = self.grid[r0:r0 + k.shape[0], c0:c0 + k.shape[1]]
+            rows, cols = np.nonzero((box == SUSCEPTIBLE) & (k > 0))
+            p = (1 - self.alpha) * self.beta0
+            p_infect = 1 - (1 - p) ** np.arange(9)
+            hit = self.rng.random(rows.size) < p_infect[k[rows, cols]]
+            new = (rows[hit] + r0) * self.n + (cols[hit] + c0)
+            flat[new] = INFECTED
+            self._infected = np.concatenate((self._infected, new))
+
+        # 2) I -> Q, including cells infected in this step
+        hit = self.rng.random(self._infected.size) < self.q
+        moved = self._infected[hit]
+        flat[moved] = QUARANTINED
+        self._infected = self._infected[~hit]
+        self._quarantined = np.concatenate((self._quarantined, moved))
+
+        # 3) Q -> R, including cells quarantined in this step
+        hit = self.rng.random(self._quarantined.size) < self.gamma
+        flat[self._quarantined[hit]] = REMOVED
+        self.n_removed += int(np.count_nonzero(hit))
+        self._quarantined = self._quarantined[~hit]
+
+        self.t += 1
+        return self.active
+
+    def run(self, max_iter: int = 5000) -> np.ndarray:
+        """
+        Step until the outbreak ends or max_iter steps have been taken.
+
+        Parameters:
+            max_iter (int): Maximum number of steps (non-negative integer).
+
+        Returns:
+            np.ndarray: (n_steps + 1) × 4 int64 array of S, I, Q and R counts, starting with
+                        the state before the first step.
+        """
+        if not isinstance(max_iter, int) or max_iter < 0:
+            raise ValueError("max_iter must be a non-negative integer.")
+        counts = np.empty((max_iter + 1, 4), dtype=np.int64)
+        counts[0] = self.counts()
+        n_steps = 0
+        while n_steps < max_iter and self.active:
+            self.step()
+            n_steps += 1
+            counts[n_steps] = self.counts()
+        return counts[:n_steps + 1]
+
+def siqr(n: int = 160, alpha: float = 0.7, gamma: float = 0.06, q: float = 0.1, beta0: float = 0.4,
+         max_iter: int = 5000, seed: Union[None, int, np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Run the SIQR automaton from a single infected centre cell.
+
+    See SIQRAutomaton for the parameters.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The per-step S/I/Q/R counts and the final uint8 grid.
+    """
+    automaton = SIQRAutomaton(n, alpha, gamma, q, beta0, seed)
+    counts = automaton.run(max_iter)
+    return counts, automaton.grid
+
+def main() -> None:
+    """
+    Main driver function running the SIQR automaton and plotting the S/I/Q/R time series.
+    """
+    try:
+        n = 160
+        logging.info("Running SIQR cellular automaton on a %d x %d grid", n, n)
+        counts, grid = siqr(n, seed=0)
+        logging.info("Outbreak ended after %d steps: S=%d, I=%d, Q=%d, R=%d", counts.shape[0] - 1, *counts[-1])
+
+        import matplotlib.pyplot as plt
+        fig, (ax_grid, ax_counts) = plt.subplots(1, 2, figsize=(12, 5))
+        ax_grid.imshow(grid, vmin=0, vmax=3, cmap='RdPu')
+        ax_grid.set_title('Final State')
+        for column, label in enumerate(('Susceptible', 'Infected', 'Quarantined', 'Removed')):
+            ax_counts.plot(counts[:, column], label=label)
+        ax_counts.set_xlabel('Time step')
+        ax_counts.set_ylabel('Cells')
+        ax_counts.set_title('SIQR Cellular Automaton')
+        ax_counts.legend()
+        plt.show()
+    except Exception as e:
+        logging.error("An error occurred: %s", e)
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    main()
@@ -0,0 +1,150 @@
+"""
+Process-pool scheduler for parameter sweeps.
+
+A sweep evaluates a kernel over a 1-D grid of parameter values, for example the λ grid of
+one_dimensional_map, an r scan of the logistic map, or a set of initial conditions for RK4.
+run_sweep() splits the grid into chunks and runs the kernel on a process pool:
+    kernel(params[start:stop]) -> array of shape (stop - start,) + item_shape
+The parameter grid and the result array both live in shared memory, so workers only
+receive chunk bounds and write their results in place, in grid order, without pickling
+large arrays. Progress is reported through a callback and a sweep can be cancelled.
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
+from multiprocessing import shared_memory
+import numpy as np
+import logging
+from typing import Callable, Optional, Tuple
+from one_dimensional_map import one_dimensional_map_blocks
+
+class SweepCancelled(RuntimeError):
+    """
+    Raised by run_sweep() when the sweep is cancelled before all chunks complete.
+    """
+
+def _sweep_worker(kernel: Callable[[np.ndarray], np.ndarray], params_name: str, n_params: int,
+                  out_name: str, out_shape: Tuple[int, ...], start: int, stop: int) -> int:
+    """
+    Evaluate the kernel on params[start:stop] and write the result into shared memory.
+    """
+    params_shm = shared_memory.SharedMemory(name=params_name)
+    out_shm = shared_memory.SharedMemory(name=out_name)
+    try:
+        params = np.ndarray((n_params,), dtype=float, buffer=params_shm.buf)
+        out = np.ndarray(out_shape, dtype=float, buffer=out_shm.buf)
+        out[start:stop] = kernel(params[start:stop])
+        del params, out
+    finally:
+        params_shm.close()
+        out_shm.close()
+    return stop - start
+
+def run_sweep(kernel: Callable[[np.ndarray], np.ndarray], params: np.ndarray,
+              item_shape: Tuple[int, ...] = (), chunk_size: int = 1024,
+              n_workers: Optional[int] = None,
+              progress: Optional[Callable[[int, int], None]] = None,
+              cancel: Optional[Callable[[], bool]] = None) -> np.ndarray:
+    """
+    Run a kernel over a parameter grid in chunks on a process pool.
+
+    Parameters:
+        kernel (Callable[[np.ndarray], np.ndarray]): Picklable function (module-level function
+            or functools.partial of one) mapping a 1-D chunk of parameters to an array of
+            shape (len(chunk),) + item_shape.
+        params (np.ndarray): 1-D grid of parameter values.
+        item_shape (Tuple[int, ...]): Shape of the kernel output for a single parameter.
+        chunk_size (int): Number of parameter values per work unit.
+        n_workers (Optional[int]): Number of worker processes. Defaults to os.cpu_count();
+                                   1 runs every chunk in the calling process.
+        progress (Optional[Callable[[int, int], None]]): Called as progress(done, total) with
+                                                         the number of finished parameter values.
+        cancel (Optional[Callable[[], bool]]): Polled while the sweep runs (e.g. threading.Event.is_set);
+                                               when it returns True, pending chunks are cancelled.
+
+    Returns:
+        np.ndarray: Array of shape (len(params),) + item_shape with results in grid order.
+
+    Raises:
+        SweepCancelled: If cancel() returned True before the sweep finished.
+    """
+    params = np.ascontiguousarray(params, dtype=float).ravel()
+    if params.size == 0:
+        raise ValueError("params must contain at least one value.")
+    if not isinstance(chunk_size, int) or chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer.")
+
+    out_shape = (params.size,) + tuple(item_shape)
+    bounds = [(start, min(start + chunk_size, params.size)) for start in range(0, params.size, chunk_size)]
+    n_workers = max(1, min(n_workers or os.cpu_count() or 1, len(bounds)))
+    done = 0
+
+    if n_workers == 1:
+        out = np.empty(out_shape)
+        for start, stop in bounds:
+            if cancel is not None and cancel():
+                raise SweepCancelled("Sweep cancelled after %d of %d parameter values." % (done, params.size))
+            out[start:stop] = kernel(params[start:stop])
+            done += stop - start
+            if progress is not None:
+                progress(done, params.size)
+        return out
+
+    params_shm = shared_memory.SharedMemory(create=True, size=params.nbytes)
+    out_shm = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(out_shape)) * 8))
+    try:
+        np.ndarray(params.shape, dtype=float, buffer=params_shm.buf)[:] = params
+        work = partial(_sweep_worker, kernel, params_shm.name, params.size, out_shm.name, out_shape)
+        logging.info("Running sweep of %d values in %d chunks on %d workers", params.size, len(bounds), n_workers)
+
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            pending = {pool.submit(work, start, stop) for start, stop in bounds}
+            while pending:
+                finished, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    done += future.result()
+                if finished and progress is not None:
+                    progress(done, params.size)
+                if pending and cancel is not None and cancel():
+                    for future in pending:
+                        future.cancel()
+                    # Let already-running chunks finish before the shared memory is released
+                    wait(pending)
+                    raise SweepCancelled("Sweep cancelled after %d of %d parameter values." % (done, params.size))
+
+        return np.ndarray(out_shape, dtype=float, buffer=out_shm.buf).copy()
+    finally:
+        for shm in (params_shm, out_shm):
+            shm.close()
+            shm.unlink()
+
+def _exponential_map_kernel(lambdas: np.ndarray, n: int, n_transient: int) -> np.ndarray:
+    """
+    Sweep kernel returning the kept iterates of xₙ₊₁ = xₙ * exp(λ * (1 - xₙ)) for a chunk of λ.
+    """
+    return np.concatenate(list(one_dimensional_map_blocks(lambdas, 0.5, n, n_transient)), axis=1)
+
+def main() -> None:
+    """
+    Main driver function running the λ sweep of the one-dimensional map on a process pool.
+    """
+    try:
+        n, n_transient = 2 ** 9, 255
+        lambdas = np.arange(1.5, 4.0, 0.0001)
+        kernel = partial(_exponential_map_kernel, n=n, n_transient=n_transient)
+
+        start = time.perf_counter()
+        x = run_sweep(kernel, lambdas, item_shape=(n + 1 - n_transient,), chunk_size=2500,
+                      progress=lambda done, total: logging.info("%d / %d λ values done", done, total))
+        logging.info("Sweep finished in %.2f s, result shape %s", time.perf_counter() - start, x.shape)
+    except Exception as e:
+        logging.error("An error occurred: %s", e)
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    main()
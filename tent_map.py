@@ -6,29 +6,60 @@ The Tent Map is a simple one-dimensional chaotic map defined by:
     xₙ₊₁ = 2 - 2 * xₙ     if 0.5 < xₙ <= 1
 
 This script computes the iterates of the Tent Map for a given initial condition and
-number of iterations. The main driver prints a subset of iterates after discarding
-the initial transients.
+number of iterations. In double precision every step shifts out one mantissa bit, so
+float orbits collapse to 0 after about 55 iterations. tent_exact() and tent_nth() instead
+represent x0 as an exact rational p/q and use the binary-expansion form of the map:
+    Tⁿ(x) = frac(2ⁿx)        if bit n of x is 0
+    Tⁿ(x) = 1 - frac(2ⁿx)    if bit n of x is 1
+so the n-th iterate is obtained directly with modular integer arithmetic.
+tent_blocks() streams float iterates lazily as NumPy blocks, and with dtype= or out=
+tent() writes its orbit into a float32/float64 array instead of a Python list.
+tent_step() applies the generalized map x -> μ * min(x, 1 - x) to whole arrays. The main
+driver prints a subset of iterates after discarding the initial transients.
 
 Author: Sabneet Bains
 License: MIT License
 """
 
 import logging
-from typing import List
+from fractions import Fraction
+from typing import Iterator, List, Optional, Union
+import numpy as np
+from buffers import output_array
+from trajectory_recorder import TrajectoryRecorder
+import instrumentation
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+def tent_step(x: np.ndarray, mu: Union[float, np.ndarray] = 2.0) -> np.ndarray:
+    """
+    Apply the generalized Tent Map x -> μ * min(x, 1 - x) elementwise (μ = 2 is the map above).
+
+    Parameters:
+        x (np.ndarray): Current iterates.
+        mu (float | np.ndarray): Slope μ of each entry of x (or a scalar).
 
-def tent(x0: float, n: int) -> List[float]:
+    Returns:
+        np.ndarray: The next iterates.
+    """
+    return mu * np.minimum(x, 1 - x)
+
+def tent(x0: float, n: int, recorder: Optional[TrajectoryRecorder] = None,
+         dtype: Optional[type] = None, out: Optional[np.ndarray] = None) -> Union[List[float], np.ndarray]:
     """
     Compute the iterates of the Tent Map.
 
     Parameters:
         x0 (float): The initial condition (should be in the interval [0, 1]).
         n (int): The number of iterations to perform.
+        recorder (Optional[TrajectoryRecorder]): If given, each iterate xᵢ is offered to it as
+                                                 the sample (i, xᵢ) instead of being accumulated.
+        dtype (Optional[type]): np.float32 or np.float64; if given, the iterates are returned
+                                as an array of this dtype. They are always computed in double precision.
+        out (Optional[np.ndarray]): Array of shape (n+1,) to write the iterates into and return.
 
     Returns:
-        List[float]: A list containing the iterates of the Tent Map.
+        List[float] | np.ndarray: A list containing the iterates of the Tent Map, or an array
+                                  of them if dtype or out is given.
+                                  If a recorder is given, the list holds only the final iterate.
     """
     # Validate initial condition
     if not (0 <= x0 <= 1):
@@ -37,13 +68,29 @@ def tent(x0: float, n: int) -> List[float]:
     if n < 0:
         logging.error("Number of iterations n=%d is negative.", n)
         raise ValueError("n must be a non-negative integer.")
+    if recorder is not None and out is not None:
+        raise ValueError("recorder and out cannot be combined.")
+    instrumentation.record("tent", iterations=n)
+
+    # Write the orbit straight into the output array
+    if recorder is None and (dtype is not None or out is not None):
+        xn_out = output_array((n + 1,), dtype, out)
+        x = float(x0)
+        xn_out[0] = x
+        for i in range(n):
+            # x stays in [0, 1], so no bounds check is needed after the first iterate
+            x = 2 * x if x <= 0.5 else 2 - 2 * x
+            xn_out[i + 1] = x
+        return xn_out
 
     # Initialize list with the initial condition
     xn: List[float] = [x0]
+    if recorder is not None:
+        recorder.record(0, x0)
     
     # Iterate the Tent Map n times
     for i in range(n):
-        current = xn[i]
+        current = xn[-1]
         if 0 <= current <= 0.5:
             next_val = 2 * current
         elif 0.5 < current <= 1:
@@ -51,10 +98,136 @@ def tent(x0: float, n: int) -> List[float]:
         else:
             logging.error("Encountered value %f out of bounds at iteration %d.", current, i)
             raise ValueError("Tent map iterates should remain within [0,1].")
-        xn.append(next_val)
+        if recorder is not None:
+            # Keep only the current iterate; the orbit lives in the recorder
+            recorder.record(i + 1, next_val)
+            xn[-1] = next_val
+        else:
+            xn.append(next_val)
     
     return xn
 
+def tent_blocks(x0: float, n: Optional[int] = None, n_transient: int = 0,
+                block_size: int = 4096) -> Iterator[np.ndarray]:
+    """
+    Lazily generate iterates of the Tent Map in blocks.
+
+    The stream contains the same iterates x(0) = x0, x(1), ..., x(n) as tent(), minus the
+    first n_transient, which are computed but never stored. To resume a stream, pass the
+    last value received as x0 together with n_transient=1. The arguments are checked when
+    the function is called, not when the first block is requested.
+
+    Parameters:
+        x0 (float): The initial condition (should be in the interval [0, 1]).
+        n (Optional[int]): Index of the last iterate to produce, or None for an unbounded stream.
+        n_transient (int): Number of leading iterates (counting x0) to skip.
+        block_size (int): Maximum number of iterates per yielded block.
+
+    Returns:
+        Iterator[np.ndarray]: Generator of consecutive 1-D blocks of iterates.
+    """
+    if not (0 <= x0 <= 1):
+        logging.error("Initial condition x0=%f is out of bounds. It should be within [0,1].", x0)
+        raise ValueError("x0 must be between 0 and 1.")
+    if n is not None and (not isinstance(n, int) or n < 0):
+        logging.error("Number of iterations n=%r is not a non-negative integer.", n)
+        raise ValueError("n must be a non-negative integer.")
+    if not isinstance(n_transient, int) or n_transient < 0:
+        raise ValueError("n_transient must be a non-negative integer.")
+    if not isinstance(block_size, int) or block_size <= 0:
+        raise ValueError("block_size must be a positive integer.")
+    return _iterate_blocks(float(x0), n, n_transient, block_size)
+
+def _iterate_blocks(x: float, n: Optional[int], n_transient: int, block_size: int) -> Iterator[np.ndarray]:
+    """
+    Generator behind tent_blocks(), run on validated arguments.
+    """
+    # Skip the transient without storing it
+    for _ in range(n_transient):
+        x = 2 * x if x <= 0.5 else 2 - 2 * x
+
+    index = n_transient
+    while n is None or index <= n:
+        m = block_size if n is None else min(block_size, n + 1 - index)
+        block = np.empty(m)
+        for i in range(m):
+            block[i] = x
+            x = 2 * x if x <= 0.5 else 2 - 2 * x
+        index += m
+        yield block
+
+def _as_fraction(x0: Union[Fraction, int, float, str]) -> Fraction:
+    """
+    Convert an initial condition to an exact Fraction in [0, 1].
+
+    Floats are converted exactly (as the dyadic rational they store); strings such as
+    '2/5' or '0.4' are parsed exactly.
+    """
+    try:
+        x = Fraction(x0)
+    except (TypeError, ValueError) as e:
+        logging.error("Initial condition %r cannot be converted to an exact rational: %s", x0, e)
+        raise ValueError("x0 must be a rational number, e.g. Fraction(2, 5) or '2/5'.")
+    if not (0 <= x <= 1):
+        logging.error("Initial condition x0=%s is out of bounds. It should be within [0,1].", x)
+        raise ValueError("x0 must be between 0 and 1.")
+    return x
+
+def tent_exact(x0: Union[Fraction, int, float, str], n: int) -> List[Fraction]:
+    """
+    Compute the iterates of the Tent Map exactly in rational arithmetic.
+
+    With x = p/q, each step only updates the integer numerator:
+        p -> 2p        if 2p <= q
+        p -> 2q - 2p   otherwise
+    so the denominator never grows and every iterate is exact.
+
+    Parameters:
+        x0 (Fraction | int | float | str): The initial condition in [0, 1].
+        n (int): The number of iterations to perform.
+
+    Returns:
+        List[Fraction]: A list containing the n+1 exact iterates, starting with x0.
+    """
+    x = _as_fraction(x0)
+    if not isinstance(n, int) or n < 0:
+        logging.error("Number of iterations n=%r is not a non-negative integer.", n)
+        raise ValueError("n must be a non-negative integer.")
+
+    p, q = x.numerator, x.denominator
+    xn: List[Fraction] = [x]
+    for _ in range(n):
+        p = 2 * p if 2 * p <= q else 2 * q - 2 * p
+        xn.append(Fraction(p, q))
+    return xn
+
+def tent_nth(x0: Union[Fraction, int, float, str], n: int) -> Fraction:
+    """
+    Compute the n-th iterate of the Tent Map directly, without the intermediate iterates.
+
+    With x = p/q and m = 2ⁿp mod 2q, bit n of x is 1 exactly when m >= q, and
+    frac(2ⁿx) = (m mod q)/q. The cost is one modular exponentiation, i.e. O(log n)
+    multiplications of integers the size of q.
+
+    Parameters:
+        x0 (Fraction | int | float | str): The initial condition in [0, 1].
+        n (int): Index of the iterate to return (non-negative integer).
+
+    Returns:
+        Fraction: The exact iterate xₙ.
+    """
+    x = _as_fraction(x0)
+    if not isinstance(n, int) or n < 0:
+        logging.error("Iterate index n=%r is not a non-negative integer.", n)
+        raise ValueError("n must be a non-negative integer.")
+    if n == 0:
+        return x
+
+    p, q = x.numerator, x.denominator
+    m = pow(2, n, 2 * q) * p % (2 * q)
+    frac = m % q
+    return Fraction(q - frac, q) if m >= q else Fraction(frac, q)
+
 def main() -> None:
     """
     Main driver function to run the Tent Map simulation and print selected iterates.
@@ -69,9 +242,14 @@ def main() -> None:
         # Print iterates from index 1001 to 1005
         selected_iterates = iterates[1001:1006]
         print("Tent Map iterates from index 1001 to 1005:", selected_iterates)
+        
+        # Exact iterates of x0 = 2/5, computed directly without the first 1000 steps
+        exact_iterates = [tent_nth("2/5", i) for i in range(1001, 1006)]
+        print("Exact Tent Map iterates from index 1001 to 1005:", [str(x) for x in exact_iterates])
     except Exception as e:
         logging.error("An error occurred: %s", e)
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
     main()
 
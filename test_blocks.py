@@ -0,0 +1,74 @@
+"""
+Tests for the lazy block-streaming generators of the discrete maps.
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import itertools
+import numpy as np
+import pytest
+from complex_iterated_map import complex_iterated_map_batched, complex_iterated_map_blocks
+from logistic_map import logistic, logistic_blocks
+from one_dimensional_map import one_dimensional_map_batched, one_dimensional_map_blocks
+from sweep_scheduler import _exponential_map_kernel
+from tent_map import tent, tent_blocks
+
+def test_logistic_blocks_match_logistic():
+    stream = np.concatenate(list(logistic_blocks(0.2, 3.9, 1000, n_transient=100, block_size=64)))
+    np.testing.assert_array_equal(stream, logistic(0.2, 1000, 3.9)[100:])
+
+def test_tent_blocks_match_tent():
+    stream = np.concatenate(list(tent_blocks(0.3, 200, n_transient=10, block_size=7)))
+    np.testing.assert_array_equal(stream, tent(0.3, 200)[10:])
+
+def test_one_dimensional_map_blocks_match_batched():
+    lambdas, x = one_dimensional_map_batched(400, lam_stop=1.6, lam_step=0.01, n_transient=50)
+    stream = np.concatenate(list(one_dimensional_map_blocks(lambdas, 0.5, 400, 50, block_size=100)), axis=1)
+    np.testing.assert_array_equal(stream, x)
+    np.testing.assert_array_equal(_exponential_map_kernel(lambdas, 400, 50), x)
+
+def test_complex_iterated_map_blocks_match_batched():
+    x0, y0 = np.linspace(0.0, 1.0, 4), np.linspace(0.0, 0.5, 4)
+    x, y = complex_iterated_map_batched(x0, y0, 300, n_transient=100)
+    blocks = list(complex_iterated_map_blocks(x0, y0, 301, n_transient=101, block_size=50))
+    np.testing.assert_array_equal(np.concatenate([b[0] for b in blocks], axis=1), x)
+    np.testing.assert_array_equal(np.concatenate([b[1] for b in blocks], axis=1), y)
+
+def test_streams_start_with_x0():
+    assert next(logistic_blocks(0.2, 3.9, 5))[0] == 0.2
+    assert next(tent_blocks(0.3, 5))[0] == 0.3
+    x, y = next(complex_iterated_map_blocks(0.1, 0.2, 5))
+    assert (x[0], y[0]) == (0.1, 0.2)
+
+def test_one_dimensional_map_stream_starts_after_x0():
+    # Numbered like one_dimensional_map_batched(): iterate 0 is computed from x0
+    assert next(one_dimensional_map_blocks(2.0, 0.4, 5))[0] == pytest.approx(0.4 * np.exp(2.0 * (1 - 0.4)))
+
+def test_resume_one_dimensional_map_from_last_iterate():
+    full = np.concatenate(list(one_dimensional_map_blocks(3.0, 0.5, 99)))
+    head = np.concatenate(list(one_dimensional_map_blocks(3.0, 0.5, 49)))
+    tail = np.concatenate(list(one_dimensional_map_blocks(3.0, head[-1], 49)))
+    np.testing.assert_array_equal(np.concatenate([head, tail]), full)
+
+def test_resume_with_one_transient_iterate():
+    # Streams that count x0 as iterate 0 skip it when resuming from the last value
+    full = np.concatenate(list(logistic_blocks(0.2, 3.9, 99)))
+    head = np.concatenate(list(logistic_blocks(0.2, 3.9, 49)))
+    tail = np.concatenate(list(logistic_blocks(head[-1], 3.9, 50, n_transient=1)))
+    np.testing.assert_array_equal(np.concatenate([head, tail]), full)
+
+def test_unbounded_stream():
+    blocks = list(itertools.islice(tent_blocks(0.3, block_size=16), 3))
+    assert [b.size for b in blocks] == [16, 16, 16]
+
+@pytest.mark.parametrize("make", [
+    lambda: logistic_blocks(0.2, 3.9, -1),
+    lambda: tent_blocks(0.3, 10, block_size=0),
+    lambda: one_dimensional_map_blocks(2.0, 0.5, 10, n_transient=-1),
+    lambda: complex_iterated_map_blocks([0.1, 0.2], [0.1], 10),
+])
+def test_invalid_arguments_raise_on_call(make):
+    # Raised by the call itself, before any block is requested
+    with pytest.raises(ValueError):
+        make()
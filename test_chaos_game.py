@@ -0,0 +1,112 @@
+"""
+Tests for the Chaos Game implementations in chaos_game.py.
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import numpy as np
+import pytest
+from chaos_game import (_ifs_blocks, attractor_extent, chaos_game, chaos_game_ensemble, chaos_game_ifs,
+                        chaos_game_numpy)
+from density_raster import DensityRaster
+
+P_LIST = [(0.0, 0.0), (1.0, 0.0), (0.5, np.sqrt(3) / 2)]
+
+def scalar_chaos_game(a, P_list, n, seed):
+    # Reference recurrence drawing the same start and vertex sequence as chaos_game_numpy
+    rng = np.random.default_rng(seed)
+    x, y = rng.uniform(-999, 999, size=2)
+    idx = rng.integers(0, len(P_list), size=n + 1)
+    xn, yn = [], []
+    for j in idx:
+        x, y = a * x + P_list[j][0], a * y + P_list[j][1]
+        xn.append(x)
+        yn.append(y)
+    return np.array(xn[100:]), np.array(yn[100:])
+
+def test_numpy_matches_scalar_recurrence():
+    x, y = chaos_game_numpy(0.5, P_LIST, 5000, seed=7, chunk_size=2 ** 16)
+    x_ref, y_ref = scalar_chaos_game(0.5, P_LIST, 5000, seed=7)
+    np.testing.assert_allclose(x, x_ref, atol=1e-12)
+    np.testing.assert_allclose(y, y_ref, atol=1e-12)
+
+def test_numpy_is_reproducible_with_seed():
+    x1, y1 = chaos_game_numpy(0.5, P_LIST, 3000, seed=1, chunk_size=256)
+    x2, y2 = chaos_game_numpy(0.5, P_LIST, 3000, seed=1, chunk_size=256)
+    np.testing.assert_array_equal(x1, x2)
+    np.testing.assert_array_equal(y1, y2)
+
+def test_points_stay_on_the_attractor():
+    for x, y in (chaos_game(0.5, P_LIST, 2000), chaos_game_numpy(0.5, P_LIST, 2000, seed=3)):
+        assert len(x) == len(y) == 1901
+        # After the transient every point lies in the triangle spanned by Pj / (1 - a)
+        x, y = np.asarray(x), np.asarray(y)
+        assert np.all(y >= -1e-9)
+        assert np.all(y <= np.sqrt(3) * np.minimum(x, 2 - x) + 1e-9)
+
+def test_out_buffers_are_filled_in_place():
+    x_out, y_out = np.empty(901, dtype=np.float32), np.empty(901, dtype=np.float32)
+    x, y = chaos_game_numpy(0.5, P_LIST, 1000, seed=2, out=(x_out, y_out))
+    assert x is x_out and y is y_out
+    np.testing.assert_allclose(x_out, chaos_game_numpy(0.5, P_LIST, 1000, seed=2)[0], rtol=1e-6)
+
+@pytest.mark.parametrize("a", [0.5, -0.5, -0.3, 0.7])
+def test_ifs_window_matches_unpruned(a):
+    P = np.asarray(P_LIST)
+    start = P[0] / (1 - a)
+    full = np.concatenate(list(_ifs_blocks(a, P, start, 8, 2 ** 12)))
+    for centre in full[::811]:
+        window = (centre[0] - 0.05, centre[0] + 0.05, centre[1] - 0.05, centre[1] + 0.05)
+        blocks = list(_ifs_blocks(a, P, start, 8, 2 ** 12, window=window))
+        pruned = np.concatenate(blocks) if blocks else np.empty((0, 2))
+        assert pruned.shape[0] < full.shape[0]
+
+        def n_inside(points):
+            return int(np.count_nonzero((points[:, 0] >= window[0]) & (points[:, 0] < window[1])
+                                        & (points[:, 1] >= window[2]) & (points[:, 1] < window[3])))
+        assert n_inside(pruned) == n_inside(full)
+
+def test_ifs_raster_matches_point_set():
+    x, y = chaos_game_ifs(-0.5, P_LIST, depth=7)
+    extent = (float(x[0]) - 0.1, float(x[0]) + 0.1, float(y[0]) - 0.1, float(y[0]) + 0.1)
+    expected = DensityRaster(extent, 64, 64)
+    expected.add(x, y)
+    raster = chaos_game_ifs(-0.5, P_LIST, DensityRaster(extent, 64, 64), depth=7)
+    np.testing.assert_array_equal(raster.counts, expected.counts)
+
+@pytest.mark.parametrize("a", [0.5, -0.5, 41 / 108, -0.7])
+def test_attractor_extent_contains_attractor(a):
+    pentagon = [(951.0, 309.0), (588.0, -809.0), (-588.0, -809.0), (-951.0, 309.0), (0.0, 1000.0)]
+    x_min, x_max, y_min, y_max = attractor_extent(a, pentagon)
+    x, y = chaos_game_ifs(a, pentagon, depth=5)
+    assert np.all((x >= x_min) & (x <= x_max) & (y >= y_min) & (y <= y_max))
+    raster = chaos_game_ifs(a, pentagon, DensityRaster((x_min, x_max, y_min, y_max), 64, 64), depth=6)
+    assert raster.n_points == 5 ** 6
+
+def test_ensemble_paths_agree(tmp_path):
+    kwargs = dict(n_walkers=37, seed=4, chunk_size=500)
+    in_process = chaos_game_ensemble(0.5, P_LIST, 3000, n_workers=1, **kwargs)
+    pooled = chaos_game_ensemble(0.5, P_LIST, 3000, n_workers=3, **kwargs)
+    on_disk = chaos_game_ensemble(0.5, P_LIST, 3000, n_workers=2, out_path=str(tmp_path / "e.npy"), **kwargs)
+    assert in_process.shape == (37, 2901, 2)
+    # Pooled results are returned as memory maps rather than copies
+    assert isinstance(pooled, np.memmap) and isinstance(on_disk, np.memmap)
+    np.testing.assert_array_equal(pooled, in_process)
+    np.testing.assert_array_equal(on_disk, in_process)
+    np.testing.assert_array_equal(np.load(str(tmp_path / "e.npy")), in_process)
+
+def test_ensemble_per_walker_transient():
+    full = chaos_game_ensemble(0.5, P_LIST, 1000, n_walkers=5, n_transient=0, seed=9, n_workers=1)
+    kept = chaos_game_ensemble(0.5, P_LIST, 1000, n_walkers=5, n_transient=100, seed=9, n_workers=1)
+    assert full.shape == (5, 1001, 2) and kept.shape == (5, 901, 2)
+    np.testing.assert_array_equal(kept, full[:, 100:])
+
+    # Every walker follows the recurrence with its own spawned generator
+    P = np.asarray(P_LIST)
+    for w, ss in enumerate(np.random.SeedSequence(9).spawn(5)):
+        rng = np.random.default_rng(ss)
+        point = rng.uniform(-999, 999, size=2)
+        for k, j in enumerate(rng.integers(0, 3, size=1001)[:200]):
+            point = 0.5 * point + P[j]
+            np.testing.assert_allclose(full[w, k], point, atol=1e-9)
@@ -0,0 +1,34 @@
+"""
+Tests for the headless command-line entry point in cli.py.
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import numpy as np
+import pytest
+from cli import main
+
+@pytest.mark.parametrize("a", [41 / 108, -0.5])
+def test_ifs_raster_keeps_every_point(tmp_path, a):
+    # The raster extent must contain the attractor for negative a as well
+    out = str(tmp_path / "ifs.npz")
+    assert main(["chaos-game", "--a", str(a), "--ifs", "--depth", "6", "--raster", "64", "64", "-o", out]) == 0
+    with np.load(out) as data:
+        assert data["counts"].sum() == 5 ** 6
+
+def test_chaos_game_raster_keeps_every_point(tmp_path):
+    out = str(tmp_path / "game.npz")
+    assert main(["chaos-game", "--a", "-0.5", "--n", "5000", "--seed", "1",
+                 "--raster", "32", "32", "-o", out]) == 0
+    with np.load(out) as data:
+        assert data["counts"].sum() == 5000 + 1 - 100
+
+def test_ifs_points_without_raster(tmp_path):
+    out = str(tmp_path / "ifs_points.npz")
+    assert main(["chaos-game", "--a", "-0.5", "--ifs", "--depth", "3", "-o", out]) == 0
+    with np.load(out) as data:
+        assert data["x"].shape == data["y"].shape == (125,)
+
+def test_ifs_without_raster_needs_depth(tmp_path):
+    assert main(["chaos-game", "--ifs", "-o", str(tmp_path / "x.npz")]) == 1
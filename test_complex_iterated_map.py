@@ -0,0 +1,107 @@
+"""
+Tests for the batched multi-initial-condition engine in complex_iterated_map.py.
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import numpy as np
+import pytest
+from complex_iterated_map import (_step_map, basin_labels, complex_iterated_map, complex_iterated_map_batched,
+                                  render_basin)
+
+X0 = np.linspace(-1.0, 1.0, 7)
+Y0 = np.linspace(0.0, 0.6, 7)
+
+BASIN_EXTENT = (-5.0, 4.0, -3.0, 3.5)
+
+def pixel_centres(extent, width, height):
+    x_min, x_max, y_min, y_max = extent
+    xs = x_min + (np.arange(width) + 0.5) * (x_max - x_min) / width
+    ys = y_max - (np.arange(height) + 0.5) * (y_max - y_min) / height
+    return np.meshgrid(xs, ys)
+
+def scalar_step(x, y):
+    phase = x ** 2 + y ** 2
+    return (np.pi + 0.5 * (x * np.cos(phase) - y * np.sin(phase)),
+            0.5 * (x * np.sin(phase) + y * np.cos(phase)))
+
+def test_step_matches_scalar_formula():
+    rng = np.random.default_rng(0)
+    xn, yn = rng.uniform(-4.0, 4.0, 1000), rng.uniform(-4.0, 4.0, 1000)
+    x_ref, y_ref = scalar_step(xn, yn)
+    _step_map(xn, yn, *(np.empty_like(xn) for _ in range(4)))
+    np.testing.assert_allclose(xn, x_ref, rtol=1e-15, atol=1e-15)
+    np.testing.assert_allclose(yn, y_ref, rtol=1e-15, atol=1e-15)
+
+def test_batched_matches_scalar_map():
+    # The map is chaotic, so one-ulp differences between vectorized and scalar cos/sin
+    # grow along the orbit; compare the first 51 kept iterates
+    x, y = complex_iterated_map_batched(X0, Y0, 150)
+    assert x.shape == y.shape == (7, 51)
+    for k in range(X0.size):
+        x_ref, y_ref = complex_iterated_map(float(X0[k]), float(Y0[k]), 150)
+        np.testing.assert_allclose(x[k], x_ref, atol=1e-9)
+        np.testing.assert_allclose(y[k], y_ref, atol=1e-9)
+
+def test_transients_and_scalar_inputs():
+    x_all, y_all = complex_iterated_map_batched(0.1, 0.2, 20, n_transient=0)
+    x, y = complex_iterated_map_batched(0.1, 0.2, 20, n_transient=5)
+    assert x_all.shape == (1, 21) and x.shape == (1, 16)
+    np.testing.assert_array_equal(x, x_all[:, 5:])
+    np.testing.assert_array_equal(y, y_all[:, 5:])
+    assert complex_iterated_map_batched(0.1, 0.2, 20, n_transient=21)[0].shape == (1, 0)
+
+def test_out_buffers():
+    x_out, y_out = np.empty((7, 51), dtype=np.float32), np.empty((7, 51), dtype=np.float32)
+    x, y = complex_iterated_map_batched(X0, Y0, 150, out=(x_out, y_out))
+    assert x is x_out and y is y_out
+
+@pytest.mark.parametrize("mode", ["attractor", "escape"])
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_tiled_render_matches_untiled(tmp_path, mode, n_workers):
+    # A loose tol and a small radius give labels that vary across the grid
+    kwargs = dict(max_iter=40, mode=mode, escape_radius=5.0, tol=3.0)
+    expected = basin_labels(BASIN_EXTENT, 23, 17, **kwargs)
+    assert np.unique(expected).size > 3
+    labels = render_basin(str(tmp_path / "basin.npy"), 23, 17, extent=BASIN_EXTENT, tile_size=6,
+                          n_workers=n_workers, **kwargs)
+    np.testing.assert_array_equal(labels, expected)
+
+def test_attractor_labels_do_not_depend_on_max_iter():
+    # Orbits settle on a chaotic attractor rather than a fixed point, so no pixel converges
+    # and every label is -1, however long the orbits are iterated
+    short = basin_labels(BASIN_EXTENT, 16, 16, max_iter=64)
+    np.testing.assert_array_equal(short, basin_labels(BASIN_EXTENT, 16, 16, max_iter=512))
+    assert np.all(short == -1)
+    # Pixels that converge keep their label when the others are iterated longer
+    short = basin_labels(BASIN_EXTENT, 16, 16, max_iter=8, tol=1.0)
+    longer = basin_labels(BASIN_EXTENT, 16, 16, max_iter=64, tol=1.0)
+    converged = short >= 0
+    assert converged.any() and not converged.all()
+    np.testing.assert_array_equal(longer[converged], short[converged])
+
+@pytest.mark.parametrize("radius", [4.0, 2 * np.pi, 9.0])
+def test_escape_time_matches_orbits(radius):
+    max_iter = 30
+    labels = basin_labels(BASIN_EXTENT, 20, 20, max_iter=max_iter, mode="escape", escape_radius=radius)
+    gx, gy = pixel_centres(BASIN_EXTENT, 20, 20)
+    x, y = complex_iterated_map_batched(gx.ravel(), gy.ravel(), max_iter - 1, n_transient=0)
+    escaped = x * x + y * y > radius * radius
+    expected = np.where(escaped.any(axis=1), escaped.argmax(axis=1) + 1, max_iter)
+    np.testing.assert_array_equal(labels.ravel(), expected)
+    if radius >= 2 * np.pi:
+        # Nothing can escape after the first step
+        assert set(np.unique(labels)) <= {1, max_iter}
+
+def test_validation():
+    with pytest.raises(ValueError):
+        complex_iterated_map_batched([0.1, 0.2], [0.1], 10)
+    with pytest.raises(ValueError):
+        complex_iterated_map_batched(0.1, 0.2, 10, n_transient=12)
+    with pytest.raises(ValueError):
+        complex_iterated_map_batched(0.1, 0.2, -1)
+    with pytest.raises(ValueError):
+        basin_labels(BASIN_EXTENT, 4, 4, mode="julia")
+    with pytest.raises(ValueError):
+        render_basin("unused.npy", 0, 4)
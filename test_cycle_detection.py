@@ -0,0 +1,78 @@
+"""
+Tests for cycle-detection early termination in cycle_detection.py.
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import numpy as np
+import pytest
+from cycle_detection import expand_sweep, periodic_sweep
+from logistic_map import logistic, logistic_sweep
+from one_dimensional_map import one_dimensional_map_batched, one_dimensional_map_periods
+
+def logistic_step(x, r):
+    return r * x * (1 - x)
+
+def brute_force(r_values, x0, n, n_transient):
+    # Same iterate numbering as periodic_sweep(): column 0 is f(x0)
+    x = np.full(r_values.size, x0)
+    out = np.empty((r_values.size, n + 1))
+    for i in range(n + 1):
+        x = logistic_step(x, r_values)
+        out[:, i] = x
+    return out[:, n_transient:]
+
+def test_matches_brute_force():
+    r_values = np.linspace(2.8, 4.0, 1201)
+    x, periods, cycles = periodic_sweep(logistic_step, r_values, 0.2, 2000, 500)
+    reference = brute_force(r_values, 0.2, 2000, 500)
+
+    # Unresolved rows are returned exactly; frozen rows follow their cycle once the
+    # brute-force orbit has settled onto it (slowly contracting orbits near the period
+    # doublings take most of the run to do so)
+    assert x.shape == (np.count_nonzero(periods == 0), 1501)
+    np.testing.assert_array_equal(x, reference[periods == 0])
+    expanded = expand_sweep(x, periods, cycles)
+    np.testing.assert_allclose(expanded[:, -500:], reference[:, -500:], atol=1e-6)
+    np.testing.assert_allclose(expanded[:, -50:], reference[:, -50:], atol=1e-8)
+
+def test_known_periods():
+    r_values = np.array([2.9, 3.2, 3.5, 3.83, 4.0])
+    _, periods, cycles = periodic_sweep(logistic_step, r_values, 0.2, 3000, 1000)
+    np.testing.assert_array_equal(periods, [1, 2, 4, 3, 0])
+    assert cycles[0, 0] == pytest.approx(1 - 1 / 2.9)
+    assert np.isnan(cycles[1, 2:]).all()
+
+def test_cycles_through_zero_are_matched():
+    # For r < 1 the logistic orbit decays onto the fixed point 0, where a purely relative
+    # tolerance never matches
+    _, periods, cycles = periodic_sweep(logistic_step, np.array([0.5, 0.9]), 0.2, 2000, 500)
+    np.testing.assert_array_equal(periods, [1, 1])
+    np.testing.assert_allclose(cycles[:, 0], 0, atol=1e-10)
+
+    # x -> 1 - a x² has the superstable period-2 cycle {0, 1} at a = 1
+    quadratic = lambda x, a: 1 - a * x * x
+    _, periods, cycles = periodic_sweep(quadratic, np.array([1.0]), 0.1, 1000, 101)
+    assert periods[0] == 2
+    # Kept iterate 0 is iterate 101, which lands on 0
+    np.testing.assert_allclose(cycles[0, :2], [0, 1], atol=1e-10)
+
+def test_logistic_sweep_matches_logistic():
+    r_values = np.linspace(3.4, 3.9, 200)
+    x, periods, cycles = logistic_sweep(r_values, n=1200, n_transient=1001)
+    reference = np.array([logistic(0.2, 1200, r)[1001:] for r in r_values])
+    np.testing.assert_array_equal(x, reference[periods == 0])
+    np.testing.assert_allclose(expand_sweep(x, periods, cycles)[:, -100:], reference[:, -100:], atol=1e-6)
+
+def test_one_dimensional_map_periods_matches_batched():
+    lambdas, x, periods, cycles = one_dimensional_map_periods(1000, lam_step=0.01)
+    _, reference = one_dimensional_map_batched(1000, lam_step=0.01)
+    np.testing.assert_array_equal(x, reference[periods == 0])
+    np.testing.assert_allclose(expand_sweep(x, periods, cycles)[:, -100:], reference[:, -100:], atol=1e-6)
+
+def test_validation():
+    with pytest.raises(ValueError):
+        periodic_sweep(logistic_step, np.array([3.0]), 0.2, 10, 10)
+    with pytest.raises(ValueError):
+        periodic_sweep(logistic_step, np.array([3.0]), 0.2, 10, 5, max_period=0)
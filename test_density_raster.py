@@ -0,0 +1,61 @@
+"""
+Tests for the streaming density raster in density_raster.py.
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import numpy as np
+import pytest
+from chaos_game import chaos_game, chaos_game_raster
+from density_raster import DensityRaster
+
+P_LIST = [(0.0, 0.0), (1.0, 0.0), (0.5, np.sqrt(3) / 2)]
+
+def histogram(x, y, extent, width, height):
+    # Reference binning: row 0 is the top (y_max) of the extent
+    counts, _, _ = np.histogram2d(y, x, bins=(height, width), range=(extent[2:], extent[:2]))
+    return counts[::-1]
+
+@pytest.mark.parametrize("n_points", [50, 5000])
+def test_add_matches_histogram(n_points):
+    # 50 points exercise the sparse path, 5000 the dense bincount path
+    rng = np.random.default_rng(0)
+    x, y = rng.uniform(-0.2, 1.2, n_points), rng.uniform(-0.2, 1.2, n_points)
+    raster = DensityRaster((0.0, 1.0, 0.0, 1.0), 32, 24)
+    raster.add(x[:n_points // 2], y[:n_points // 2])
+    raster.add(x[n_points // 2:], y[n_points // 2:])
+
+    expected = histogram(x, y, raster.extent, 32, 24)
+    np.testing.assert_array_equal(raster.counts, expected)
+    assert raster.n_points == int(expected.sum())
+    assert raster.n_points + raster.n_clipped == n_points
+
+def test_default_counts_are_uint64():
+    assert DensityRaster((0.0, 1.0, 0.0, 1.0), 4, 4).counts.dtype == np.uint64
+
+def test_narrow_counts_are_promoted_before_overflow():
+    raster = DensityRaster((0.0, 1.0, 0.0, 1.0), 2, 2, dtype=np.uint8)
+    raster.add(np.full(200, 0.25), np.full(200, 0.25))
+    assert raster.counts.dtype == np.uint8
+    raster.add(np.full(100, 0.25), np.full(100, 0.25))
+    assert raster.counts.dtype == np.uint64
+    assert raster.counts[1, 0] == 300
+
+    other = DensityRaster((0.0, 1.0, 0.0, 1.0), 2, 2, dtype=np.uint8)
+    other.add(np.full(200, 0.75), np.full(200, 0.75))
+    narrow = DensityRaster((0.0, 1.0, 0.0, 1.0), 2, 2, dtype=np.uint8)
+    narrow.add(np.full(100, 0.75), np.full(100, 0.75))
+    narrow.merge(other)
+    assert narrow.counts[0, 1] == 300
+
+def test_raster_keeps_short_runs():
+    # Like chaos_game(), fewer than 100 iterations return the full data
+    for secure in (False, True):
+        raster = chaos_game_raster(0.5, P_LIST, 50, DensityRaster((-2.0, 2.0, -2.0, 2.0), 8, 8),
+                                   seed=1, secure=secure)
+        assert raster.n_points + raster.n_clipped == len(chaos_game(0.5, P_LIST, 50)[0]) == 51
+
+def test_raster_drops_transients():
+    raster = chaos_game_raster(0.5, P_LIST, 1000, DensityRaster((-0.1, 2.1, -0.1, 1.9), 16, 16), seed=1)
+    assert raster.n_points == 901 and raster.n_clipped == 0
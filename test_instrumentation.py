@@ -0,0 +1,86 @@
+"""
+Tests for the opt-in kernel instrumentation in instrumentation.py.
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import json
+import instrumentation
+from euler_method import euler, f as euler_f
+from one_dimensional_map import one_dimensional_map_batched
+from runge_kutta import RK4, f as rk4_f
+
+def square(t, x):
+    return x * x
+
+def test_disabled_hooks_are_free():
+    assert not instrumentation.enabled()
+    assert instrumentation.counted(square, "square") is square
+    assert instrumentation.phase("a") is instrumentation.phase("b")
+    instrumentation.record("kernel", iterations=5)
+
+def test_counted_counts_calls():
+    with instrumentation.instrument() as metrics:
+        wrapped = instrumentation.counted(square, "square.f_evals")
+        assert wrapped.__name__ == "square"
+        assert [wrapped(0.0, x) for x in range(4)] == [0, 1, 4, 9]
+    # The wrapper keeps counting into the record it was created for
+    wrapped(0.0, 5)
+    assert metrics.counters == {"square.f_evals": 5}
+
+def test_phase_accumulates_entries():
+    with instrumentation.instrument() as metrics:
+        for _ in range(3):
+            with instrumentation.phase("work"):
+                sum(range(1000))
+    assert metrics.phases["work"]["calls"] == 3
+    assert metrics.phases["work"]["wall_s"] >= 0 and metrics.phases["work"]["cpu_s"] >= 0
+    assert metrics.phases["total"]["calls"] == 1
+
+def test_phase_is_timed_when_the_block_raises():
+    with instrumentation.instrument() as metrics:
+        try:
+            with instrumentation.phase("failing"):
+                raise KeyError
+        except KeyError:
+            pass
+    assert metrics.phases["failing"]["calls"] == 1
+
+def test_record_and_nested_blocks():
+    with instrumentation.instrument() as outer:
+        instrumentation.record("kernel", iterations=3)
+        with instrumentation.instrument() as inner:
+            instrumentation.record("kernel", iterations=4)
+        instrumentation.record("kernel", iterations=5)
+    assert not instrumentation.enabled()
+    assert outer.counters == {"kernel.calls": 2, "kernel.iterations": 8}
+    assert inner.counters == {"kernel.calls": 1, "kernel.iterations": 4}
+
+def test_integrator_counters():
+    with instrumentation.instrument() as metrics:
+        euler(0.0, 0.0, 1.0, 0.01, euler_f)
+        RK4(0.0, 0.0, 1.0, 0.01, rk4_f)
+    counters = metrics.counters
+    assert counters["euler.calls"] == 1
+    # Euler takes one RHS evaluation per step, RK4 four
+    assert counters["euler.iterations"] == counters["euler.f_evals"] >= 100
+    assert counters["RK4.f_evals"] == 4 * counters["RK4.iterations"]
+
+def test_map_phases():
+    with instrumentation.instrument() as metrics:
+        lambdas, _ = one_dimensional_map_batched(20, lam_step=0.5, n_transient=10)
+    assert metrics.counters["one_dimensional_map.iterations"] == 21 * lambdas.size
+    assert {"transient", "steady_state", "total"} <= set(metrics.phases)
+
+def test_instrumented_decorator_and_json(tmp_path):
+    @instrumentation.instrumented
+    def run():
+        instrumentation.record("kernel", iterations=7)
+        return 1
+
+    assert run() == 1
+    assert run.last_metrics.counters == {"kernel.calls": 1, "kernel.iterations": 7}
+    path = tmp_path / "metrics.json"
+    text = run.last_metrics.to_json(str(path))
+    assert json.loads(path.read_text()) == json.loads(text) == run.last_metrics.as_dict()
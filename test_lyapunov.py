@@ -0,0 +1,69 @@
+"""
+Tests for the vectorized Lyapunov exponent sweeps in lyapunov.py.
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import numpy as np
+import pytest
+from lyapunov import (_exponential_step, _logistic_step, _tent_step, lyapunov_exponential,
+                      lyapunov_logistic, lyapunov_sweep, lyapunov_tent)
+
+def test_logistic_fully_chaotic():
+    # At r = 4 the logistic map is conjugate to the doubling map, so λ = ln 2
+    exponents, _ = lyapunov_logistic(np.array([4.0]), n=100000)
+    assert exponents[0] == pytest.approx(np.log(2), abs=5e-3)
+
+def test_logistic_fixed_point_and_periodic_window():
+    # Below r = 3 the orbit settles on x* = 1 - 1/r where f′(x*) = 2 - r
+    r = np.array([2.5, 2.8, 3.2, 3.5, 3.83])
+    exponents, _ = lyapunov_logistic(r)
+    np.testing.assert_allclose(exponents[:2], np.log(np.abs(2 - r[:2])), atol=1e-6)
+    # Period-2, period-4 and the period-3 window are stable cycles
+    assert np.all(exponents[2:] < 0)
+
+def test_tent_slope():
+    mu = np.array([1.2, 1.5, 1.9, 2.0])
+    exponents, _ = lyapunov_tent(mu)
+    np.testing.assert_allclose(exponents, np.log(mu), rtol=1e-12)
+
+def test_exponential_map_fixed_point():
+    # The fixed point x* = 1 is stable for λ < 2 with f′(1) = 1 - λ
+    lam = np.array([0.5, 1.5, 1.9])
+    exponents, _ = lyapunov_exponential(lam)
+    np.testing.assert_allclose(exponents, np.log(np.abs(1 - lam)), atol=1e-6)
+
+def test_tol_stops_converged_columns_early():
+    r = np.array([2.8, 3.2, 4.0])
+    full, full_counts = lyapunov_logistic(r, n=20000)
+    early, counts = lyapunov_logistic(r, n=20000, tol=1e-6, check_every=100)
+    assert np.all(full_counts == 20000)
+    # Cycles converge after a few checks; the chaotic r = 4 average fluctuates far longer
+    assert counts[0] == counts[1] == 200 and counts[2] > 1000
+    np.testing.assert_allclose(early[:2], full[:2], atol=1e-6)
+    assert early[2] == pytest.approx(np.log(2), abs=5e-3)
+
+@pytest.mark.parametrize("step, params", [
+    (_logistic_step, np.array([3.3, 3.7, 4.0])),
+    (_tent_step, np.array([1.5, 1.8, 2.0])),
+    (_exponential_step, np.array([1.5, 2.7, 3.6])),
+])
+def test_step_derivatives(step, params):
+    x = np.array([0.2, 0.45, 0.8])
+    _, slope = step(x, params)
+    h = 1e-6
+    numeric = (step(x + h, params)[0] - step(x - h, params)[0]) / (2 * h)
+    np.testing.assert_allclose(slope, numeric, rtol=1e-6)
+
+def test_exponential_step_at_zero():
+    x_next, slope = _exponential_step(np.array([0.0, 0.5]), np.array([2.0, 2.0]))
+    assert x_next[0] == 0 and slope[0] == pytest.approx(np.exp(2.0))
+
+def test_validation():
+    with pytest.raises(ValueError):
+        lyapunov_sweep(_logistic_step, [3.5], 0.2, 0)
+    with pytest.raises(ValueError):
+        lyapunov_logistic(np.array([3.5]), tol=0.0)
+    with pytest.raises(ValueError):
+        lyapunov_logistic(np.array([3.5]), check_every=0)
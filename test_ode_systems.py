@@ -0,0 +1,104 @@
+"""
+Tests for the vectorized right-hand sides and MATLAB post-processing in ode_systems.py.
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import numpy as np
+import pytest
+from ode_systems import (RPSLK_X0, attractor, lorenz, random_initial_conditions, round_small,
+                         rossler, rpslk, simulate, trim_transient)
+
+# Scalar transcriptions of the function handles in the MATLAB scripts (p(1) -> p[0], ...)
+
+def lorenz_m(p, sigma=10.0, beta=8 / 3, rho=22.0):
+    return [sigma * (p[1] - p[0]),
+            p[0] * (rho - p[2]) - p[1],
+            p[0] * p[1] - beta * p[2]]
+
+def rossler_m(p, a=0.2, b=0.2, c=6.3):
+    return [-(p[1] + p[2]),
+            p[0] + a * p[1],
+            b + p[0] * p[2] - c * p[2]]
+
+def attractor_m(p, alpha=0.3):
+    return [-alpha * p[0] + np.sin(p[1]),
+            -alpha * p[1] + np.sin(p[2]),
+            -alpha * p[2] + np.sin(p[0])]
+
+def rpslk_m(p, a=1.0):
+    pairs = (p[0] * p[1] + p[0] * p[2] + p[0] * p[3] + p[0] * p[4] + p[1] * p[2]
+             + p[1] * p[3] + p[1] * p[4] + p[2] * p[3] + p[2] * p[4] + p[3] * p[4])
+    return [p[0] * ((-p[1] + a * p[2] + a * p[3] - p[4]) - (a - 1) * pairs),
+            p[1] * ((a * p[0] - p[2] - p[3] + a * p[4]) - (a - 1) * pairs),
+            p[2] * ((-p[0] + a * p[1] + a * p[3] - p[4]) - (a - 1) * pairs),
+            p[3] * ((-p[0] + a * p[1] - p[2] + a * p[4]) - (a - 1) * pairs),
+            p[4] * ((a * p[0] - p[1] + a * p[2] - p[3]) - (a - 1) * pairs)]
+
+@pytest.mark.parametrize("rhs, reference, dim, params", [
+    (lorenz, lorenz_m, 3, {}),
+    (lorenz, lorenz_m, 3, {"sigma": 9.0, "beta": 2.5, "rho": 28.0}),
+    (rossler, rossler_m, 3, {}),
+    (rossler, rossler_m, 3, {"a": 0.1, "b": 0.3, "c": 5.0}),
+    (attractor, attractor_m, 3, {}),
+    (attractor, attractor_m, 3, {"alpha": 0.2}),
+    (rpslk, rpslk_m, 5, {}),
+    (rpslk, rpslk_m, 5, {"a": 1.7}),
+])
+def test_rhs_matches_matlab(rhs, reference, dim, params):
+    points = np.random.default_rng(3).uniform(-5.0, 10.0, size=(4, 2, dim))
+    expected = np.array([[reference(p, **params) for p in row] for row in points])
+    # Batched over leading axes, and for a single state vector
+    np.testing.assert_allclose(rhs(0.0, points, **params), expected, rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(rhs(0.0, points[0, 0], **params), expected[0, 0], rtol=1e-12, atol=1e-12)
+
+def test_rossler_b_defaults_to_a():
+    p = np.array([1.0, 2.0, 3.0])
+    np.testing.assert_allclose(rossler(0.0, p, a=0.4), rossler_m(p, a=0.4, b=0.4))
+
+def test_trim_transient_keeps_samples_from_the_nth():
+    t = np.arange(10.0)
+    x = np.arange(20.0).reshape(10, 2)
+    t_trim, x_trim = trim_transient(t, x, 3)
+    np.testing.assert_array_equal(t_trim, t[2:])
+    np.testing.assert_array_equal(x_trim, x[2:])
+    # The result is a view
+    assert np.shares_memory(x_trim, x)
+
+@pytest.mark.parametrize("n", [10, 15])
+def test_trim_transient_short_runs(n):
+    t = np.arange(10.0)
+    x = t[:, np.newaxis] * 2
+    # Like Lorenz.m and Rossler.m: too few samples keeps everything
+    np.testing.assert_array_equal(trim_transient(t, x, n)[0], t)
+    # Like Attractor.m: t(min(n, length(t)):end) keeps the last sample
+    t_clamped, x_clamped = trim_transient(t, x, n, clamp=True)
+    np.testing.assert_array_equal(t_clamped, [9.0])
+    np.testing.assert_array_equal(x_clamped, [[18.0]])
+
+def test_trim_transient_validation():
+    with pytest.raises(ValueError):
+        trim_transient(np.arange(3.0), np.arange(3.0), 0)
+
+def test_round_small():
+    x = np.array([1e-4, -5e-4, 1e-3, -0.2, 0.0])
+    assert round_small(x) is x
+    np.testing.assert_array_equal(x, [0.0, 0.0, 1e-3, -0.2, 0.0])
+
+def test_simulate_trims_and_rounds():
+    x0 = random_initial_conditions(4, seed=1)
+    t, x = simulate("lorenz", x0, dt=0.01, t_end=1.0)
+    # 101 RK4 samples, trimmed from the 50th
+    assert t.shape == (52,) and x.shape == (52, 4, 3)
+    assert t[0] == pytest.approx(0.49)
+
+    t, x = simulate("rpslk", RPSLK_X0, dt=0.05, t_end=5.0)
+    assert x.shape == (t.size, 5)
+    assert np.all((x == 0) | (np.abs(x) >= 1e-3))
+
+def test_simulate_validation():
+    with pytest.raises(ValueError):
+        simulate("duffing", np.zeros(3))
+    with pytest.raises(ValueError):
+        simulate("lorenz", np.zeros(5))
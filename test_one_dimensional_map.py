@@ -0,0 +1,54 @@
+"""
+Tests for the vectorized all-λ engine in one_dimensional_map.py.
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import numpy as np
+import pytest
+from one_dimensional_map import one_dimensional_map, one_dimensional_map_batched
+
+def scalar_map(lam, n, n_transient, x0=0.5):
+    # Original per-λ recurrence: first iterate from x0, then n more, transients dropped
+    xn = [x0 * np.exp(lam * (1 - x0))]
+    for i in range(n):
+        xn.append(xn[i] * np.exp(lam * (1 - xn[i])))
+    return np.array(xn[n_transient:])
+
+def test_batched_matches_scalar_recurrence():
+    lambdas, x = one_dimensional_map_batched(600, lam_step=0.01)
+    assert x.shape == (lambdas.size, 600 + 1 - 255)
+    np.testing.assert_array_equal(x, [scalar_map(lam, 600, 255) for lam in lambdas])
+
+def test_batched_parameters():
+    lambdas, x = one_dimensional_map_batched(50, lam_start=2.0, lam_stop=3.0, lam_step=0.25,
+                                             x0=0.3, n_transient=10)
+    np.testing.assert_allclose(lambdas, [2.0, 2.25, 2.5, 2.75])
+    np.testing.assert_array_equal(x, [scalar_map(lam, 50, 10, x0=0.3) for lam in lambdas])
+
+def test_wrapper_keeps_list_output():
+    x, y = one_dimensional_map(300)
+    assert len(x) == len(y) == np.arange(1.5, 4.0, 0.001).size
+    for i in (0, 1234, len(x) - 1):
+        lam = y[i][0]
+        np.testing.assert_array_equal(x[i], scalar_map(lam, 300, 255))
+        np.testing.assert_array_equal(y[i], np.full(300 - 254, lam))
+
+def test_float32_and_out_buffer():
+    out = np.empty((100, 46), dtype=np.float32)
+    lambdas, x = one_dimensional_map_batched(300, lam_step=0.025, out=out)
+    assert x is out
+    # Below the first period doubling (λ = 2) the orbit settles on x* = 1 in either precision
+    stable = lambdas < 1.9
+    np.testing.assert_allclose(x[stable], 1.0, atol=1e-5)
+    with pytest.raises(ValueError):
+        one_dimensional_map_batched(300, lam_step=0.025, out=np.empty((100, 45)))
+
+def test_validation():
+    with pytest.raises(ValueError):
+        one_dimensional_map_batched(100, n_transient=100)
+    with pytest.raises(ValueError):
+        one_dimensional_map_batched(300, lam_step=0.0)
+    with pytest.raises(ValueError):
+        one_dimensional_map(255)
@@ -0,0 +1,84 @@
+"""
+Tests for the grid-hashed correlation sum and recurrence analysis in orbit_analysis.py.
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import numpy as np
+import pytest
+from chaos_game import chaos_game_numpy
+from orbit_analysis import correlation_dimension, correlation_sum, delay_embed, recurrence_matrix
+
+P_LIST = [(0.0, 0.0), (1.0, 0.0), (0.5, np.sqrt(3) / 2)]
+
+def pair_distances(points, metric):
+    delta = points[:, np.newaxis, :] - points[np.newaxis, :, :]
+    if metric == "euclidean":
+        return np.sqrt((delta ** 2).sum(axis=-1))
+    return np.abs(delta).max(axis=-1)
+
+def brute_force(points, radii, theiler=0, metric="euclidean", ref=None):
+    # O(N²) count over every pair (i, j) with i in ref and |i - j| > theiler
+    n = points.shape[0]
+    ref = np.arange(n) if ref is None else ref
+    dist = pair_distances(points, metric)[ref]
+    eligible = np.abs(ref[:, np.newaxis] - np.arange(n)) > theiler
+    return np.array([np.count_nonzero((dist < r) & eligible) for r in radii]) / np.count_nonzero(eligible)
+
+@pytest.fixture(scope="module")
+def points():
+    x, y = chaos_game_numpy(0.5, P_LIST, 1600, seed=0)
+    return np.column_stack((x, y))
+
+# Radii spanning more than a factor of 16, so several grids are built
+RADII = np.array([0.002, 0.01, 0.05, 0.2, 0.5, 1.5])
+
+@pytest.mark.parametrize("metric", ["euclidean", "chebyshev"])
+@pytest.mark.parametrize("theiler", [0, 5])
+def test_exact_count_matches_brute_force(points, metric, theiler):
+    c = correlation_sum(points, RADII, theiler=theiler, metric=metric, max_candidates=None, max_pairs=50000)
+    np.testing.assert_allclose(c, brute_force(points, RADII, theiler, metric), rtol=1e-12)
+
+def test_unsorted_radii_and_scalar_points():
+    x = np.random.default_rng(1).random(500)
+    radii = np.array([0.1, 0.001, 0.03])
+    c = correlation_sum(x, radii, max_candidates=None)
+    np.testing.assert_allclose(c, brute_force(x[:, np.newaxis], radii), rtol=1e-12)
+
+def test_reference_subsample_matches_brute_force(points):
+    c = correlation_sum(points, RADII, n_ref=200, seed=3, max_candidates=None)
+    ref = np.sort(np.random.default_rng(3).choice(points.shape[0], size=200, replace=False))
+    np.testing.assert_allclose(c, brute_force(points, RADII, ref=ref), rtol=1e-12)
+
+def test_sampled_candidates_are_unbiased(points):
+    radii = np.array([0.1, 0.3])
+    estimates = [correlation_sum(points, radii, seed=s, max_candidates=20000) for s in range(20)]
+    np.testing.assert_allclose(np.mean(estimates, axis=0), brute_force(points, radii), rtol=0.03)
+
+def test_recurrence_matrix_matches_brute_force(points):
+    rows, cols = recurrence_matrix(points, 0.05, theiler=2, max_pairs=777)
+    n = points.shape[0]
+    expected = (pair_distances(points, "euclidean") < 0.05) & (np.abs(np.subtract.outer(np.arange(n), np.arange(n))) > 2)
+    np.testing.assert_array_equal(np.column_stack((rows, cols)), np.argwhere(expected))
+
+def test_sierpinski_dimension():
+    x, y = chaos_game_numpy(0.5, P_LIST, 50000, seed=0)
+    dimension, _, _ = correlation_dimension(np.column_stack((x, y)), n_ref=5000, seed=0,
+                                            radii=np.logspace(-2, -0.5, 8))
+    assert dimension == pytest.approx(np.log(3) / np.log(2), abs=0.1)
+
+def test_delay_embed():
+    v = delay_embed(np.arange(10.0), 3, tau=2)
+    assert v.shape == (6, 3)
+    np.testing.assert_array_equal(v[1], [1.0, 3.0, 5.0])
+    with pytest.raises(ValueError):
+        delay_embed(np.arange(4.0), 3, tau=2)
+
+def test_validation(points):
+    with pytest.raises(ValueError):
+        correlation_sum(points, [0.0])
+    with pytest.raises(ValueError):
+        correlation_sum(points, [0.1], metric="manhattan")
+    with pytest.raises(ValueError):
+        correlation_sum(points[:1], [0.1])
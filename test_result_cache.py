@@ -0,0 +1,116 @@
+"""
+Tests for the content-addressed result cache in result_cache.py.
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import os
+import numpy as np
+import pytest
+import result_cache
+from result_cache import ResultCache, cache_key, cached
+from chaos_game import chaos_game, chaos_game_numpy
+from logistic_map import logistic
+from runge_kutta import RK4
+
+P_LIST = [(0.0, 0.0), (1.0, 0.0), (0.5, np.sqrt(3) / 2)]
+RATE = 1.0
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(str(tmp_path), max_bytes=2 ** 24)
+
+def n_entries(cache: ResultCache) -> int:
+    return len(cache._entries())
+
+def test_hit_and_miss(cache):
+    first = cache.call(logistic, 0.2, 100, 3.9, deterministic=True)
+    again = cache.call(logistic, 0.2, 100, 3.9, deterministic=True)
+    other = cache.call(logistic, 0.2, 100, 3.8, deterministic=True)
+    assert n_entries(cache) == 2
+    np.testing.assert_array_equal(first, logistic(0.2, 100, 3.9))
+    np.testing.assert_array_equal(again, first)
+    assert isinstance(again, np.memmap) and not again.flags.writeable
+    assert not np.array_equal(other, first)
+
+def test_seeded_call_is_cached(cache):
+    x1, y1 = cache.call(chaos_game_numpy, 0.5, P_LIST, 1000, seed=1)
+    x2, y2 = cache.call(chaos_game_numpy, 0.5, P_LIST, 1000, seed=1)
+    assert n_entries(cache) == 1
+    np.testing.assert_array_equal(x1, x2)
+    np.testing.assert_array_equal(y1, y2)
+
+def test_unseeded_call_bypasses_cache(cache):
+    cache.call(chaos_game_numpy, 0.5, P_LIST, 1000)
+    assert n_entries(cache) == 0
+
+def test_function_without_seed_needs_opt_in(cache):
+    # chaos_game draws from an unseeded generator and must never be memoized
+    x1, _ = cache.call(chaos_game, 0.5, P_LIST, 1000)
+    x2, _ = cache.call(chaos_game, 0.5, P_LIST, 1000)
+    assert n_entries(cache) == 0
+    assert x1 != x2
+
+def test_out_buffers_are_filled_and_not_cached(cache):
+    for _ in range(2):
+        x_out, y_out = np.zeros(901), np.zeros(901)
+        x, y = cache.call(chaos_game_numpy, 0.5, P_LIST, 1000, seed=1, out=(x_out, y_out))
+        assert x is x_out and y is y_out
+        np.testing.assert_array_equal(x_out, chaos_game_numpy(0.5, P_LIST, 1000, seed=1)[0])
+    assert n_entries(cache) == 0
+
+def test_dtype_is_part_of_the_key(cache):
+    single = cache.call(logistic, 0.2, 100, 3.9, dtype=np.float32, deterministic=True)
+    double = cache.call(logistic, 0.2, 100, 3.9, dtype=np.float64, deterministic=True)
+    assert n_entries(cache) == 2
+    assert single.dtype == np.float32 and double.dtype == np.float64
+
+def test_cached_wrapper(cache):
+    cached_logistic = cached(logistic, cache, deterministic=True)
+    np.testing.assert_array_equal(cached_logistic(0.2, 50, 3.9), logistic(0.2, 50, 3.9))
+    assert n_entries(cache) == 1
+
+def test_closures_are_keyed_on_captured_values(cache):
+    def decay(k):
+        return lambda t, x: k * x
+
+    for k in (1.0, -1.0, 1.0):
+        x = cache.call(RK4, 0.0, 1.0, 1.0, 0.01, decay(k), deterministic=True)
+        assert x == pytest.approx(np.exp(k), rel=1e-8)
+    assert n_entries(cache) == 2
+
+def test_defaults_and_globals_are_part_of_the_key():
+    global RATE
+    def rhs(t, x, k=2.0):
+        return -k * RATE * x
+
+    key = cache_key(RK4, 0.0, 1.0, 1.0, 0.01, rhs)
+    RATE = 3.0
+    assert cache_key(RK4, 0.0, 1.0, 1.0, 0.01, rhs) != key
+    RATE = 1.0
+    rhs.__defaults__ = (5.0,)
+    assert cache_key(RK4, 0.0, 1.0, 1.0, 0.01, rhs) != key
+
+def test_function_without_source_file_is_not_cached(cache):
+    # As for functions defined in a REPL or with python -c
+    namespace = {}
+    exec(compile("def grow(t, x):\n    return x\n", "<string>", "exec"), namespace)
+    assert cache.call(namespace["grow"], 0.0, 2.0, deterministic=True) == 2.0
+    assert cache.call(RK4, 0.0, 1.0, 1.0, 0.01, namespace["grow"], deterministic=True) == pytest.approx(np.e)
+    assert n_entries(cache) == 0
+
+def test_code_version_covers_local_imports():
+    files = {os.path.basename(p) for p in result_cache._local_imports(os.path.abspath(logistic.__code__.co_filename))}
+    assert {"buffers.py", "cycle_detection.py", "instrumentation.py"} <= files
+
+def test_key_depends_on_arguments():
+    assert cache_key(logistic, 0.2, 100, 3.9) == cache_key(logistic, x0=0.2, n=100, r=3.9)
+    assert cache_key(logistic, 0.2, 100, 3.9) != cache_key(logistic, 0.2, 101, 3.9)
+
+def test_eviction(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=12000)
+    for r in (3.5, 3.6, 3.7):
+        cache.call(logistic, 0.2, 999, r, deterministic=True)
+    assert cache.size() <= 12000
+    assert n_entries(cache) == 1
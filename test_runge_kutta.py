@@ -0,0 +1,42 @@
+"""
+Tests for the Runge-Kutta solvers in runge_kutta.py.
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import numpy as np
+import pytest
+from runge_kutta import DOPRI5, RK4, RK4_batch
+
+def test_rk4_exponential_decay():
+    # dx/dt = -x, x(0) = 1  =>  x(1) = e^-1; RK4 is O(dt^4)
+    x = RK4(0.0, 1.0, 1.0, 0.01, lambda t, x: -x)
+    assert x == pytest.approx(np.exp(-1.0), abs=1e-9)
+
+def test_rk4_batch_matches_scalar_rk4():
+    rates = np.array([0.5, 1.0, 2.0])
+    x = RK4_batch(0.0, np.ones((3, 1)), 1.0, 0.01, lambda t, X: -rates[:, np.newaxis] * X)
+    expected = [RK4(0.0, 1.0, 1.0, 0.01, lambda t, x, k=k: -k * x) for k in rates]
+    np.testing.assert_allclose(x[:, 0], expected, rtol=1e-12)
+
+def test_rk4_batch_identity_rhs():
+    # f_func returning its input must not let one stage overwrite an earlier k
+    x = RK4_batch(0.0, [1.0], 1.0, 0.01, lambda t, x: x)
+    assert x[0] == pytest.approx(np.e, abs=1e-9)
+
+def test_rk4_batch_record():
+    t, trajectory = RK4_batch(0.0, [1.0, 2.0], 1.0, 0.1, lambda t, x: -x, record=True)
+    assert t.shape == (11,) and trajectory.shape == (11, 2)
+    np.testing.assert_allclose(trajectory[-1], np.array([1.0, 2.0]) * np.exp(-1.0), rtol=1e-5)
+
+def test_dopri5_exponential_decay():
+    x, stats = DOPRI5(0.0, 1.0, 5.0, 0.1, lambda t, x: -x, rtol=1e-10, atol=1e-12)
+    assert float(x) == pytest.approx(np.exp(-5.0), rel=1e-8)
+    assert stats["n_fevals"] == 1 + 6 * (stats["n_accepted"] + stats["n_rejected"])
+
+def test_dopri5_dense_output():
+    t_eval = np.linspace(0.0, 2.0, 41)
+    x, _ = DOPRI5(0.0, [1.0, 3.0], 2.0, 0.1, lambda t, x: -x, rtol=1e-9, atol=1e-12, t_eval=t_eval)
+    assert x.shape == (41, 2)
+    np.testing.assert_allclose(x, np.exp(-t_eval)[:, np.newaxis] * [1.0, 3.0], rtol=1e-7)
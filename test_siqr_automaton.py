@@ -0,0 +1,67 @@
+"""
+Tests for the headless SIQR cellular automaton in siqr_automaton.py.
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import numpy as np
+import pytest
+from siqr_automaton import INFECTED, SIQRAutomaton, siqr
+
+def dense_neighbour_counts(grid):
+    # Reference: 3×3 convolution of the infected mask with a zero centre, zero boundaries
+    n_rows, n_cols = grid.shape
+    infected = (grid == INFECTED).astype(int)
+    counts = np.zeros(grid.shape, dtype=int)
+    for i in range(n_rows):
+        for j in range(n_cols):
+            window = infected[max(i - 1, 0):i + 2, max(j - 1, 0):j + 2]
+            counts[i, j] = window.sum() - infected[i, j]
+    return counts
+
+def test_population_is_conserved():
+    automaton = SIQRAutomaton(40, alpha=0.2, seed=5)
+    counts = automaton.run(300)
+    assert np.all(counts.sum(axis=1) == 40 * 40)
+    assert np.all(counts >= 0)
+    # The tracked counts agree with the states on the grid
+    np.testing.assert_array_equal(np.bincount(automaton.grid.ravel(), minlength=4), counts[-1])
+
+def test_seed_reproduces_the_run():
+    counts_a, grid_a = siqr(40, alpha=0.2, max_iter=200, seed=11)
+    counts_b, grid_b = siqr(40, alpha=0.2, max_iter=200, seed=11)
+    np.testing.assert_array_equal(counts_a, counts_b)
+    np.testing.assert_array_equal(grid_a, grid_b)
+    counts_c, _ = siqr(40, alpha=0.2, max_iter=200, seed=12)
+    assert not np.array_equal(counts_a, counts_c)
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_neighbour_counts_match_convolution(seed):
+    rng = np.random.default_rng(seed)
+    automaton = SIQRAutomaton(23, seed=seed)
+    # Random states, with infected cells touching the grid edges
+    automaton.grid[:] = rng.integers(0, 4, size=(23, 23))
+    automaton.grid[0, 5] = automaton.grid[22, 22] = INFECTED
+    automaton._infected = np.flatnonzero(automaton.grid == INFECTED)
+
+    r0, c0, k = automaton._neighbour_counts()
+    reference = dense_neighbour_counts(automaton.grid)
+    np.testing.assert_array_equal(k, reference[r0:r0 + k.shape[0], c0:c0 + k.shape[1]])
+    # Cells outside the box have no infected neighbours
+    outside = np.ones(reference.shape, dtype=bool)
+    outside[r0:r0 + k.shape[0], c0:c0 + k.shape[1]] = False
+    assert not reference[outside].any()
+
+def test_outbreak_ends():
+    counts, grid = siqr(30, alpha=0.0, q=0.5, gamma=0.5, seed=3)
+    assert counts[-1, 1] == counts[-1, 2] == 0
+    assert not np.isin(grid, (1, 2)).any()
+
+def test_validation():
+    with pytest.raises(ValueError):
+        SIQRAutomaton(0)
+    with pytest.raises(ValueError):
+        SIQRAutomaton(10, alpha=1.5)
+    with pytest.raises(ValueError):
+        SIQRAutomaton(10).run(-1)
@@ -0,0 +1,73 @@
+"""
+Tests for the process-pool sweep scheduler in sweep_scheduler.py.
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+from functools import partial
+from multiprocessing import shared_memory
+import numpy as np
+import pytest
+import sweep_scheduler
+from one_dimensional_map import one_dimensional_map_batched
+from sweep_scheduler import SweepCancelled, _exponential_map_kernel, run_sweep
+
+@pytest.fixture
+def created_segments(monkeypatch):
+    # Record the name of every shared memory segment the scheduler creates
+    names = []
+
+    class RecordingSharedMemory(shared_memory.SharedMemory):
+        def __init__(self, name=None, create=False, size=0):
+            super().__init__(name=name, create=create, size=size)
+            if create:
+                names.append(self.name)
+
+    monkeypatch.setattr(sweep_scheduler.shared_memory, "SharedMemory", RecordingSharedMemory)
+    return names
+
+def assert_unlinked(names):
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_matches_batched_sweep(n_workers):
+    n, n_transient = 300, 100
+    lambdas, reference = one_dimensional_map_batched(n, lam_step=0.01, n_transient=n_transient)
+    kernel = partial(_exponential_map_kernel, n=n, n_transient=n_transient)
+    x = run_sweep(kernel, lambdas, item_shape=(n + 1 - n_transient,), chunk_size=37, n_workers=n_workers)
+    np.testing.assert_array_equal(x, reference)
+
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_progress_is_reported_in_order(n_workers):
+    calls = []
+    params = np.linspace(0.0, 1.0, 100)
+    x = run_sweep(np.sqrt, params, chunk_size=7, n_workers=n_workers,
+                  progress=lambda done, total: calls.append((done, total)))
+    np.testing.assert_array_equal(x, np.sqrt(params))
+    done = [c[0] for c in calls]
+    assert all(total == 100 for _, total in calls)
+    assert done == sorted(set(done)) and done[-1] == 100
+
+def test_cancel_raises_and_unlinks_shared_memory(created_segments):
+    with pytest.raises(SweepCancelled):
+        run_sweep(np.sqrt, np.arange(64.0), chunk_size=1, n_workers=2, cancel=lambda: True)
+    assert len(created_segments) == 2
+    assert_unlinked(created_segments)
+
+def test_shared_memory_is_unlinked_after_success(created_segments):
+    run_sweep(np.sqrt, np.arange(64.0), chunk_size=8, n_workers=2)
+    assert len(created_segments) == 2
+    assert_unlinked(created_segments)
+
+def test_cancel_in_process():
+    with pytest.raises(SweepCancelled):
+        run_sweep(np.sqrt, np.arange(10.0), chunk_size=2, n_workers=1, cancel=lambda: True)
+
+def test_validation():
+    with pytest.raises(ValueError):
+        run_sweep(np.sqrt, np.array([]))
+    with pytest.raises(ValueError):
+        run_sweep(np.sqrt, np.arange(4.0), chunk_size=0)
@@ -0,0 +1,49 @@
+"""
+Tests for the exact rational Tent Map orbits in tent_map.py.
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+from fractions import Fraction
+import pytest
+from tent_map import tent, tent_exact, tent_nth
+
+INITIAL_CONDITIONS = [Fraction(0), Fraction(1), Fraction(1, 2), Fraction(2, 5), Fraction(1, 3),
+                      Fraction(7, 9), Fraction(123456, 1000003), "3/7", "0.4", 0.3]
+
+@pytest.mark.parametrize("x0", INITIAL_CONDITIONS)
+def test_nth_matches_exact_orbit(x0):
+    orbit = tent_exact(x0, 120)
+    assert [tent_nth(x0, n) for n in range(121)] == orbit
+
+def test_exact_follows_the_map():
+    orbit = tent_exact("2/5", 6)
+    assert orbit == [Fraction(2, 5), Fraction(4, 5), Fraction(2, 5), Fraction(4, 5),
+                     Fraction(2, 5), Fraction(4, 5), Fraction(2, 5)]
+    for x, x_next in zip(tent_exact("123/1001", 50), tent_exact("123/1001", 51)[1:]):
+        assert x_next == (2 * x if x <= Fraction(1, 2) else 2 - 2 * x)
+
+def test_exact_matches_float_orbit():
+    # 2x and 2 - 2x are exact in double precision, so the float orbit of a float x0 is
+    # the exact orbit of the dyadic rational it stores, including its collapse to 0
+    orbit = tent_exact(0.3, 70)
+    assert [float(x) for x in orbit] == tent(0.3, 70)
+    assert orbit[-1] == 0
+
+def test_nth_far_iterate():
+    # 1/3 lands on the fixed point 2/3, 2/5 has period 2 and the orbit of 5/17 repeats
+    # with a period dividing 16, so far iterates are known from short exact orbits
+    assert tent_nth(Fraction(1, 3), 10 ** 18) == Fraction(2, 3)
+    assert tent_nth("2/5", 10 ** 18 + 1) == Fraction(4, 5)
+    assert tent_nth(Fraction(5, 17), 10 ** 6) == tent_exact(Fraction(5, 17), 10 ** 6 % 16 + 16)[-1]
+
+@pytest.mark.parametrize("call", [
+    lambda: tent_nth("1.5", 3),
+    lambda: tent_nth("abc", 3),
+    lambda: tent_nth(Fraction(1, 3), -1),
+    lambda: tent_exact(Fraction(1, 3), 2.0),
+])
+def test_validation(call):
+    with pytest.raises(ValueError):
+        call()
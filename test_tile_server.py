@@ -0,0 +1,149 @@
+"""
+Tests for the tile cache, tile addressing and request handling in tile_server.py.
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import tile_server
+from tile_server import LAYERS, N_LEVELS, TileCache, TileServer, tile_extent
+
+def key(i, level=0):
+    return ("basin", 3, i, 0, level)
+
+def test_cache_evicts_least_recently_used():
+    cache = TileCache(max_bytes=30)
+    for i in range(3):
+        cache.put(key(i), bytes(10))
+    assert len(cache) == 3 and cache.nbytes == 30
+    # Touch tile 0 so that tile 1 is now the least recently used
+    assert cache.get(key(0)) == bytes(10)
+    cache.put(key(3), bytes(10))
+    assert cache.get(key(1)) is None
+    assert all(cache.get(key(i)) is not None for i in (0, 2, 3))
+    assert cache.nbytes == 30
+
+def test_cache_byte_budget():
+    cache = TileCache(max_bytes=30)
+    cache.put(key(0), bytes(10))
+    cache.put(key(1), bytes(10))
+    # A large tile evicts as many old ones as it needs
+    cache.put(key(2), bytes(25))
+    assert len(cache) == 1 and cache.nbytes == 25
+    # Replacing a tile updates the total size
+    cache.put(key(2), bytes(5))
+    assert cache.nbytes == 5
+    # A tile over the whole budget is not cached, and drops the old copy
+    cache.put(key(2), bytes(31))
+    assert cache.get(key(2)) is None and cache.nbytes == 0
+    with pytest.raises(ValueError):
+        TileCache(max_bytes=0)
+
+@pytest.mark.parametrize("layer", list(LAYERS))
+def test_tile_extents(layer):
+    assert tile_extent(layer, 0, 0, 0) == pytest.approx(LAYERS[layer][1])
+    x_min, x_max, y_min, y_max = LAYERS[layer][1]
+    # The four children of tile 0 split it in half along each axis, y counted from the top
+    top_left = tile_extent(layer, 1, 0, 0)
+    bottom_right = tile_extent(layer, 1, 1, 1)
+    assert top_left == pytest.approx((x_min, (x_min + x_max) / 2, (y_min + y_max) / 2, y_max))
+    assert bottom_right == pytest.approx(((x_min + x_max) / 2, x_max, y_min, (y_min + y_max) / 2))
+
+def fake_render(layer, z, x, y, level, size):
+    if layer == "chaos-game":
+        raise RuntimeError("render failed")
+    return ("%s/%d/%d/%d@%d" % (layer, z, x, y, level)).encode()
+
+def run(coroutine_function, monkeypatch):
+    # Render in threads with a fake renderer, so the requests need no process pool
+    monkeypatch.setattr(tile_server, "_render_tile", fake_render)
+
+    async def main():
+        server = TileServer(tile_size=16, n_workers=1, max_zoom=4)
+        await server.start()
+        server._pool.shutdown()
+        server._pool = ThreadPoolExecutor(max_workers=1)
+        try:
+            return await coroutine_function(server)
+        finally:
+            await server.close()
+
+    return asyncio.run(main())
+
+def test_progressive_refinement(monkeypatch):
+    async def requests(server):
+        data, level = await server.tile("basin", 2, 1, 3)
+        assert (data, level) == (b"basin/2/1/3@0", 0)
+        # Level 1 was queued; waiting for it caches it
+        assert await server.tile("basin", 2, 1, 3, level=1) == (b"basin/2/1/3@1", 1)
+        # Without a level the finest cached level is returned at once
+        assert await server.tile("basin", 2, 1, 3) == (b"basin/2/1/3@1", 1)
+        await server.tile("basin", 2, 1, 3, level=N_LEVELS - 1)
+        assert (await server.tile("basin", 2, 1, 3))[1] == N_LEVELS - 1
+        return len(server.cache)
+
+    assert run(requests, monkeypatch) == N_LEVELS
+
+def test_responses(monkeypatch):
+    async def requests(server):
+        return {target: await server._respond(method, target) for method, target in [
+            ("GET", "/"),
+            ("GET", "/tiles/basin/1/0/1.png"),
+            ("GET", "/tiles/basin/1/0/1.png?level=%d" % (N_LEVELS - 1)),
+            ("GET", "/tiles/julia/0/0/0.png"),
+            ("GET", "/tiles/basin/1/2/0.png"),
+            ("GET", "/tiles/basin/5/0/0.png"),
+            ("GET", "/tiles/basin/0/0/0.png?level=%d" % N_LEVELS),
+            ("GET", "/tiles/basin/0/0/0.png?level=fine"),
+            ("GET", "/tiles/chaos-game/0/0/0.png"),
+            ("GET", "/elsewhere"),
+            ("POST", "/tiles/basin/0/0/0.png?post"),
+        ]}
+
+    responses = run(requests, monkeypatch)
+    status = {target: response[0] for target, response in responses.items()}
+    assert status["/"] == 200 and b"<html>" in responses["/"][2]
+
+    _, content_type, body, headers = responses["/tiles/basin/1/0/1.png"]
+    assert content_type == "image/png" and body == b"basin/1/0/1@0"
+    assert headers["X-Tile-Level"] == "0" and headers["X-Tile-Final"] == "0"
+    assert headers["Cache-Control"] == "no-store"
+    final = responses["/tiles/basin/1/0/1.png?level=%d" % (N_LEVELS - 1)][3]
+    assert final["X-Tile-Final"] == "1" and final["Cache-Control"].startswith("max-age")
+
+    assert status["/tiles/julia/0/0/0.png"] == 404
+    assert status["/tiles/basin/1/2/0.png"] == 400
+    assert status["/tiles/basin/5/0/0.png"] == 400
+    assert status["/tiles/basin/0/0/0.png?level=%d" % N_LEVELS] == 400
+    assert status["/tiles/basin/0/0/0.png?level=fine"] == 400
+    assert status["/tiles/chaos-game/0/0/0.png"] == 500
+    assert status["/elsewhere"] == 404
+    assert status["/tiles/basin/0/0/0.png?post"] == 405
+
+def test_failed_refinement_is_logged(monkeypatch, caplog):
+    async def requests(server):
+        # Nobody awaits the refinement that fails; the error must still be logged
+        future = server._submit(("chaos-game", 0, 0, 0, 1))
+        await asyncio.wait([future])
+        return future
+
+    with caplog.at_level(logging.ERROR):
+        future = run(requests, monkeypatch)
+    assert isinstance(future.exception(), RuntimeError)
+    failures = [r for r in caplog.records if "Rendering tile" in r.getMessage()]
+    assert len(failures) == 1 and failures[0].exc_info[1] is future.exception()
+
+def test_validation():
+    with pytest.raises(ValueError):
+        TileServer(tile_size=0)
+    with pytest.raises(ValueError):
+        TileServer(max_zoom=-1)
+
+@pytest.mark.parametrize("layer", list(LAYERS))
+def test_render_tile_returns_png(layer):
+    data = tile_server._render_tile(layer, 1, 1, 0, 0, 16)
+    assert data.startswith(b"\x89PNG\r\n\x1a\n")
@@ -0,0 +1,99 @@
+"""
+Tests for the streaming trajectory recorder in trajectory_recorder.py.
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import numpy as np
+import pytest
+from trajectory_recorder import TrajectoryRecorder
+
+T = np.arange(100, dtype=float) * 0.5
+X = np.stack([np.sin(T), np.cos(T)], axis=1)
+
+def record(recorder, blocks):
+    # Offer T, X one sample at a time (blocks=None) or in blocks of the given sizes
+    if blocks is None:
+        for t, x in zip(T, X):
+            recorder.record(t, x)
+    else:
+        bounds = np.cumsum([0] + blocks)
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            recorder.record_block(T[a:b], X[a:b])
+    return recorder.finalize()
+
+@pytest.mark.parametrize("blocks", [None, [100], [3, 40, 57]])
+def test_every(blocks):
+    t, x = record(TrajectoryRecorder(2, every=7, chunk_size=4), blocks)
+    np.testing.assert_array_equal(t, T[::7])
+    np.testing.assert_array_equal(x, X[::7])
+
+@pytest.mark.parametrize("blocks", [None, [100], [3, 40, 57]])
+def test_window(blocks):
+    recorder = TrajectoryRecorder(2, every=3, window=(10.0, 30.0), chunk_size=5)
+    t, x = record(recorder, blocks)
+    kept = (np.arange(100) % 3 == 0) & (T >= 10.0) & (T <= 30.0)
+    np.testing.assert_array_equal(t, T[kept])
+    np.testing.assert_array_equal(x, X[kept])
+    assert recorder.n_seen == 100 and recorder.n_recorded == np.count_nonzero(kept)
+
+@pytest.mark.parametrize("blocks", [None, [100], [3, 40, 57], [95, 5]])
+def test_last_keeps_most_recent_samples(blocks):
+    t, x = record(TrajectoryRecorder(2, every=2, last=8), blocks)
+    np.testing.assert_array_equal(t, T[::2][-8:])
+    np.testing.assert_array_equal(x, X[::2][-8:])
+
+def test_last_with_fewer_samples_than_capacity():
+    recorder = TrajectoryRecorder(last=10)
+    for i in range(4):
+        recorder.record(float(i), i * 2.0)
+    t, x = recorder.finalize()
+    np.testing.assert_array_equal(t, [0, 1, 2, 3])
+    np.testing.assert_array_equal(x, [0, 2, 4, 6])
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_disk_round_trip(tmp_path, dtype):
+    path = str(tmp_path / "orbit.npy")
+    recorder = TrajectoryRecorder(2, every=3, path=path, chunk_size=4, dtype=dtype)
+    t, x = record(recorder, [3, 40, 57])
+    np.testing.assert_array_equal(t, T[::3])
+    np.testing.assert_array_equal(x, X[::3].astype(dtype))
+    assert x.dtype == dtype
+    # The files are plain .npy files that load without the recorder
+    np.testing.assert_array_equal(np.load(path), X[::3].astype(dtype))
+    np.testing.assert_array_equal(np.load(str(tmp_path / "orbit_t.npy")), T[::3])
+
+def test_disk_round_trip_in_last_mode(tmp_path):
+    path = str(tmp_path / "tail.npy")
+    t, x = record(TrajectoryRecorder(2, last=5, path=path), None)
+    np.testing.assert_array_equal(np.load(path), X[-5:])
+    np.testing.assert_array_equal(np.load(str(tmp_path / "tail_t.npy")), T[-5:])
+    np.testing.assert_array_equal(x, X[-5:])
+
+def test_context_manager_closes_files_on_error(tmp_path):
+    path = str(tmp_path / "partial.npy")
+    with pytest.raises(RuntimeError):
+        with TrajectoryRecorder(2, path=path, chunk_size=4) as recorder:
+            recorder.record_block(T[:10], X[:10])
+            raise RuntimeError("integration failed")
+    assert recorder._x_file.closed and recorder._t_file.closed
+    # The samples recorded before the error are complete and readable
+    np.testing.assert_array_equal(np.load(path), X[:10])
+    np.testing.assert_array_equal(np.load(str(tmp_path / "partial_t.npy")), T[:10])
+    # finalize() after close() returns the same data
+    np.testing.assert_array_equal(recorder.finalize()[1], X[:10])
+
+def test_empty_recording():
+    t, x = TrajectoryRecorder(3).finalize()
+    assert t.shape == (0,) and x.shape == (0, 3)
+
+def test_validation():
+    with pytest.raises(ValueError):
+        TrajectoryRecorder(every=0)
+    with pytest.raises(ValueError):
+        TrajectoryRecorder(last=0)
+    with pytest.raises(ValueError):
+        TrajectoryRecorder(chunk_size=0)
+    with pytest.raises(ValueError):
+        TrajectoryRecorder(window=(2.0, 1.0))
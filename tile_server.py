@@ -0,0 +1,510 @@
+"""
+Local HTTP tile server with progressive refinement for interactive exploration.
+
+Instead of rerunning a script and scatter-plotting millions of points for every zoom,
+the views below are served as PNG tiles in the usual z/x/y scheme: tile (z, x, y) covers
+1/2^z of the layer's extent along each axis, with x counted from the left and y from the
+top. Tiles are computed on demand on a process pool, each only for the region it shows,
+so the cost of a tile does not grow with the zoom depth:
+    bifurcation   λ sweep of xₙ₊₁ = xₙ * exp(λ * (1 - xₙ)), one λ per pixel column
+    chaos-game    pentagon Chaos Game, rendered with chaos_game_ifs() pruned to the tile
+    basin         attractor-cell labels of the complex-valued map, from basin_labels()
+
+Every tile exists at N_LEVELS levels of refinement: more kept iterations for the maps,
+or a deeper address tree for the Chaos Game. A tile requested without a level is answered
+at once with the finest level already rendered (rendering level 0, the cheapest, if none
+is), and the next level is queued. The X-Tile-Level and X-Tile-Final response headers tell
+the client to request it again with ?level=<level + 1>, which waits for that render, and
+to swap the image in place. Renders are queued coarse levels first and newest requests
+first, and finished tiles are kept as PNG bytes in an in-memory LRU cache.
+
+    GET /                                 viewer page (drag to pan, wheel to zoom)
+    GET /tiles/<layer>/<z>/<x>/<y>.png    tile, optionally with ?level=<level>
+
+Only asyncio and NumPy are used, and the client never holds raw points.
+
+Usage:
+    python tile_server.py    (then open http://127.0.0.1:8000/)
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import asyncio
+import itertools
+import os
+import re
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+import numpy as np
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+from chaos_game import chaos_game_ifs
+from complex_iterated_map import basin_labels
+from density_raster import DensityRaster, encode_png
+from one_dimensional_map import one_dimensional_map_raster
+
+# Number of refinement levels of every tile
+N_LEVELS = 3
+
+# (layer, z, x, y, level)
+TileKey = Tuple[str, int, int, int, int]
+
+# Contraction factor and vertices of the regular pentagon used by chaos_game.main()
+_CHAOS_A = 41 / 108
+_PENTAGON = [(951, 309), (588, -809), (-588, -809), (-951, 309), (0, 1000)]
+
+# Fixed colours of the attractor cells of the basin layer
+_BASIN_PALETTE = np.random.default_rng(0).integers(48, 256, size=(64 * 64, 3)).astype(np.uint8)
+
+def _bifurcation_tile(extent: Tuple[float, float, float, float], size: int, level: int) -> bytes:
+    """
+    Render a bifurcation-diagram tile, keeping 256 * 4^level iterates of every λ column.
+    """
+    n_transient = 255
+    n_kept = 256 * 4 ** level
+    lam_step = (extent[1] - extent[0]) / size
+    raster = DensityRaster(extent, size, size)
+    one_dimensional_map_raster(raster, n_transient + n_kept - 1, extent[0] + lam_step / 2, extent[1],
+                               lam_step, n_transient=n_transient)
+    # A fixed peak keeps the shading of neighbouring tiles consistent
+    return raster.to_png(peak=n_kept)
+
+def _chaos_game_tile(extent: Tuple[float, float, float, float], size: int, level: int) -> bytes:
+    """
+    Render a Chaos Game tile, stopping the address tree two levels short per missing refinement level.
+    """
+    raster = DensityRaster(extent, size, size)
+    pixel_size = (extent[1] - extent[0]) / size
+    chaos_game_ifs(_CHAOS_A, _PENTAGON, raster, pixel_size=pixel_size / _CHAOS_A ** (2 * (N_LEVELS - 1 - level)))
+    return raster.to_png()
+
+def _basin_tile(extent: Tuple[float, float, float, float], size: int, level: int) -> bytes:
+    """
+    Render a basin tile of the complex-valued map with 32 * 4^level iterations per pixel.
+    """
+    labels = basin_labels(extent, size, size, max_iter=32 * 4 ** level)
+    # Points that do not converge onto an attractor cell are drawn white
+    rgb = np.where(labels[..., np.newaxis] >= 0, _BASIN_PALETTE[labels % len(_BASIN_PALETTE)], 255)
+    return encode_png(rgb.astype(np.uint8))
+
+# name -> (render function, (x_min, x_max, y_min, y_max) of tile (0, 0, 0))
+LAYERS: Dict[str, Tuple[Callable[[Tuple[float, float, float, float], int, int], bytes],
+                        Tuple[float, float, float, float]]] = {
+    "bifurcation": (_bifurcation_tile, (1.5, 4.0, 0.0, 5.25)),
+    "chaos-game": (_chaos_game_tile, (-1000 / (1 - _CHAOS_A), 1000 / (1 - _CHAOS_A),
+                                      -1000 / (1 - _CHAOS_A), 1000 / (1 - _CHAOS_A))),
+    "basin": (_basin_tile, (-2 * np.pi, 2 * np.pi, -2 * np.pi, 2 * np.pi)),
+}
+
+def tile_extent(layer: str, z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """
+    Return the (x_min, x_max, y_min, y_max) region covered by tile (z, x, y) of a layer.
+    """
+    x_min, x_max, y_min, y_max = LAYERS[layer][1]
+    width = (x_max - x_min) / 2 ** z
+    height = (y_max - y_min) / 2 ** z
+    return (x_min + x * width, x_min + (x + 1) * width, y_max - (y + 1) * height, y_max - y * height)
+
+def _render_tile(layer: str, z: int, x: int, y: int, level: int, size: int) -> bytes:
+    """
+    Render one tile as PNG bytes; runs in a worker process.
+    """
+    return LAYERS[layer][0](tile_extent(layer, z, x, y), size, level)
+
+class TileCache:
+    """
+    In-memory LRU cache of encoded tiles with a byte budget.
+
+    Attributes:
+        max_bytes (int): Total size of the cached tiles above which the least recently
+                         used ones are evicted.
+        nbytes (int): Current total size of the cached tiles.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 2 ** 20) -> None:
+        """
+        Create an empty cache.
+
+        Parameters:
+            max_bytes (int): Byte budget (positive integer).
+        """
+        if not isinstance(max_bytes, int) or max_bytes <= 0:
+            raise ValueError("max_bytes must be a positive integer.")
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._tiles: "OrderedDict[TileKey, bytes]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._tiles)
+
+    def get(self, key: TileKey) -> Optional[bytes]:
+        """
+        Return a cached tile and mark it as recently used, or None if it is not cached.
+        """
+        data = self._tiles.get(key)
+        if data is not None:
+            self._tiles.move_to_end(key)
+        return data
+
+    def put(self, key: TileKey, data: bytes) -> None:
+        """
+        Store a tile, evicting the least recently used tiles beyond the byte budget.
+        """
+        old = self._tiles.pop(key, None)
+        if old is not None:
+            self.nbytes -= len(old)
+        if len(data) > self.max_bytes:
+            return
+        self._tiles[key] = data
+        self.nbytes += len(data)
+        while self.nbytes > self.max_bytes:
+            _, evicted = self._tiles.popitem(last=False)
+            self.nbytes -= len(evicted)
+
+class TileServer:
+    """
+    Asyncio HTTP server rendering tiles of the LAYERS on a process pool.
+
+    Attributes:
+        tile_size (int): Edge length of a tile in pixels.
+        max_zoom (int): Deepest zoom level served.
+        n_workers (int): Number of worker processes, i.e. tiles rendered concurrently.
+        cache (TileCache): LRU cache of rendered tiles.
+    """
+
+    _TILE_PATH = re.compile(r"/tiles/([a-z-]+)/(\d+)/(\d+)/(\d+)\.png")
+
+    def __init__(self, tile_size: int = 256, n_workers: Optional[int] = None,
+                 cache_bytes: int = 256 * 2 ** 20, max_zoom: int = 32) -> None:
+        """
+        Create a server; call serve() (or start() for use without HTTP) to run it.
+
+        Parameters:
+            tile_size (int): Edge length of a tile in pixels (positive integer).
+            n_workers (Optional[int]): Number of worker processes. Defaults to os.cpu_count().
+            cache_bytes (int): Byte budget of the tile cache.
+            max_zoom (int): Deepest zoom level served (non-negative integer).
+        """
+        if not isinstance(tile_size, int) or tile_size <= 0:
+            raise ValueError("tile_size must be a positive integer.")
+        if not isinstance(max_zoom, int) or max_zoom < 0:
+            raise ValueError("max_zoom must be a non-negative integer.")
+        self.tile_size = tile_size
+        self.max_zoom = max_zoom
+        self.n_workers = max(1, n_workers or os.cpu_count() or 1)
+        self.cache = TileCache(cache_bytes)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._workers: List[asyncio.Task] = []
+        self._pending: Dict[TileKey, asyncio.Future] = {}
+        self._order = itertools.count()
+
+    async def start(self) -> None:
+        """
+        Start the worker pool and the render queue.
+        """
+        self._pool = ProcessPoolExecutor(max_workers=self.n_workers)
+        self._queue = asyncio.PriorityQueue()
+        self._workers = [asyncio.create_task(self._work()) for _ in range(self.n_workers)]
+
+    async def close(self) -> None:
+        """
+        Stop the render queue, cancel pending renders and shut the worker pool down.
+        """
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, key: TileKey) -> asyncio.Future:
+        """
+        Queue a render unless it is already pending, and return its future.
+        """
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            future.add_done_callback(partial(self._log_failure, key))
+            self._pending[key] = future
+            # Coarse levels first, then the most recent requests
+            self._queue.put_nowait((key[4], -next(self._order), key))
+        return future
+
+    @staticmethod
+    def _log_failure(key: TileKey, future: asyncio.Future) -> None:
+        """
+        Log the error of a failed render. Retrieving it here also keeps asyncio from
+        reporting it as never retrieved when nobody awaits the render, e.g. a refinement.
+        """
+        if not future.cancelled() and future.exception() is not None:
+            logging.error("Rendering tile %s failed", key, exc_info=future.exception())
+
+    async def _work(self) -> None:
+        """
+        Take renders off the queue and run them in the worker pool, one at a time.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            _, _, key = await self._queue.get()
+            future = self._pending[key]
+            try:
+                data = await loop.run_in_executor(self._pool, _render_tile, *key, self.tile_size)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                self.cache.put(key, data)
+                future.set_result(data)
+            finally:
+                del self._pending[key]
+
+    async def tile(self, layer: str, z: int, x: int, y: int, level: Optional[int] = None) -> Tuple[bytes, int]:
+        """
+        Return a tile as PNG bytes, and queue its next refinement level.
+
+        Parameters:
+            layer (str): One of the LAYERS.
+            z, x, y (int): Zoom level and tile column and row, 0 <= x, y < 2^z.
+            level (Optional[int]): Refinement level to wait for. By default, the finest
+                                   cached level, or level 0 if none is cached.
+
+        Returns:
+            Tuple[bytes, int]: The PNG bytes and their refinement level.
+        """
+        if layer not in LAYERS:
+            raise KeyError(layer)
+        if not 0 <= z <= self.max_zoom or not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+            raise ValueError("Tile (%d, %d, %d) is outside the layer." % (z, x, y))
+        if level is not None and not 0 <= level < N_LEVELS:
+            raise ValueError("level must lie in [0, %d]." % (N_LEVELS - 1))
+
+        data = None
+        if level is None:
+            # Finest cached level; the loop ends at level 0 when nothing is cached
+            for level in reversed(range(N_LEVELS)):
+                data = self.cache.get((layer, z, x, y, level))
+                if data is not None:
+                    break
+        else:
+            data = self.cache.get((layer, z, x, y, level))
+        if data is None:
+            # Shielded, so a client that disconnects does not cancel a render others share
+            data = await asyncio.shield(self._submit((layer, z, x, y, level)))
+
+        refined = (layer, z, x, y, level + 1)
+        if level + 1 < N_LEVELS and self.cache.get(refined) is None:
+            self._submit(refined)
+        return data, level
+
+    async def _respond(self, method: str, target: str) -> Tuple[int, str, bytes, Dict[str, str]]:
+        """
+        Answer one request with (status, content type, body, extra headers).
+        """
+        if method != "GET":
+            return HTTPStatus.METHOD_NOT_ALLOWED, "text/plain", b"Only GET is supported.\n", {"Allow": "GET"}
+        url = urlsplit(target)
+        if url.path == "/":
+            return HTTPStatus.OK, "text/html; charset=utf-8", self._viewer().encode(), {}
+
+        match = self._TILE_PATH.fullmatch(url.path)
+        if match is None:
+            return HTTPStatus.NOT_FOUND, "text/plain", b"Not found.\n", {}
+        try:
+            query = parse_qs(url.query)
+            level = int(query["level"][0]) if "level" in query else None
+            data, level = await self.tile(match.group(1), *(int(v) for v in match.groups()[1:]), level=level)
+        except KeyError:
+            return HTTPStatus.NOT_FOUND, "text/plain", b"Unknown layer.\n", {}
+        except ValueError as e:
+            return HTTPStatus.BAD_REQUEST, "text/plain", ("%s\n" % e).encode(), {}
+        except Exception as e:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, "text/plain", ("%s\n" % e).encode(), {}
+
+        final = level == N_LEVELS - 1
+        return HTTPStatus.OK, "image/png", data, {
+            "X-Tile-Level": str(level),
+            "X-Tile-Final": "1" if final else "0",
+            "Cache-Control": "max-age=3600" if final else "no-store",
+        }
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serve the requests of one (keep-alive) connection.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"", b"\r\n", b"\n"):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                parts = request_line.decode("latin-1").split()
+                if len(parts) == 3:
+                    method, target, version = parts
+                    status, content_type, body, extra = await self._respond(method, target)
+                    keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                else:
+                    status, content_type, body, extra = HTTPStatus.BAD_REQUEST, "text/plain", b"Bad request.\n", {}
+                    keep_alive = False
+
+                head = ["HTTP/1.1 %d %s" % (status, HTTPStatus(status).phrase),
+                        "Content-Type: %s" % content_type,
+                        "Content-Length: %d" % len(body),
+                        "Connection: %s" % ("keep-alive" if keep_alive else "close")]
+                head += ["%s: %s" % item for item in extra.items()]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            # Dropped connections, oversized request lines and server shutdown end the connection
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8000) -> None:
+        """
+        Serve tiles and the viewer over HTTP until cancelled.
+
+        Parameters:
+            host (str): Interface to listen on; the default only accepts local connections.
+            port (int): TCP port.
+        """
+        await self.start()
+        try:
+            server = await asyncio.start_server(self._handle, host, port)
+            logging.info("Serving %s on http://%s:%d/ with %d workers", ", ".join(LAYERS), host, port,
+                         self.n_workers)
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.close()
+
+    def _viewer(self) -> str:
+        """
+        Return the viewer page: tiles in a draggable, wheel-zoomable pane that refine in place.
+        """
+        options = "".join('<option>%s</option>' % name for name in LAYERS)
+        return _VIEWER.replace("{options}", options).replace("{size}", str(self.tile_size)) \
+                      .replace("{max_zoom}", str(self.max_zoom))
+
+_VIEWER = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Nonlinear Dynamics</title>
+<style>
+html, body { margin: 0; height: 100%; overflow: hidden; font: 14px sans-serif; }
+#map { position: absolute; inset: 0; background: #fff; cursor: grab; }
+#map img { position: absolute; width: {size}px; height: {size}px; image-rendering: pixelated; }
+#bar { position: absolute; top: 8px; left: 8px; padding: 4px; background: #fffc; }
+</style></head>
+<body><div id="map"></div><div id="bar"><select id="layer">{options}</select> <span id="info"></span></div>
+<script>
+const SIZE = {size}, MAX_ZOOM = {max_zoom};
+const map = document.getElementById("map"), layer = document.getElementById("layer");
+const info = document.getElementById("info"), tiles = new Map();
+// Zoom level and view centre in units of the layer extent
+let z = 0, cx = 0.5, cy = 0.5, drag = null;
+
+// Fetch a tile and keep requesting the next level until the server reports it final
+function refine(img, url, level) {
+  fetch(level === null ? url : url + "?level=" + level).then(response => {
+    if (!response.ok || !img.isConnected) return;
+    const got = Number(response.headers.get("X-Tile-Level"));
+    const final = response.headers.get("X-Tile-Final") === "1";
+    return response.blob().then(blob => {
+      if (!img.isConnected) return;
+      URL.revokeObjectURL(img.src);
+      img.src = URL.createObjectURL(blob);
+      if (!final) refine(img, url, got + 1);
+    });
+  });
+}
+
+function draw() {
+  const n = 2 ** z, w = map.clientWidth, h = map.clientHeight;
+  const left = cx * n * SIZE - w / 2, top = cy * n * SIZE - h / 2, seen = new Set();
+  for (let ty = Math.max(0, Math.floor(top / SIZE)); ty < Math.min(n, Math.ceil((top + h) / SIZE)); ty++) {
+    for (let tx = Math.max(0, Math.floor(left / SIZE)); tx < Math.min(n, Math.ceil((left + w) / SIZE)); tx++) {
+      const key = layer.value + "/" + z + "/" + tx + "/" + ty;
+      let img = tiles.get(key);
+      if (!img) {
+        img = document.createElement("img");
+        tiles.set(key, img);
+        map.appendChild(img);
+        refine(img, "/tiles/" + key + ".png", null);
+      }
+      img.style.left = (tx * SIZE - left) + "px";
+      img.style.top = (ty * SIZE - top) + "px";
+      seen.add(key);
+    }
+  }
+  for (const [key, img] of tiles) {
+    if (!seen.has(key)) { URL.revokeObjectURL(img.src); img.remove(); tiles.delete(key); }
+  }
+  info.textContent = "zoom " + z;
+}
+
+map.onmousedown = e => { drag = [e.clientX, e.clientY]; };
+window.onmouseup = () => { drag = null; };
+window.onmousemove = e => {
+  if (!drag) return;
+  const scale = SIZE * 2 ** z;
+  cx -= (e.clientX - drag[0]) / scale;
+  cy -= (e.clientY - drag[1]) / scale;
+  drag = [e.clientX, e.clientY];
+  draw();
+};
+map.onwheel = e => {
+  e.preventDefault();
+  const zoom = Math.min(MAX_ZOOM, Math.max(0, z + (e.deltaY < 0 ? 1 : -1)));
+  if (zoom === z) return;
+  // Keep the point under the cursor in place
+  const scale = SIZE * 2 ** z, f = 2 ** (z - zoom);
+  const mx = (e.clientX - map.clientWidth / 2) / scale, my = (e.clientY - map.clientHeight / 2) / scale;
+  cx += mx - mx * f;
+  cy += my - my * f;
+  z = zoom;
+  draw();
+};
+layer.onchange = draw;
+window.onresize = draw;
+draw();
+</script></body></html>
+"""
+
+def serve_tiles(host: str = "127.0.0.1", port: int = 8000, tile_size: int = 256,
+                n_workers: Optional[int] = None, cache_bytes: int = 256 * 2 ** 20) -> None:
+    """
+    Run a TileServer until interrupted.
+
+    See TileServer and TileServer.serve() for the parameters.
+    """
+    asyncio.run(TileServer(tile_size, n_workers, cache_bytes).serve(host, port))
+
+def main() -> None:
+    """
+    Main driver function serving the tile viewer on http://127.0.0.1:8000/.
+    """
+    try:
+        serve_tiles()
+    except KeyboardInterrupt:
+        logging.info("Tile server stopped.")
+    except Exception as e:
+        logging.error("An error occurred: %s", e)
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    main()
@@ -0,0 +1,244 @@
+"""
+Streaming trajectory recorder shared by the integrators and iterated maps.
+
+Kernels such as euler(), RK4(), logistic(), tent() and complex_iterated_map() can write
+each sample (t, xₙ) into a TrajectoryRecorder instead of returning the whole orbit.
+The recorder decides what is kept:
+    every=k        keep every k-th sample offered to it
+    window=(a, b)  keep only samples with a <= t <= b
+    last=k         keep only the k most recent samples (ring buffer)
+Kept samples are staged in a fixed-size chunk buffer. When a path is given, full chunks
+are appended to a memory-mappable `.npy` file (states) and a companion `_t.npy` file
+(times), so very long runs use bounded RAM and can still be analysed afterwards.
+Without a path (or `last`), full chunks are kept in memory and RAM grows with every kept
+sample; for long runs pass a path, or bound the kept samples with `every`/`window`/`last`.
+The recorder is a context manager: leaving the `with` block closes the output files and
+completes their headers even if the run raised, so a partial trajectory stays readable.
+
+Author: Sabneet Bains
+License: MIT License
+"""
+
+import numpy as np
+from typing import List, Optional, Tuple, Union
+
+# Fixed size of the .npy header, so it can be rewritten in place once the length is known
+_HEADER_SIZE = 128
+
+def _write_npy_header(fh, dtype: np.dtype, shape: Tuple[int, ...]) -> None:
+    """
+    Write a version 1.0 `.npy` header padded to exactly _HEADER_SIZE bytes.
+    """
+    header = "{'descr': %r, 'fortran_order': False, 'shape': %r, }" % (
+        np.lib.format.dtype_to_descr(dtype), tuple(shape))
+    magic = np.lib.format.magic(1, 0)
+    pad = _HEADER_SIZE - len(magic) - 2 - len(header) - 1
+    if pad < 0:
+        raise ValueError("Sample shape is too large for the recorder header.")
+    fh.seek(0)
+    fh.write(magic + np.uint16(_HEADER_SIZE - len(magic) - 2).tobytes())
+    fh.write((header + " " * pad + "\n").encode("latin1"))
+
+def _companion_path(path: str) -> str:
+    """
+    Return the path of the time file that accompanies a state file.
+    """
+    return (path[:-4] if path.endswith(".npy") else path) + "_t.npy"
+
+class TrajectoryRecorder:
+    """
+    Recorder for trajectories produced by maps and integrators.
+
+    Memory is bounded by chunk_size when a path is given, and by `last` in ring-buffer mode.
+    Otherwise every kept sample is held in memory until finalize(). Use it in a `with` block
+    (or call close()) when a path is given, so the files are closed on every exit path.
+
+    Attributes:
+        state_shape (Tuple[int, ...]): Shape of a single state sample (() for scalar states).
+        n_seen (int): Number of samples offered to the recorder.
+        n_recorded (int): Number of samples kept after decimation and windowing.
+    """
+
+    def __init__(self, state_shape: Union[int, Tuple[int, ...]] = (), every: int = 1,
+                 window: Optional[Tuple[float, float]] = None, last: Optional[int] = None,
+                 path: Optional[str] = None, chunk_size: int = 2 ** 16,
+                 dtype: type = np.float64) -> None:
+        """
+        Create a recorder.
+
+        Parameters:
+            state_shape (int | Tuple[int, ...]): Shape of a single state sample.
+            every (int): Keep every k-th offered sample (positive integer).
+            window (Optional[Tuple[float, float]]): Keep only samples with window[0] <= t <= window[1].
+            last (Optional[int]): If given, keep only the most recent `last` samples in a ring buffer.
+            path (Optional[str]): `.npy` file receiving the states in fixed-size chunks. Times are
+                                  written to the same name with a `_t.npy` suffix. Without
+                                  it all kept samples stay in memory.
+            chunk_size (int): Number of samples buffered in memory before each write.
+            dtype (type): Floating-point dtype of the stored states.
+        """
+        if not isinstance(every, int) or every <= 0:
+            raise ValueError("every must be a positive integer.")
+        if last is not None and (not isinstance(last, int) or last <= 0):
+            raise ValueError("last must be a positive integer.")
+        if not isinstance(chunk_size, int) or chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer.")
+        if window is not None and window[1] < window[0]:
+            raise ValueError("window must satisfy window[0] <= window[1].")
+
+        self.state_shape = (state_shape,) if isinstance(state_shape, int) else tuple(state_shape)
+        self.every = every
+        self.window = window
+        self.last = last
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.n_seen = 0
+        self.n_recorded = 0
+
+        # In ring-buffer mode the buffer itself holds the result
+        capacity = last if last is not None else chunk_size
+        self._t_buf = np.empty(capacity)
+        self._x_buf = np.empty((capacity,) + self.state_shape, dtype=self.dtype)
+        self._filled = 0
+        self._chunks: List[Tuple[np.ndarray, np.ndarray]] = []
+        self._closed = False
+
+        self._x_file = self._t_file = None
+        if path is not None and last is None:
+            self._x_file = open(path, "wb")
+            self._t_file = open(_companion_path(path), "wb")
+            _write_npy_header(self._x_file, self.dtype, (0,) + self.state_shape)
+            _write_npy_header(self._t_file, np.dtype(float), (0,))
+
+    def record(self, t: float, x: Union[float, np.ndarray]) -> None:
+        """
+        Offer a single sample to the recorder.
+
+        Parameters:
+            t (float): Time (or iteration index) of the sample.
+            x (float | np.ndarray): State of shape state_shape.
+        """
+        index = self.n_seen
+        self.n_seen += 1
+        if index % self.every:
+            return
+        if self.window is not None and not (self.window[0] <= t <= self.window[1]):
+            return
+
+        if self.last is not None:
+            slot = self.n_recorded % self.last
+            self._t_buf[slot] = t
+            self._x_buf[slot] = x
+        else:
+            self._t_buf[self._filled] = t
+            self._x_buf[self._filled] = x
+            self._filled += 1
+            if self._filled == self._t_buf.shape[0]:
+                self._flush()
+        self.n_recorded += 1
+
+    def record_block(self, t: np.ndarray, x: np.ndarray) -> None:
+        """
+        Offer a block of consecutive samples to the recorder.
+
+        Parameters:
+            t (np.ndarray): 1-D array of m sample times.
+            x (np.ndarray): (m,) + state_shape array of states.
+        """
+        t = np.asarray(t, dtype=float)
+        x = np.asarray(x)
+        m = t.shape[0]
+        keep = (np.arange(self.n_seen, self.n_seen + m) % self.every) == 0
+        if self.window is not None:
+            keep &= (t >= self.window[0]) & (t <= self.window[1])
+        self.n_seen += m
+        t_kept = t[keep]
+        x_kept = x[keep]
+
+        if self.last is not None:
+            # Only the final `last` kept samples can survive in the ring buffer
+            k = t_kept.shape[0]
+            start = max(0, k - self.last)
+            slots = (self.n_recorded + np.arange(start, k)) % self.last
+            self._t_buf[slots] = t_kept[start:]
+            self._x_buf[slots] = x_kept[start:]
+            self.n_recorded += k
+            return
+
+        offset = 0
+        while offset < t_kept.shape[0]:
+            take = min(self._t_buf.shape[0] - self._filled, t_kept.shape[0] - offset)
+            self._t_buf[self._filled:self._filled + take] = t_kept[offset:offset + take]
+            self._x_buf[self._filled:self._filled + take] = x_kept[offset:offset + take]
+            self._filled += take
+            offset += take
+            if self._filled == self._t_buf.shape[0]:
+                self._flush()
+        self.n_recorded += t_kept.shape[0]
+
+    def _flush(self) -> None:
+        """
+        Move the staged chunk to disk, or to the in-memory chunk list when no path is set.
+        """
+        if self._filled == 0:
+            return
+        if self._x_file is not None:
+            self._x_file.write(self._x_buf[:self._filled].tobytes())
+            self._t_file.write(self._t_buf[:self._filled].tobytes())
+        else:
+            self._chunks.append((self._t_buf[:self._filled].copy(), self._x_buf[:self._filled].copy()))
+        self._filled = 0
+
+    def __enter__(self) -> "TrajectoryRecorder":
+        """
+        Return the recorder for use in a `with` block.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """
+        Close the recorder when the `with` block exits, normally or through an exception.
+        """
+        self.close()
+
+    def close(self) -> None:
+        """
+        Flush remaining samples, complete the file headers and close the output files.
+        Further calls have no effect.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if self.last is not None:
+                n = min(self.n_recorded, self.last)
+                order = (np.arange(self.n_recorded - n, self.n_recorded)) % self.last
+                self._chunks = [(self._t_buf[order], self._x_buf[order])]
+                if self.path is not None:
+                    np.save(self.path, self._chunks[0][1])
+                    np.save(_companion_path(self.path), self._chunks[0][0])
+            else:
+                self._flush()
+                if self._x_file is not None:
+                    _write_npy_header(self._x_file, self.dtype, (self.n_recorded,) + self.state_shape)
+                    _write_npy_header(self._t_file, np.dtype(float), (self.n_recorded,))
+        finally:
+            if self._x_file is not None:
+                self._x_file.close()
+                self._t_file.close()
+
+    def finalize(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Flush remaining samples and return the recorded data.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Times and states of the kept samples, in order.
+            When a path is set the arrays are read-only memory maps of the written files.
+        """
+        self.close()
+        if self.path is not None:
+            return np.load(_companion_path(self.path), mmap_mode="r"), np.load(self.path, mmap_mode="r")
+        if not self._chunks:
+            return np.empty(0), np.empty((0,) + self.state_shape, dtype=self.dtype)
+        return (np.concatenate([c[0] for c in self._chunks]),
+                np.concatenate([c[1] for c in self._chunks]))